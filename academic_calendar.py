@@ -0,0 +1,86 @@
+"""
+Admission and exam dates, with day counters computed once a day.
+
+All dated events live in one table (data/calendar.json). Everything that
+depends on today's date — days left per event, the upcoming events in
+order, and any replies rendered from them — is computed into a Day the
+first time it is asked for on a given date and then served as-is until
+midnight in the calendar's timezone. A request checks the clock and reads
+one cached object instead of subtracting and formatting dates itself.
+
+Counters are whole calendar days (event date minus today's date), so an
+event tomorrow is 1 day away at any time of day.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+
+class Day:
+    """Date-dependent view of the calendar for one date."""
+
+    __slots__ = ("date", "expires_at", "days_left", "upcoming", "replies")
+
+    def __init__(self, day, expires_at, days_left, upcoming):
+        self.date = day
+        self.expires_at = expires_at    # timestamp of the next midnight
+        self.days_left = days_left      # event id -> days until it (negative once past)
+        self.upcoming = upcoming        # (event, days left) for events today or later, by date
+        self.replies = MappingProxyType({})
+
+
+class AcademicCalendar:
+    """Events by id, plus today's Day, recomputed at midnight rollover.
+
+    `render(calendar, day)` returns {name: reply} for the replies that
+    contain counters; it runs once per day, inside the rollover. Rollover
+    follows `clock`, so a fake clock moves the calendar to the next day.
+    """
+
+    def __init__(self, events, tz=None, render=None, clock=None):
+        self.events = MappingProxyType({e["id"]: e for e in sorted(events, key=lambda e: e["date"])})
+        self.tz = tz                    # tzinfo; None means the server's local time
+        self.render = render
+        self.clock = clock or (lambda: datetime.now(self.tz))
+        # expiry checks run on every request: the default clock's timestamp is time.time()
+        self._timestamp = time.time if clock is None else (lambda: self.clock().timestamp())
+        self.rollovers = 0
+        self._day = None
+        self._lock = threading.Lock()
+
+    def today(self):
+        """The current Day; the first call after midnight builds the next one."""
+        day = self._day
+        if day is None or self._timestamp() >= day.expires_at:
+            with self._lock:
+                day = self._day
+                if day is None or self._timestamp() >= day.expires_at:
+                    day = self._day = self._compute()
+        return day
+
+    def _compute(self):
+        now = self.clock()
+        today = now.date()
+        midnight = datetime.combine(today + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo)
+        days_left = {event_id: (e["date"] - today).days for event_id, e in self.events.items()}
+        upcoming = tuple((e, days_left[event_id]) for event_id, e in self.events.items()
+                         if days_left[event_id] >= 0)
+        day = Day(today, midnight.timestamp(), MappingProxyType(days_left), upcoming)
+        if self.render is not None:
+            day.replies = MappingProxyType(self.render(self, day))
+        self.rollovers += 1
+        return day
+
+    def days_until(self, when):
+        """Days from today to `when` (a date or datetime)."""
+        if isinstance(when, datetime):
+            when = when.date()
+        return (when - self.today().date).days
+
+    def seconds_left(self):
+        """Seconds until today's counters roll over (at least 1)."""
+        return max(1.0, self.today().expires_at - self._timestamp())
+
+    def of_kind(self, kind):
+        return [e for e in self.events.values() if e["kind"] == kind]
@@ -0,0 +1,155 @@
+"""
+Admission control for the chat endpoints: per-client rate limits and a
+global cap on requests in progress.
+
+RateLimiter is a token bucket per client (IP address or session id): a
+client may send `burst` messages at once and `rate` per second after
+that. Each bucket is kept as a single float, the time at which it will be
+full again (the "theoretical arrival time" of GCRA), so a million
+tracked clients cost one dict entry each and a check is a few float
+operations. A bucket whose time has passed is full, which is the same as
+not being tracked, so such entries are pruned as they age; past
+`max_keys` the least recently seen client is forgotten.
+
+ConcurrencyLimiter admits `max_active` requests at a time. Up to
+`max_queue` more wait, each for at most `timeout` seconds; anything
+beyond that is shed straight away. The caller decides what a shed request
+gets: app.py caps the requests waiting on upstream translation, and a
+shed Tamil request is answered in English.
+"""
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class RateLimiter:
+    """Token buckets keyed by client, stored as {key: time the bucket is full}."""
+
+    def __init__(self, rate, burst, max_keys=100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.allowed = 0
+        self.limited = 0
+        self.evictions = 0
+        self._interval = 1.0 / rate if rate else 0.0   # seconds one token takes to refill
+        self._capacity = burst * self._interval        # seconds of tokens a full bucket holds
+        self._full_at = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._full_at)
+
+    def take(self, key, cost=1):
+        """Spend `cost` tokens of `key`'s bucket.
+
+        Returns 0.0 if they were there, else the seconds until they will be
+        (nothing is spent then).
+        """
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            full_at = max(self._full_at.get(key, now), now) + cost * self._interval
+            over = full_at - now - self._capacity
+            if over > 0:
+                self.limited += 1
+                return over
+            self._full_at[key] = full_at
+            self._full_at.move_to_end(key)
+            self.allowed += 1
+            self._prune(now)
+        return 0.0
+
+    def _prune(self, now):
+        # least recently seen first: stop at the first bucket still refilling
+        entries = self._full_at
+        while entries:
+            key, full_at = next(iter(entries.items()))
+            if full_at > now and len(entries) <= self.max_keys:
+                break
+            if full_at > now:
+                self.evictions += 1
+            del entries[key]
+
+    def stats(self):
+        return {
+            "clients": len(self._full_at),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evictions": self.evictions,
+        }
+
+
+class ConcurrencyLimiter:
+    """At most `max_active` holders; up to `max_queue` waiters; the rest are shed."""
+
+    def __init__(self, max_active, max_queue=0, timeout=1.0):
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self.peak_active = 0
+        self.admitted = 0
+        self.queued = 0
+        self.shed = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, wait=True):
+        """Take a slot; False when the request should be shed.
+
+        With `wait=False` (e.g. on an event loop) a full limiter sheds at
+        once instead of queueing.
+        """
+        if not self.max_active:
+            return True
+        with self._cond:
+            if self.active >= self.max_active:
+                if not wait or self.waiting >= self.max_queue:
+                    self.shed += 1
+                    return False
+                self.waiting += 1
+                self.queued += 1
+                deadline = time.monotonic() + self.timeout
+                try:
+                    while self.active >= self.max_active:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.shed += 1
+                            return False
+                        self._cond.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self.admitted += 1
+            self.peak_active = max(self.peak_active, self.active)
+            return True
+
+    def release(self):
+        if not self.max_active:
+            return
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, wait=True):
+        """`with limiter.slot() as admitted:`; the slot is released on exit."""
+        admitted = self.acquire(wait)
+        try:
+            yield admitted
+        finally:
+            if admitted:
+                self.release()
+
+    def stats(self):
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "peak_active": self.peak_active,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": self.shed,
+        }
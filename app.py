@@ -1,738 +1,1762 @@
-import re
-from flask import Flask, request, jsonify, session, redirect, render_template, url_for
-from flask_cors import CORS
-from datetime import datetime
-import sqlite3
-from werkzeug.security import generate_password_hash, check_password_hash
-from googletrans import Translator
-from difflib import get_close_matches ,  SequenceMatcher
-from deep_translator import GoogleTranslator
-
-app = Flask(__name__)
-CORS(app)  # ✅ Allow frontend to call Flask API
-app.secret_key = "supersecretkey"  # required for login sessions
-translator = Translator()
-
-def fuzzy_match(user_msg, keywords, cutoff=0.6):
-    matches = get_close_matches(user_msg, keywords, n=1, cutoff=cutoff)
-    return bool(matches)
-
-# ---------------- Helper Functions ----------------
-def is_tamil(text):
-    """Check if text contains Tamil characters"""
-    return any("\u0B80" <= ch <= "\u0BFF" for ch in text)
-
-def calculate_deadline(date_str):
-    """
-    Calculate the number of days left until the given date.
-    date_str format: '24 October 2025'
-    """
-    try:
-        exam_date = datetime.strptime(date_str, "%d %B %Y")
-        today = datetime.today()
-        days_left = (exam_date - today).days
-        if days_left > 0:
-            return f"🗓 Days left: {days_left} day{'s' if days_left > 1 else ''}"
-        elif days_left == 0:
-            return "🗓 The exam is today!"
-        else:
-            return "⚠ The exam date has passed."
-    except ValueError:
-        return "⚠ Invalid date format. Use DD Month YYYY (e.g., 24 October 2025)."
-
-def translate_reply_deep(reply, user_msg):
-    """Translate reply to Tamil using deep-translator."""
-    if any("\u0B80" <= ch <= "\u0BFF" for ch in user_msg):
-        try:
-            clean_text = re.sub(r'<[^>]+>', '', reply)
-            return GoogleTranslator(source='auto', target='ta').translate(clean_text)
-        except Exception as e:
-            print("Translation error:", e)
-            return reply
-    return reply
-
-
-# ---------------- FAQ Data ----------------
-courses = {
-    "engineering": {
-        "eee": {"1st year": "₹50,000", "2nd year": "₹45,000", "3rd year": "₹45,000", "4th year": "₹45,000"},
-        "ece": {"1st year": "₹55,000", "2nd year": "₹50,000", "3rd year": "₹50,000", "4th year": "₹50,000"},
-        "cse": {"1st year": "₹60,000", "2nd year": "₹55,000", "3rd year": "₹55,000", "4th year": "₹55,000"},
-        "civil": {"1st year": "₹48,000", "2nd year": "₹45,000", "3rd year": "₹45,000", "4th year": "₹45,000"},
-        "mechanical": {"1st year": "₹52,000", "2nd year": "₹48,000", "3rd year": "₹48,000", "4th year": "₹48,000"}
-    },
-    "arts": {
-        "bcom": {"1st year": "₹20,000", "2nd year": "₹18,000", "3rd year": "₹18,000"},
-        "bba": {"1st year": "₹22,000", "2nd year": "₹20,000", "3rd year": "₹20,000"},
-        "bsc tamil": {"1st year": "₹15,000", "2nd year": "₹15,000", "3rd year": "₹15,000"},
-        "bsc english": {"1st year": "₹15,000", "2nd year": "₹15,000", "3rd year": "₹15,000"},
-        "ba history": {"1st year": "₹18,000", "2nd year": "₹17,000", "3rd year": "₹17,000"}
-    },
-    "science": {
-        "bsc cs": {"1st year": "₹25,000", "2nd year": "₹22,000", "3rd year": "₹22,000"},
-        "bsc ca": {"1st year": "₹27,000", "2nd year": "₹24,000", "3rd year": "₹24,000"},
-        "bsc physics": {"1st year": "₹23,000", "2nd year": "₹21,000", "3rd year": "₹21,000"},
-        "bsc chemistry": {"1st year": "₹23,000", "2nd year": "₹21,000", "3rd year": "₹21,000"},
-        "bsc maths": {"1st year": "₹20,000", "2nd year": "₹19,000", "3rd year": "₹19,000"}
-    },
-    "medical": {
-        "mbbs": {"1st year": "₹3,50,000", "2nd year": "₹3,25,000", "3rd year": "₹3,25,000", "4th year": "₹3,25,000"},
-        "bds": {"1st year": "₹2,00,000", "2nd year": "₹1,80,000", "3rd year": "₹1,80,000", "4th year": "₹1,80,000"},
-        "bpharm": {"1st year": "₹1,50,000", "2nd year": "₹1,25,000", "3rd year": "₹1,25,000", "4th year": "₹1,25,000"},
-        "bsc nursing": {"1st year": "₹90,000", "2nd year": "₹80,000", "3rd year": "₹80,000", "4th year": "₹80,000"}
-    },
-    "law": {
-        "llb": {"1st year": "₹70,000", "2nd year": "₹65,000", "3rd year": "₹65,000"},
-        "ba llb": {"1st year": "₹85,000", "2nd year": "₹80,000", "3rd year": "₹80,000", "4th year": "₹80,000", "5th year": "₹80,000"},
-        "bba llb": {"1st year": "₹90,000", "2nd year": "₹85,000", "3rd year": "₹85,000", "4th year": "₹85,000", "5th year": "₹85,000"}
-    },
-    "architecture": {
-        "barch": {"1st year": "₹1,25,000", "2nd year": "₹1,10,000", "3rd year": "₹1,10,000", "4th year": "₹1,10,000", "5th year": "₹1,10,000"},
-        "m.arch": {"1st year": "₹1,50,000", "2nd year": "₹1,25,000"}
-    }
-}
-# Main chat handling function
-def handle_user_message(user_msg):
-    user_msg_lower = user_msg.lower().strip()
-    reply = None 
-    # Check if user is asking about fees
-    if re.search(r"\b(fee|fees|amount|rupees|cost)\b", user_msg_lower):
-        found_course = None
-        for course in courses:
-            if course in user_msg_lower:
-                found_course = course
-                break
-
-        if found_course:
-            fee_info = courses.get(found_course)
-            if fee_info:
-                reply = f"💰 Fees for {found_course.upper()}:\n"
-                for year, amount in fee_info.items():
-                    reply += f"{year}: {amount}\n"
-            else:
-                reply = "❌ Sorry, no fee information found for that course."
-        else:
-            reply = "❌ Sorry, I didn’t understand. Please specify a correct course. Example: 'fees for CSE' or 'fees for MBBS'."
-
-
-# ----------------- Intents Keywords -----------------
-intents = {
-    "dress_code": [
-        "dress code", "uniform rules", "college attire", "what to wear", "clothing regulations",
-        "உடை விதிகள்", "யூனிபாம் விதிகள்", "கல்லூரி உடை", "என்ன அணிய வேண்டும்", "அணிவது எப்படி"
-    ],
-    "college_timing": [
-        "college timing", "class hours", "schedule", "lecture timings",
-        "கல்லூரி நேரம்", "மாணவர் நேரம்", "வகுப்பு நேரம்", "பாடநெறி நேரம்"
-    ],
-    "admission_eligibility": [
-        "eligibility criteria", "minimum marks required", "who can apply", "admission eligibility",
-        "விண்ணப்பதாரர்கள் யார்", "குறைந்த மதிப்பெண்கள்", "தகுதி நிபந்தனைகள்", "செல்லும் நிபந்தனை"
-    ],
-    "admission_process": [
-        "how to apply", "documents required", "application procedure", "admission process",
-        "விண்ணப்பிப்பது எப்படி", "தேவையான ஆவணங்கள்", "விண்ணப்ப செயல்முறை", "சேர்க்கை செயல்முறை"
-    ],
-    "fees": [
-        "fees", "fee", "tuition", "course fee", "கட்டணம்", "படிப்பின் கட்டணம்", "பாடநெறி கட்டணம்"
-    ],
-    "hostel": [
-        "hostel", "boys hostel", "girls hostel", "accommodation", "dormitory",
-        "ஹோஸ்டல்", "ஆண் ஹோஸ்டல்", "பெண் ஹோஸ்டல்", "வசதி"
-    ],
-    "courses": [
-
-        "courses", "arts", "science", "engineering", "medical", "law", "mba",
-        "பாடநெறிகள்", "கலை", "அறிவு விஞ்ஞானம்", "பொறியியல்", "மருத்துவம்", "நீதியியல்", "மேலாண்மை"
-    ]
-}
-
-
-college_timings = {
-    "mca": {
-        "1st year": "⏰ MCA 1st Year: Mon-Fri 10:00 AM - 5:00 PM, Lunch 1:00 PM - 2:00 PM; Sat 10:00 AM - 2:00 PM; Sun Holiday",
-        "2nd year": "⏰ MCA 2nd Year: Mon-Fri 10:00 AM - 5:00 PM, Lunch 1:00 PM - 2:00 PM; Sat 10:00 AM - 2:00 PM; Sun Holiday",
-    },
-    "btech": {
-        "1st year": "⏰ B.Tech 1st Year: Mon-Fri 9:00 AM - 4:00 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:00 AM - 1:00 PM; Sun Holiday",
-        "2nd year": "⏰ B.Tech 2nd Year: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "3rd year": "⏰ B.Tech 3rd Year: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "4th year": "⏰ B.Tech 4th Year: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday"
-    },
-    "mba": {
-        "1st year": "⏰ MBA 1st Year: Mon-Fri 9:30 AM - 4:30 PM, Lunch 1:00 PM - 2:00 PM; Sat 10:00 AM - 2:00 PM; Sun Holiday",
-        "2nd year": "⏰ MBA 2nd Year: Mon-Fri 9:30 AM - 4:30 PM, Lunch 1:00 PM - 2:00 PM; Sat 10:00 AM - 2:00 PM; Sun Holiday",
-    },
-    "law": {
-        "1st year": "⏰ Law 1st Year: Mon-Fri 9:00 AM - 4:00 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:00 AM - 1:00 PM; Sun Holiday",
-        "2nd year": "⏰ Law 2nd Year: Mon-Fri 9:00 AM - 4:00 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:00 AM - 1:00 PM; Sun Holiday",
-        "3rd year": "⏰ Law 3rd Year: Mon-Fri 9:00 AM - 4:00 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:00 AM - 1:00 PM; Sun Holiday",
-        "4th year": "⏰ Law 4th Year: Mon-Fri 9:00 AM - 4:00 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:00 AM - 1:00 PM; Sun Holiday",
-        "5th year": "⏰ Law 5th Year: Mon-Fri 9:00 AM - 4:00 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:00 AM - 1:00 PM; Sun Holiday",
-    },
-    "arts": {
-        "bcom": "⏰ B.Com: Mon-Fri 9:30 AM - 4:30 PM, Lunch 1:00 PM - 2:00 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "bba": "⏰ BBA: Mon-Fri 9:30 AM - 4:30 PM, Lunch 1:00 PM - 2:00 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "bsc tamil": "⏰ B.Sc Tamil: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "bsc english": "⏰ B.Sc English: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "ba history": "⏰ BA History: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-    },
-    "science": {
-        "bsc cs": "⏰ B.Sc CS: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "bsc ca": "⏰ B.Sc CA: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "bsc physics": "⏰ B.Sc Physics: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "bsc chemistry": "⏰ B.Sc Chemistry: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-        "bsc maths": "⏰ B.Sc Maths: Mon-Fri 9:30 AM - 4:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:30 AM - 1:30 PM; Sun Holiday",
-    },
-    "medical": {
-        "mbbs": "⏰ MBBS: Mon-Fri 8:00 AM - 3:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 8:00 AM - 1:00 PM; Sun Holiday",
-        "bds": "⏰ BDS: Mon-Fri 8:00 AM - 3:30 PM, Lunch 12:30 PM - 1:30 PM; Sat 8:00 AM - 1:00 PM; Sun Holiday",
-        "bpharm": "⏰ B.Pharm: Mon-Fri 9:00 AM - 4:00 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:00 AM - 1:00 PM; Sun Holiday",
-        "bsc nursing": "⏰ B.Sc Nursing: Mon-Fri 9:00 AM - 4:00 PM, Lunch 12:30 PM - 1:30 PM; Sat 9:00 AM - 1:00 PM; Sun Holiday",
-    }
-}
-
-
-dress_code = """👔 College Dress Code:
-• Boys: Formal shirt and pants, shoes
-• Girls: Salwar kameez / formal tops and chudi / saree, shoes
-• ID card must be worn at all times
-• Casual wear allowed only on Festivals and special events
-• Contact the Student Affairs Office for more details
-"""
-# ----------------- Predict Intent Function -----------------
-def predict_intent(user_input, intents):
-    user_input_lower = user_input.lower()
-
-    # 1️⃣ Exact match first
-    for intent_name, keywords in intents.items():
-        for kw in keywords:
-            if kw.lower() in user_input_lower:
-                return intent_name
-
-    # 2️⃣ Fuzzy match if no exact match
-    best_intent = None
-    best_match_score = 0
-    for intent_name, keywords in intents.items():
-        match = get_close_matches(user_input_lower, keywords, n=1, cutoff=0.6)
-        if match:
-            ratio = SequenceMatcher(None, user_input_lower, match[0]).ratio()
-            if ratio > best_match_score:
-                best_match_score = ratio
-                best_intent = intent_name
-    return best_intent
-
-responses = {
-    "dress_code": "👔 College Dress Code: Boys - formal shirt/pants; Girls - salwar/saree; ID card mandatory.",
-    "fees": "💰 Fees depend on course and year.",
-    "hostel": "🏠 Separate hostels for boys and girls; AC & Non-AC available."
-}
-
-
-def get_response(user_input, user_id="default"):
-    # Step 1: Predict intent
-    intent = predict_intent(user_input, intents)
-
-    # Step 2: Handle timing intent
-    if intent == "college_timing":
-        # ← Replace old user_state logic with this line
-        return get_college_timing(user_input)
-
-    # Step 3: Other known responses
-    elif intent and intent in responses:
-        return responses[intent]
-
-    # Step 4: Fallback
-    else:
-        return "Sorry, I didn't understand that. Could you please try again?"
-
-
-# Hostel Data
-boys_hostels = [
-    {"name": "Paari Hostel (AC)", "rooms": 50, "members_per_room": 2, "ac": True, "hostel_fees": 10000, "mess_fees": 20000},
-    {"name": "Kaari Hostel (AC)", "rooms": 40, "members_per_room": 2, "ac": True, "hostel_fees": 10000, "mess_fees": 20000},
-    {"name": "Oori Hostel (Non-AC)", "rooms": 60, "members_per_room": 3, "ac": False, "hostel_fees": 8000, "mess_fees": 20000},
-    {"name": "Adhiyaman Hostel (Non-AC)", "rooms": 55, "members_per_room": 3, "ac": False, "hostel_fees": 8000, "mess_fees": 20000},
-    {"name": "Marutham Hostel (Non-AC)", "rooms": 45, "members_per_room": 4, "ac": False, "hostel_fees": 8000, "mess_fees": 20000}
-]
-
-girls_hostels = [
-    {"name": "Yamuna Hostel (AC)", "rooms": 40, "members_per_room": 2, "ac": True, "hostel_fees": 10000, "mess_fees": 20000},
-    {"name": "Kalpana Hostel (AC)", "rooms": 35, "members_per_room": 2, "ac": True, "hostel_fees": 10000, "mess_fees": 20000},
-    {"name": "Sneha Hostel (Non-AC)", "rooms": 50, "members_per_room": 3, "ac": False, "hostel_fees": 8000, "mess_fees": 20000},
-    {"name": "Priya Hostel (Non-AC)", "rooms": 55, "members_per_room": 3, "ac": False, "hostel_fees": 8000, "mess_fees": 20000},
-    {"name": "Ruthra Hostel (Non-AC)", "rooms": 45, "members_per_room": 4, "ac": False, "hostel_fees": 8000, "mess_fees": 20000}
-]
-
-# Admission dates
-admission_start_date = datetime(2025, 5, 1)
-admission_deadline = datetime(2025, 6, 15)
-# ===== Campus Life Data =====
-campus_life = {
-    "clubs": {
-        "details": (
-            "SRM Institude Of Technology hosts a diverse range of student clubs and professional chapters "
-            "promoting holistic development and extracurricular engagement.<br><br>"
-            "📌 Active Clubs:<br>"
-            "• Rotaract Club – Social service and community projects.<br>"
-            "• Fashion Club – Fashion shows and creative styling.<br>"
-            "• Literature Club – Creative writing, debates, and poetry.<br>"
-            "• Social Club – Social awareness campaigns and events.<br>"
-            "• Self Defense Club – Martial arts and safety workshops.<br>"
-            "• GeeksforGeeks SRMIST – Coding and programming workshops.<br>"
-            "• CENTINEL – Cybersecurity training with domains like SoftwareGeeks, CyberSquad, and WebGen.<br><br>"
-            "💡 <b style='color:red;'>How to Join:</b> Visit the Student Affairs Office or the respective club stall during the Club Signup Week."
-        )
-    },
-    "cultural": {
-        "details": (
-            "🎭 SRM Institude Of Technology (AIT)hosts vibrant cultural events and annual fests that bring together students from all campuses.<br><br>"
-            "📌 Major Cultural Events:<br>"
-            "• Milan – Annual cultural extravaganza with music, dance, and theatre.<br>"
-            "• Rubaroo – Freshers cultural night.<br>"
-            "• Talent Hunt – Platform for students to showcase creative talents.<br>"
-            "• Department Fests – Each department hosts its own cultural & technical events.<br><br>"
-            "💡 <b style='color:red;'>How to Participate:</b> Register online through the cultural committee or contact your department cultural coordinator."
-        )
-    },
-    "sports": {
-        "details": (
-            "🏅 SRM Institude Of Technology (AIT)offers excellent sports facilities and actively promotes athletic activities.<br><br>"
-            "📌 Available Sports:<br>"
-            "• Cricket – Coach: Mr. Rajesh Kumar<br>"
-            "• Football – Coach: Mr. Suresh Reddy<br>"
-            "• Basketball – Coach: Ms. Priya Sharma<br>"
-            "• Badminton – Coach: Mr. Arvind Singh<br>"
-            "• Athletics & Track – Coach: Mr. Manoj Nair<br><br>"
-            "💡 Facilities: Indoor stadium, outdoor tracks, gymnasiums, swimming pool, tennis courts.<br>"
-            "💡 <b style='color:red;'>How to Join:</b> Contact the Sports Department Office or the respective coach."
-        )
-    }
-}
-BROCHURE_URL = "https://college.edu/brochure.pdf"
-
-def days_left_to_apply():
-    deadline = datetime(2025, 8, 31)
-    today = datetime.now()
-    remaining = (deadline - today).days
-    if remaining >= 0:
-        return f"Application deadline: {deadline.strftime('%d %B %Y')}<br>{remaining} days left to apply."
-    else:
-        return " The appication deadline has passed."
-    
-
-
-# ---------------- Chat Endpoint ----------------
-from datetime import datetime 
-@app.route("/chat", methods=["POST"])
-def chat():
-    user_msg = request.json.get("message", "")
-    if not isinstance(user_msg, str) or user_msg.strip() == "":
-        return jsonify({"reply": "⚠️ Please type a message."})
-    user_msg = user_msg.strip()
-    user_msg_lower = user_msg.lower()  
-    # ----------------- COURSE FEES LOGIC -----------------
-    reply = None
-
-    for dept, dept_courses in courses.items():
-        for course_name, fee_info in dept_courses.items():
-            if course_name.lower() in user_msg_lower:
-                reply = f"💰 Fees for {course_name.upper()}:\n"
-                for year, amount in fee_info.items():
-                    reply += f"{year}: {amount}\n"
-                break  # breaks inner loop
-        if reply:
-            break  # breaks outer loop if reply is found
-
-    # ===== FUZZY MATCH CHECKS =====
-    if not reply and fuzzy_match(user_msg_lower, intents.get("admission_eligibility", [])):
-        reply = (
-            "📌 Admission Eligibility:\n"
-            "• Must have passed 12th with minimum 50% marks (varies by course).\n"
-            "• Some courses may require entrance exams.\n"
-            "• For detailed eligibility, visit the Admissions Office or website."
-        )
-
-    if not reply and fuzzy_match(user_msg_lower, intents.get("admission_process", [])):
-        reply = (
-            "📝 Admission Process:\n"
-            "1. Fill online application form.\n"
-            "2. Submit required documents.\n"
-            "3. Appear for entrance exam (if applicable).\n"
-            "4. Confirm admission after fee payment."
-        )
-  
-
-
-# Dress Code Queries
-    if not reply:
-        try:
-            if fuzzy_match(user_msg_lower, intents.get("dress_code", [])):
-                reply = (
-                    "👔 College Dress Code:\n"
-                    "• Boys: Formal shirt and pants, shoes\n"
-                    "• Girls: Salwar kameez / formal tops and chudi / saree, shoes\n"
-                    "• ID card must be worn at all times\n"
-                    "• Casual wear allowed only on Festivals and special events\n"
-                    "• Contact the Student Affairs Office for more details"
-                )
-        except Exception as e:
-            reply = f"⚠️ Server error occurred: {str(e)}"
-
-    # 1️⃣ COLLEGE INFORMATION - English & Tamil
-    if not reply and any(phrase in user_msg_lower for phrase in [
-        # English keywords
-        "about college", "college details", "tell me about college",
-        "about our college", "information about college", "college information",
-        # Tamil keywords
-        "கல்லூரி பற்றிய", "கல்லூரி விவரங்கள்"
-    ]):
-        # If Tamil keyword detected
-        if any(phrase in user_msg_lower for phrase in ["கல்லூரி பற்றிய", "கல்லூரி விவரங்கள்"]):
-            reply = (
-            "<div style='text-align:center; font-size:22px; font-weight:bold;'>"
-            "🏫 SRM தொழில்நுட்ப நிறுவனம்"
-            "</div><br>"
-            "SRM தொழில்நுட்ப நிறுவனம் கல்வி சிறப்புமிக்க, நவீன வசதிகள் மற்றும் மாணவர் நட்பு சூழலுக்காக புகழ்பெற்றது.<br><br>"
-
-            "<b>👤 தலைமைச் செயலாளர்:</b> திரு. நள்ளத்தம்பி<br>"
-            "<b>🎓 தலைவர்:</b> டாக்டர் R. கிருஷ்ணமூர்த்தி<br>"
-            "<b>🏆 தேசிய ரேங்க்:</b> 15<br>"
-            "<b>🏆 மாநில ரேங்க்:</b> 2<br>"
-            "<b>👩‍🏫 பேராசிரியர்கள்:</b> 250+ அர்ப்பணிப்புடன் கூடிய ப்ரொஃபெசர்கள்<br>"
-            "<b>🎓 பி.எச்.டி. ஹோல்டர்கள்:</b> 80+ highly qualified faculty<br><br>"
-
-            "<b>💼 பிளேஸ்மென்ட்:</b> மாணவர்களை சிறந்த நிறுவனங்களில் வெற்றிகரமாக பிளேஸ் செய்துள்ளோம்.<br><br>"
-
-            "<b>📚 வசதிகள்:</b><br>• நவீன வகுப்பறைகள் மற்றும் ஸ்மார்ட் போர்டுகள்<br>"
-            "• நூலகம் - ஆயிரக்கணக்கான புத்தகங்கள்<br>"
-            "• உயர் தொழில்நுட்ப கணினி லேப்கள் மற்றும் வேகமான இன்டர்நெட்<br>"
-            "• அமைதியான மற்றும் பசுமை நிறைந்த வளாகம்<br><br>"
-
-            "<b>🏠 ஹாஸ்டல் வசதிகள்:</b><br>"
-            "• பையன்கள் மற்றும் பெண் மாணவர்களுக்கு தனித்தனியான ஹாஸ்டல்கள்<br>"
-            "• 24/7 பாதுகாப்பு மற்றும் CCTV கண்காணிப்பு<br>"
-            "• சத்துணவு மற்றும் சுத்தமான உணவுக்கூடங்கள்<br>"
-            "• ஓய்வுக்கூடங்கள் மற்றும் படிப்பு அறைகள்<br><br>"
-
-            "<b>🏅 விளையாட்டு மற்றும் செயல்பாடுகள்:</b><br>"
-            "• கிரிக்கெட், கால்பந்து, பேஸ்கெட்ட்பால், பேட்மிண்டன் மற்றும் தடகளம்<br>"
-            "• வருடாந்திர விளையாட்டு விழா மற்றும் இன்டர்கல்லூரி போட்டிகள்<br>"
-            "• பயிற்சியாளர்கள் மற்றும் உடற்பயிற்சி திட்டங்கள்<br><br>"
-
-            "<b>💡 நமது குறிக்கோள்:</b> 'அறிவை உருவாக்கி எதிர்காலத்தை கட்டமைப்போம்.'<br><br>"
-            "<b>கல்லூரியின் நோக்கம்:</b><br>"
-            "அறிவை உருவாக்கி உலக தரமான கல்வியை வழங்கும் கல்வி மற்றும் ஆராய்ச்சி சூழலை உருவாக்குவதே நோக்கம்.<br>"
-            "<b>கால்கட்டுக் குறிக்கோள்:</b><br>"
-            "சுதந்திரம், சுயம்செய்தல், படைப்பு மற்றும் புதுமையை ஊக்குவிக்கும் சூழலை உருவாக்குதல்."
-            )
-        else:
-        # English reply
-            reply = (
-            "<div style='text-align:center; font-size:22px; font-weight:bold;'>"
-            "🏫 SRM Institute of Technology"
-            "</div><br>"
-            "SRM Institute of Technology is one of the most prestigious institutions, renowned for its academic excellence, modern facilities, and student-friendly environment.<br><br>"
-
-            "<b>👤 CEO:</b> Mr. Nallathambi<br>"
-            "<b>🎓 Principal:</b> Dr. R. Krishnamoorthy<br>"
-            "<b>🏆 National Rank:</b> 15th<br>"
-            "<b>🏆 State Rank:</b> 2nd<br>"
-            "<b>👩‍🏫 Faculty Members:</b> 250+ dedicated professors<br>"
-            "<b>🎓 Ph.D. Holders:</b> 80+ highly qualified faculty members<br><br>"
-
-            "<b>💼 Placements:</b> We have successfully placed thousands of students in top multinational companies with attractive salary packages.<br><br>"
-
-            "<b>📚 Facilities:</b><br>• Spacious and modern classrooms with smart boards<br>"
-            "• Well-stocked library with thousands of academic and reference books<br>"
-            "• High-tech computer labs with fast internet<br>"
-            "• Peaceful and green campus for a positive learning environment<br><br>"
-
-            "<b>🏠 Hostel Facilities:</b><br>"
-            "• Separate hostels for boys and girls<br>"
-            "• 24/7 security and CCTV surveillance<br>"
-            "• Nutritious food and clean dining halls<br>"
-            "• Recreation rooms and study lounges<br><br>"
-
-            "<b>🏅 Sports & Activities:</b><br>"
-            "• Cricket, Football, Basketball, Badminton, and Athletics<br>"
-            "• Annual Sports Meet and Inter-College Competitions<br>"
-            "• Dedicated sports coaches and fitness programs<br><br>"
-
-            "<b>💡 Our Motto:</b> 'Innovating Minds, Building Futures.'<br><br>"
-            "<b>Vision of AIT:</b><br>"
-            "To emerge as a World-Class University in creating and disseminating knowledge, "
-            "and providing students a unique learning experience in science, technology, medicine, management and other areas of scholarship.<br>"
-            "<b>Mission of AIT:</b><br>"
-            "MOVE UP through international alliances and collaborative initiatives to achieve global excellence.<br>"
-            "ACCOMPLISH a process to advance knowledge in a rigorous academic and research environment.<br>"
-            "ATTRACT and BUILD people in a rewarding and inspiring environment by fostering freedom, empowerment, creativity, and innovation."
-            )
-
-# 2️⃣ COURSES LIST - English & Tamil
-    if not reply and any(phrase in user_msg_lower for phrase in ["courses","arts", "பாடநெறிகள்"]):
-        if any(phrase in user_msg_lower for phrase in ["பாடநெறிகள்"]):
-            reply = (
-            "📚 <b>நாம் வழங்கும் பாடநெறிகள்:</b><br><br>"
-            "<b>பொறியியல்:</b> EEE, ECE, CSE, Civil, Mechanical<br>"
-            "<b>கலை:</b> B.Com, BBA, B.Sc Tamil, B.Sc English, BA History<br>"
-            "<b>அறிவு விஞ்ஞானம்:</b> B.Sc CS, B.Sc CA, B.Sc Physics, B.Sc Chemistry, B.Sc Maths<br>"
-            "<b>மருத்துவம்:</b> MBBS, BDS, B.Pharm, B.Sc Nursing<br>"
-            "<b>நீதியியல்:</b> LLB, BA LLB, BBA LLB<br>"
-            "<b>கலைக்கலைப்பொருளமைப்பு:</b> B.Arch, M.Arch"
-            )
-        else:
-            reply = (
-            "📚 <b>Our Courses:</b><br><br>"
-            "<b>Engineering:</b> EEE, ECE, CSE, Civil, Mechanical<br>"
-            "<b>Arts:</b> B.Com, BBA, B.Sc Tamil, B.Sc English, BA History<br>"
-            "<b>Science:</b> B.Sc CS, B.Sc CA, B.Sc Physics, B.Sc Chemistry, B.Sc Maths<br>"
-            "<b>Medical:</b> MBBS, BDS, B.Pharm, B.Sc Nursing<br>"
-            "<b>Law:</b> LLB, BA LLB, BBA LLB<br>"
-            "<b>Architecture:</b> B.Arch, M.Arch"
-            )
-    # 3️⃣ FEES STRUCTURE
-    # Convert user input to lowercase and remove extra spaces
-    def get_course_name(user_msg):
-        user_msg = user_msg.lower()
-        for dept, dept_courses in courses.items():
-            for course_name in dept_courses.keys():
-                if course_name in user_msg:
-                    return course_name
-        return None
-
-
-
-    #for 4️⃣ HOSTEL DETAILS
-    # Hostel details
-    # 4️⃣ HOSTEL DETAILS
-    if not reply and any(word in user_msg_lower for word in ["hostel", "boys", "girls", "ஆண்கள்", "பெண்கள்", "ஹோஸ்டல்"]):
-        details = ""
-        try:
-            if "boys" in user_msg_lower or "ஆண்கள்" in user_msg_lower:
-                details = "<b>🏠 Boys Hostels:</b><br>"
-                for h in boys_hostels:
-                    details += f"{h['name']} - {'AC' if h['ac'] else 'Non-AC'}<br>Rooms: {h['rooms']}, Members/Room: {h['members_per_room']}<br>Hostel Fees: ₹{h['hostel_fees']}, Mess Fees: ₹{h['mess_fees']}<br><br>"
-                reply = details
-
-            elif "girls" in user_msg_lower or "பெண்கள்" in user_msg_lower:
-                details = "<b>🏠 Girls Hostels:</b><br>"
-                for h in girls_hostels:
-                    details += f"{h['name']} - {'AC' if h['ac'] else 'Non-AC'}<br>Rooms: {h['rooms']}, Members/Room: {h['members_per_room']}<br>Hostel Fees: ₹{h['hostel_fees']}, Mess Fees: ₹{h['mess_fees']}<br><br>"
-                reply = details
-
-            else:
-                reply = (
-                "<b>🏠 Hostel Details:</b><br>"
-                "Separate hostels for boys and girls with AC & Non-AC rooms.<br>"
-                "24/7 Security, WiFi, Study Room, Gym & Medical Facilities available.<br>"
-                "Use 'boys hostel' or 'girls hostel' to get more details."
-                )
-        except Exception as e:
-            reply = f"⚠️ Error fetching hostel data: {str(e)}"
-
-
-
-    # 📌 PLACEMENT DETAILS
-    if not reply and any(word in user_msg_lower for word in ["placements", "placement details", "placement info","பதவி"]):
-        reply =(
-                "<b>💼 Placement Information - SRM Institute of Technology</b><br><br>"
-                "🌟 <i>We provide one of the best placement opportunities for our students, "
-                "connecting them with top recruiters across India and abroad.</i><br><br>"
-                
-                "<b>🏆 Top Companies Visiting:</b><br>"
-                "• TCS - ₹12 LPA<br>"
-                "• Infosys - ₹10 LPA<br>"
-                "• Wipro - ₹9 LPA<br>"
-                "• HCL - ₹8 LPA<br>"
-                "• Cognizant - ₹8.5 LPA<br><br>"
-
-                "<b>📜 Eligibility for Placement:</b><br>"
-                "• You must score more than 75% in semester exams to apply.<br>"
-                "• Placement fees will be collected in your final year.<br>"
-                "• The fee will be informed in the final year and will be under ₹1,50,000.<br><br>"
-
-                "<b> Placement Related Trainings:</b><br>"
-                "We will provide placement trainings during your final year.<br>"
-                "Like Aptitude,Programming,Communication<br><br>"
-
-                "<b>Placement Fee:</b> Paid separately in the final year.<br><br>"
-                "<b>Note:</b> Fee amount will be announced during the final year.<br>"
-        )
-
-    # 📌 PREVIOUS YEAR PLACEMENT STATUS
-    if not reply and any(word in user_msg_lower for word in ["previous year placement", "past placements", "placement stats","முன்னாள் பதவிகள்"]):
-        
-        reply = (
-                "<b>📊 Previous Year Placement Statistics</b><br><br>"
-                
-                "<u>2024</u><br>"
-                "• Overall: 95% placed<br>"
-                "• Engineering: IT - 300, Non-IT - 150<br>"
-                "• Arts: IT - 80, Non-IT - 70<br>"
-                "• Science: IT - 90, Non-IT - 60<br><br>"
-
-                "<u>2023</u><br>"
-                "• Overall: 92% placed<br>"
-                "• Engineering: IT - 280, Non-IT - 140<br>"
-                "• Arts: IT - 75, Non-IT - 65<br>"
-                "• Science: IT - 85, Non-IT - 55<br><br>"
-
-                "<u>2022</u><br>"
-                "• Overall: 90% placed<br>"
-                "• Engineering: IT - 260, Non-IT - 130<br>"
-                "• Arts: IT - 70, Non-IT - 60<br>"
-                "• Science: IT - 80, Non-IT - 50<br>"
-        )
-
-    # 4️⃣ College timing (Add your code here)
-    elif "college timing" in user_msg_lower or "timing" in user_msg_lower:
-        reply = ""
-        for course, years in college_timings.items():
-            if course in user_msg_lower:
-                if isinstance(years, dict):
-                    for year, timing in years.items():
-                        reply += f"{timing}\n"
-                else:
-                    reply = years
-                break
-        if not reply:
-            reply = "⏰ College Timings:\n"
-            for course, years in college_timings.items():
-                if isinstance(years, dict):
-                    for year, timing in years.items():
-                        reply += f"{timing}\n"
-                else:
-                    reply += f"{years}\n"
-
-    # 4️⃣ ADMISSION DATE
-    if not reply and any(word in user_msg_lower for word in ["admission date", "start of admission", "when will admission start", "சென்னை"]):
-        days_left = (admission_start_date - datetime.now()).days
-        reply = (
-                f"📅 Admission at <b>SRM Institute of Technology</b> starts on "
-                f"<b>{admission_start_date.strftime('%d-%m-%Y')}</b>.<br>"
-                f"⏳ Only <b>{days_left}</b> days left!<br>"
-                f"🔥 Hurry up! Secure your seat and start your journey towards excellence."
-            )
-
-    # 5️⃣ ADMISSION DEADLINE
-    if not reply and any(word in user_msg_lower for word in ["admission deadline", "last date for admission", "end of admission","முடிவும்"]):
-        days_left = (admission_deadline - datetime.now()).days
-        if days_left < 0:
-            reply = "⚠ Admission deadline has passed."
-        else:
-            reply = f"📅 Admission ends on {admission_deadline.strftime('%d-%m-%Y')}<br>⏳ Only {days_left} days left!"
-
-    # ===== Campus Life Queries =====
-    if any(word in user_msg_lower for word in ["club", "clubs", "student club", "society", "கிளப்புகள்"]):
-        reply= f"<b>🏛 Clubs at AIT:</b><br><br>{campus_life['clubs']['details']}"
-    
-    elif any(word in user_msg_lower for word in ["cultural", "fest", "annual day", "milan", "rubaroo","கலை நிகழ்ச்சி"]):
-        reply= f"<b>🎭 Cultural & Annual Fests at AIT:</b><br><br>{campus_life['cultural']['details']}"
-    elif any(word in user_msg_lower for word in ["sports", "games", "athletics", "coach", "football", "cricket", "basketball","விளையாட்டு"]):
-        reply= f"<b>🏅 Sports at AIT:</b><br><br>{campus_life['sports']['details']}"
-    # Contact details
-    if any(word in user_msg_lower for word in ["contact", "phone", "email", "reach you", "call you", "college contact","தொடர்பு"]):
-        reply=(
-                "<b>📞 Contact Details:</b><br>"
-                "Phone: <a href='tel:+911234567890'>+91 12345 67890</a><br>"
-                "Email: <a href='mailto:info@srmcollege.edu'>info@srmcollege.edu</a>"
-                "<b>If you have any queries, you can visit our Admissions Office between 9:00 AM and 5:00 PM, Monday to Saturday.</b>"
-        )
-            # ENTRANCE EXAM INFORMATION
-    elif (
-        "entrance exam" in user_msg_lower
-        or "exam date" in user_msg_lower
-        or "is there any entrance" in user_msg_lower
-        or "entrance test" in user_msg_lower
-    ):
-       # Department-specific entrance details
-       if "engineering" in user_msg_lower or "cse" in user_msg_lower or "ece" in user_msg_lower or "eee" in user_msg_lower:
-        exam_info = "🛠️ For Engineering (B.E/B.Tech), admission is based on JEE / TNEA counselling depending on your state."
-       elif "medical" in user_msg_lower or "mbbs" in user_msg_lower or "bds" in user_msg_lower or "bpharm" in user_msg_lower or "nursing" in user_msg_lower:
-        exam_info = "🩺 For Medical courses (MBBS, BDS, B.Pharm, Nursing), admission is through NEET (National Eligibility cum Entrance Test)."
-       elif "mba" in user_msg_lower or "management" in user_msg_lower:
-        exam_info = "📊 For MBA, admission is based on an entrance exam conducted by SRM / or valid scores from CAT, MAT, XAT, or TANCET."
-       elif "law" in user_msg_lower or "llb" in user_msg_lower:
-        exam_info = "⚖️ For Law courses (LLB, BA LLB, BBA LLB), admission is usually through CLAT (Common Law Admission Test)."
-       elif "architecture" in user_msg_lower or "barch" in user_msg_lower or "m.arch" in user_msg_lower:
-        exam_info = "🏛 For Architecture (B.Arch, M.Arch), admission is based on NATA (National Aptitude Test in Architecture)."
-       elif "arts" in user_msg_lower or "science" in user_msg_lower:
-        exam_info = "📚 For Arts & Science courses (B.Com, BBA, B.Sc, BA, etc.), admission is usually merit-based (marks in 12th standard)."
-       else:
-        exam_info = "📝 Entrance exam requirements vary by course. Please specify your department (Engineering, Medical, Law, Architecture, Arts, or Science)."
-        reply= (
-                "<b>📝 Entrance Exam Details – SRM College</b><br><br>"
-                "<b>🎓 Courses Requiring Entrance Exams:</b><br>"
-                "• B.Tech – 10 September 2025 (Offline, 2 hours)<br>"
-                "• MBA – 15 September 2025 (Online, 1.5 hours)<br>"
-                "• B.Sc Nursing – 18 September 2025 (Offline, 2 hours)<br><br>"
-                "<b>📌 Courses Without Entrance Exam:</b><br>"
-                "• All Arts & Science degree programs – Direct admission based on 12th grade marks<br><br>"
-                "<b>⚠ Note:</b> Admit cards will be available online 7 days before the exam.<br>"
-                "<b>📍 Exam Centres:</b> We will inform you about your exam centre and timing 2 days before the exam date.<br><br>"
-                f"<b>🔎 Department-specific Info:</b><br>{exam_info}"
-            )
- # Direct department-only queries
-    elif any(word in user_msg_lower for word in ["medical", "mbbs", "bds", "bpharm", "nursing", "மருத்துவம்"]):
-        reply = "🩺 For Medical courses, admission is through NEET (National Eligibility cum Entrance Test)."
-    elif fuzzy_match(user_msg_lower, ["engineering", "cse", "eee", "ece"]):
-        reply = "🛠️ For Engineering (B.E/B.Tech), admission is based on JEE / TNEA counselling."
-    elif any(word in user_msg_lower for word in ["mba", "management"]):
-        reply = (
-            "📊 For MBA admission:<br>"
-            "• Entrance exam conducted by SRM<br>"
-            "• OR valid scores from CAT, MAT, XAT, or TANCET"
-        )
-    elif any(word in user_msg_lower for word in ["law", "llb"]):
-        reply = "⚖️ For Law courses, admission is usually through CLAT."
-    elif any(word in user_msg_lower for word in ["architecture", "barch", "m.arch"]):
-        reply = "🏛 For Architecture, admission is based on NATA."
-    elif any(word in user_msg_lower for word in ["arts", "science", "bcom", "bsc"]):
-        reply = "📚 For Arts & Science courses, admission is usually merit-based (12th marks)."
-        # If nothing matched
-    
-
-    # ----------------- AI DEFAULT RESPONSE -----------------
-    if not reply:
-        reply = get_response(user_msg)  # Use AI response if no course fees match
-    # Fallback if AI also fails
-        if not reply:
-            reply = (
-                "மன்னிக்கவும், எனக்கு அது புரியவில்லை. மீண்டும் முயற்சிக்க முடியுமா?"
-                if is_tamil(user_msg)
-                else "Sorry, I didn't understand that. Could you please try again?"
-            )
-
-# Translate if Tamil detected
-    reply = translate_reply_deep(reply, user_msg)
-    return jsonify({"reply": reply})
-
-
-
-# ---------------- Database Setup ----------------
-def init_db():
-    with sqlite3.connect("users.db") as conn:
-        cursor = conn.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS users (
-                          id INTEGER PRIMARY KEY AUTOINCREMENT,
-                          username TEXT UNIQUE,
-                          password TEXT)''')
-        conn.commit()
-init_db()
-
-# ---------- home page ----------
-@app.route("/")
-def home():
-    return render_template("index.html")
-
-@app.route("/chatbot")
-def chatbot_page():
-    return render_template("chatbot.html")
-@app.route("/exit")
-def exit_page():
-    return redirect(url_for('home'))
-
-# ---------- Run ----------
-if __name__ == "__main__":
+import os
+import re
+import json
+import gzip
+import hashlib
+import mimetypes
+import time
+import threading
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, request, jsonify, session, redirect, render_template, url_for, Response, stream_with_context, send_file
+from markupsafe import Markup
+from werkzeug.middleware.proxy_fix import ProxyFix
+from flask_cors import CORS
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from academic_calendar import AcademicCalendar
+from intent_engine import KeywordIndex
+from language import detect_language, has_tamil
+from entity_index import EntityIndex
+from fee_tables import FeeTable, HostelTable, format_rupees, year_index
+from fuzzy_index import FuzzyIndex
+from knowledge_base import KnowledgeBase
+from metrics import Metrics, RequestProfiler
+from user_store import UserStore
+from auth import AuthBusy, AuthService
+from reply_cache import ReplyCache, normalize_query
+from session_store import SessionStore
+from query_log import QueryLog
+from retrieval import BM25Index
+from admission import ConcurrencyLimiter, RateLimiter
+from assets import AssetStore
+from translation import GoogleBackend, TranslationCache, load_catalog
+from cache_backends import make_backend
+
+app = Flask(__name__, template_folder=".")   # index.html / chatbot.html sit next to this file
+CORS(app)  # ✅ Allow frontend to call Flask API
+app.secret_key = "supersecretkey"  # required for login sessions
+
+# ---------------- Shared Cache ----------------
+# Store behind the per-worker reply and translation caches, shared by all
+# workers: "sqlite:////path/to/cache.db" (one host), "redis://host:6379/0"
+# (many hosts) or "memory://" (this process only). See cache_backends.py.
+# The default file sits next to this one, whatever directory workers start in.
+SHARED_CACHE_URL = "sqlite:///" + os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache.db")
+SHARED_CACHE_SIZE = 100_000                # entries kept in the shared store
+shared_cache = make_backend(SHARED_CACHE_URL, max_entries=SHARED_CACHE_SIZE)
+
+# ---------------- Translation Cache ----------------
+TRANSLATION_CACHE_SIZE = 2048              # replies kept in memory
+TRANSLATION_CACHE_TTL = 7 * 24 * 3600      # seconds
+TRANSLATION_CATALOG = "catalog_ta.json"    # built by build_catalog.py
+TRANSLATION_CONCURRENCY = 8                # upstream calls in flight (asgi.py)
+TRANSLATION_TIMEOUT = 5.0                  # seconds per upstream call (asgi.py)
+BATCH_CHUNK_SIZE = 500                     # messages routed/translated per step in /chat/batch
+STREAM_TRANSLATION_WORKERS = 4             # chunks of one /chat/stream reply translated in parallel
+translation_cache = TranslationCache(
+    GoogleBackend(),
+    max_entries=TRANSLATION_CACHE_SIZE,
+    ttl=TRANSLATION_CACHE_TTL,
+    store=shared_cache,
+    catalogs={"ta": load_catalog(TRANSLATION_CATALOG, "ta")},
+)
+
+# ---------------- Metrics ----------------
+METRICS_ENABLED = True          # per-stage timings and branch counters on /metrics
+PROFILE_SAMPLE_RATE = 0.0       # share of /chat requests run under cProfile
+PROFILE_DIR = "profiles"        # where sampled .prof files are written
+metrics = Metrics(enabled=METRICS_ENABLED, help={
+    "replies_total": "Replies by the routing branch that produced them.",
+    "route_seconds": "Time to route a message, by branch.",
+    "stage_seconds": "Time spent in each chat pipeline stage.",
+    "auth_total": "Login and registration attempts by outcome.",
+    "retrieval_total": "Cascade misses by whether the retrieval fallback answered them.",
+    "admission_total": "Chat requests rate-limited or answered untranslated under load, by result.",
+})
+profiler = RequestProfiler(PROFILE_SAMPLE_RATE, PROFILE_DIR)
+
+def fuzzy_match(user_msg, group, cutoff=0.6, kb=None):
+    """True if a keyword of `group` (an intent or FUZZY_EXTRA_GROUPS) is a close match."""
+    kb = kb or knowledge.current
+    return kb.fuzzy_index.close_match(user_msg, group, cutoff) is not None
+
+# ---------------- Helper Functions ----------------
+def is_tamil(text):
+    """Check if text contains Tamil characters (mixed Tamil-English counts)"""
+    return has_tamil(text)
+
+def calculate_deadline(date_str):
+    """
+    Calculate the number of days left until the given date.
+    date_str format: '24 October 2025'
+    """
+    try:
+        exam_date = datetime.strptime(date_str, "%d %B %Y")
+        days_left = knowledge.current.academic_calendar.days_until(exam_date)
+        if days_left > 0:
+            return f"🗓 Days left: {days_left} day{'s' if days_left > 1 else ''}"
+        elif days_left == 0:
+            return "🗓 The exam is today!"
+        else:
+            return "⚠ The exam date has passed."
+    except ValueError:
+        return "⚠ Invalid date format. Use DD Month YYYY (e.g., 24 October 2025)."
+
+def translate_reply_deep(reply, user_msg):
+    """Translate reply to Tamil through the translation cache.
+
+    Going upstream takes a slot in `translation_slots`; a request that gets
+    none is shed and keeps the English reply.
+    """
+    if is_tamil(user_msg):
+        _, cached = translation_cache.lookup(reply, "ta")
+        if cached is not None:
+            return cached
+        with translation_slots.slot() as admitted:
+            if not admitted:
+                metrics.inc("admission_total", result="shed")
+                return reply
+            try:
+                return translation_cache.translate(reply, "ta")
+            except Exception as e:
+                print("Translation error:", e)
+                return reply
+    return reply
+
+
+# ---------------- FAQ Data ----------------
+# Courses, timings, hostels, campus life, intents, admission dates and entity
+# aliases live in data/*.json and are served by `knowledge` (see knowledge_base.py).
+# Main chat handling function
+def handle_user_message(user_msg):
+    user_msg_lower = user_msg.lower().strip()
+    kb = knowledge.current
+    reply = None 
+    # Check if user is asking about fees
+    if re.search(r"\b(fee|fees|amount|rupees|cost)\b", user_msg_lower):
+        found_course = kb.entities.extract(user_msg_lower).get("course")
+
+        if found_course:
+            reply = kb.replies["fees"].get(found_course) or "❌ Sorry, no fee information found for that course."
+        else:
+            reply = "❌ Sorry, I didn’t understand. Please specify a correct course. Example: 'fees for CSE' or 'fees for MBBS'."
+    return reply
+
+
+
+
+dress_code = """👔 College Dress Code:
+• Boys: Formal shirt and pants, shoes
+• Girls: Salwar kameez / formal tops and chudi / saree, shoes
+• ID card must be worn at all times
+• Casual wear allowed only on Festivals and special events
+• Contact the Student Affairs Office for more details
+"""
+# ----------------- Predict Intent Function -----------------
+def predict_intent(user_input, kb=None):
+    kb = kb or knowledge.current
+    user_input_lower = user_input.lower()
+
+    # 1️⃣ Exact match first
+    hits = kb.router.scan(user_input_lower)
+    if "intent" in hits:
+        return hits["intent"]
+
+    # 2️⃣ Fuzzy match if no exact match
+    best_intent, best_match_score = kb.fuzzy_index.best_label(user_input_lower, kb.intents)
+    return best_intent
+
+responses = {
+    "dress_code": "👔 College Dress Code: Boys - formal shirt/pants; Girls - salwar/saree; ID card mandatory.",
+    "fees": "💰 Fees depend on course and year.",
+    "hostel": "🏠 Separate hostels for boys and girls; AC & Non-AC available."
+}
+
+
+def get_response(user_input, user_id="default", kb=None):
+    kb = kb or knowledge.current
+    # Step 1: Predict intent
+    intent = predict_intent(user_input, kb)
+
+    # Step 2: Handle timing intent
+    if intent == "college_timing":
+        # ← Replace old user_state logic with this line
+        return get_college_timing(user_input, kb)
+
+    # Step 3: Other known responses
+    elif intent and intent in responses:
+        return responses[intent]
+
+    # Step 4: Fallback
+    else:
+        return "Sorry, I didn't understand that. Could you please try again?"
+
+
+BROCHURE_URL = "https://college.edu/brochure.pdf"
+
+def days_left_to_apply():
+    return knowledge.current.academic_calendar.today().replies["application_deadline"]
+
+
+# ---------------- Precomputed Replies ----------------
+# Fee, hostel and timing answers only change with the data, so they are
+# rendered once here and looked up by course / gender / programme.
+def render_fee_reply(course_name, fee_info):
+    lines = [f"💰 Fees for {course_name.upper()}:\n"]
+    lines.extend(f"{year}: {amount}\n" for year, amount in fee_info.items())
+    return "".join(lines)
+
+
+def render_hostel_reply(title, hostels):
+    lines = [f"<b>🏠 {title}:</b><br>"]
+    lines.extend(
+        f"{h['name']} - {'AC' if h['ac'] else 'Non-AC'}<br>Rooms: {h['rooms']}, Members/Room: {h['members_per_room']}<br>"
+        f"Hostel Fees: ₹{h['hostel_fees']}, Mess Fees: ₹{h['mess_fees']}<br><br>"
+        for h in hostels
+    )
+    return "".join(lines)
+
+
+def render_timing_lines(years):
+    if isinstance(years, str):
+        return years
+    return "".join(f"{timing}\n" for timing in years.values())
+
+
+def build_reply_templates(kb):
+    """Render every data-driven reply; rebuilt by `knowledge` when data changes."""
+    fee_rows = {course: kb.fee_table.rows(course) for course in kb.fee_table.courses}
+    fee_infos = {course: {year: format_rupees(paise) for year, paise in rows} for course, rows in fee_rows.items()}
+    return {
+        "fees": {course_name: render_fee_reply(course_name, fee_info) for course_name, fee_info in fee_infos.items()},
+        "hostel": {
+            "boys": render_hostel_reply("Boys Hostels", kb.hostels["boys"]),
+            "girls": render_hostel_reply("Girls Hostels", kb.hostels["girls"]),
+        },
+        "timing": {course: render_timing_lines(years) for course, years in kb.college_timings.items()},
+        # one-year answers for follow-ups ("what about 2nd year?")
+        "fee_year": {
+            course_name: {year: render_fee_reply(course_name, {year: amount}) for year, amount in fee_info.items()}
+            for course_name, fee_info in fee_infos.items()
+        },
+        "timing_year": {
+            course: {year: f"{timing}\n" for year, timing in years.items()}
+            for course, years in kb.college_timings.items()
+            if not isinstance(years, str)
+        },
+        "timing_all": "⏰ College Timings:\n" + "".join(
+            f"{years}\n" if isinstance(years, str) else render_timing_lines(years)
+            for years in kb.college_timings.values()
+        ),
+        "exam_dates": "".join(
+            f"• {e['course']} – {e['date'].strftime('%d %B %Y')} ({e['mode']}, {e['duration']})<br>"
+            for e in kb.calendar["events"] if e["kind"] == "exam"
+        ),
+    }
+
+
+def get_college_timing(user_input, kb=None):
+    """Timing reply for the programme named in `user_input`, else all timings."""
+    kb = kb or knowledge.current
+    program = kb.entities.extract(user_input).get("program")
+    return kb.replies["timing"].get(program) or kb.replies["timing_all"]
+
+
+# ---------------- Academic Calendar ----------------
+# Admission and exam dates come from data/calendar.json. Replies with day
+# counters are rendered once per day and served until midnight here.
+CALENDAR_TIMEZONE = "Asia/Kolkata"   # IANA name; None uses the server's local time
+
+
+def days_phrase(days):
+    if days == 0:
+        return "today"
+    return f"{days} day{'s' if days != 1 else ''} left"
+
+
+def render_calendar_replies(calendar, day):
+    """Replies that mention how many days are left; rendered at each rollover."""
+    events, left = calendar.events, day.days_left
+    start, deadline, apply_by = (events[k] for k in ("admission_start", "admission_deadline", "application_deadline"))
+    if left["admission_start"] >= 0:
+        admission_date = (
+            f"📅 Admission at <b>SRM Institute of Technology</b> starts on "
+            f"<b>{start['date'].strftime('%d-%m-%Y')}</b>.<br>"
+            f"⏳ Only <b>{left['admission_start']}</b> days left!<br>"
+            f"🔥 Hurry up! Secure your seat and start your journey towards excellence."
+        )
+    else:
+        admission_date = (
+            f"📅 Admission at <b>SRM Institute of Technology</b> started on "
+            f"<b>{start['date'].strftime('%d-%m-%Y')}</b>.<br>"
+            + (f"⏳ It closes on {deadline['date'].strftime('%d-%m-%Y')} ({days_phrase(left['admission_deadline'])})."
+               if left["admission_deadline"] >= 0 else "⚠ Admission deadline has passed.")
+        )
+    if left["admission_deadline"] >= 0:
+        admission_deadline = (
+            f"📅 Admission ends on {deadline['date'].strftime('%d-%m-%Y')}<br>"
+            f"⏳ Only {left['admission_deadline']} days left!"
+        )
+    else:
+        admission_deadline = "⚠ Admission deadline has passed."
+    if left["application_deadline"] >= 0:
+        application_deadline = (
+            f"Application deadline: {apply_by['date'].strftime('%d %B %Y')}<br>"
+            f"{left['application_deadline']} days left to apply."
+        )
+    else:
+        application_deadline = " The application deadline has passed."
+    if day.upcoming:
+        upcoming = "<b>🗓 Upcoming Dates:</b><br>" + "".join(
+            f"• {e['title']} – {e['date'].strftime('%d %B %Y')} ({days_phrase(days)})<br>"
+            for e, days in day.upcoming
+        )
+    else:
+        upcoming = "🗓 There are no upcoming admission or exam dates right now. Please check back soon."
+    return {
+        "admission_date": admission_date,
+        "admission_deadline": admission_deadline,
+        "application_deadline": application_deadline,
+        "upcoming_events": upcoming,
+    }
+
+
+def build_calendar(kb):
+    tz = ZoneInfo(CALENDAR_TIMEZONE) if CALENDAR_TIMEZONE else None
+    return AcademicCalendar(kb.calendar["events"], tz, render=render_calendar_replies)
+
+
+# ---------------- Fee & Hostel Queries ----------------
+# "total fee for cse", "courses under 50k", "cheapest ac hostel for girls":
+# filters, sorts and sums over the typed columns in kb.fee_table and
+# kb.hostel_table (fee_tables.py). Amounts are in paise until rendered.
+FEE_LIST_LIMIT = 10      # courses listed in one reply
+# branches of route() whose answer a fee query replaces (None: nothing matched yet)
+FEE_QUERY_REFINES = {None, "fees", "course_list", "hostel", "medical", "engineering", "mba", "law",
+                     "architecture", "arts_science"}
+# an amount: optional currency, number, optional unit ("₹50,000", "rs 20k", "1.5 lakh")
+FEE_AMOUNT = r"(₹\s*|rs\.?\s*|inr\s*)?(\d[\d,]*(?:\.\d+)?)\s*(k|lakhs?|lacs?|l)?(?![\w,])"
+FEE_LIMIT_RE = re.compile(
+    r"\b(under|below|less than|within|up to|upto|max|maximum|cheaper than|above|over|more than|at least|min|minimum)"
+    rf"\s+{FEE_AMOUNT}"
+)
+FEE_RANGE_RE = re.compile(rf"\bbetween\s+{FEE_AMOUNT}\s*(?:and|to|-)\s*{FEE_AMOUNT}")
+FEE_LIMIT_UNITS = {"k": 1_000, "l": 100_000, "lakh": 100_000, "lakhs": 100_000, "lac": 100_000, "lacs": 100_000}
+NON_AC_RE = re.compile(r"\bnon[- ]?ac\b")
+AC_RE = re.compile(r"\bac\b")
+
+
+def build_fee_table(kb):
+    return FeeTable(kb.courses)
+
+
+def build_hostel_table(kb):
+    return HostelTable(kb.hostels)
+
+
+def to_paise(number, unit):
+    """Paise for an amount as typed; None if it is too large to be a fee limit."""
+    try:
+        return round(float(number.replace(",", "")) * FEE_LIMIT_UNITS.get(unit, 1) * 100)
+    except (OverflowError, ValueError):
+        return None
+
+
+def fee_limits(text):
+    """(min, max, priced) for the fee range named in `text` ("under 50,000",
+    "above 1.5 lakh", "between 20k and 50k"); min/max are in paise.
+
+    `priced` is True if an amount carried a currency sign or unit, i.e. is
+    money rather than marks or a percentage. An amount too large to convert
+    sets no limit, and a range given high to low is read low to high.
+    """
+    low = high = None
+    priced = False
+    for currency, number, unit, currency2, number2, unit2 in FEE_RANGE_RE.findall(text):
+        # "between 1 and 2 lakh": the unit of the second amount applies to both
+        low, high = to_paise(number, unit or unit2), to_paise(number2, unit2)
+        priced = priced or bool(currency or unit or currency2 or unit2)
+    for word, currency, number, unit in FEE_LIMIT_RE.findall(text):
+        if word in ("above", "over", "more than", "at least", "min", "minimum"):
+            low = to_paise(number, unit)
+        else:
+            high = to_paise(number, unit)
+        priced = priced or bool(currency or unit)
+    if low is not None and high is not None and low > high:
+        low, high = high, low
+    return low, high, priced
+
+
+def describe_limits(low, high):
+    if low is not None and high is not None:
+        return f" between {format_rupees(low)} and {format_rupees(high)}"
+    if high is not None:
+        return f" under {format_rupees(high)}"
+    if low is not None:
+        return f" over {format_rupees(low)}"
+    return ""
+
+
+def hostel_query(text, hits, kb, low, high):
+    table = kb.hostel_table
+    gender = None
+    if "hostel_boys" in hits and "hostel_girls" not in hits:
+        gender = "boys"
+    elif "hostel_girls" in hits and "hostel_boys" not in hits:
+        gender = "girls"
+    ac = False if NON_AC_RE.search(text) else True if AC_RE.search(text) else None
+    costliest = "fee_rank_high" in hits
+    rows = table.select(gender, ac, low, high, descending=costliest)
+    what = " ".join(filter(None, [{True: "AC", False: "Non-AC"}.get(ac), gender and gender.title(), "Hostels"]))
+    if not len(rows):
+        return f"🏠 No {what}{describe_limits(low, high)} found. Ask for \"hostel\" to see them all."
+    if "fee_rank_low" in hits or costliest:
+        rows = rows[:1]
+        title = f"{'Costliest' if costliest else 'Cheapest'} {what[:-1]}"
+    elif low is None and high is None:
+        title = f"{what} by total fee"
+    else:
+        title = f"{what}{describe_limits(low, high)}"
+    lines = [f"<b>🏠 {title}:</b><br>"]
+    lines.extend(
+        f"{table.names[i]}<br>Rooms: {table.rooms[i]}, Members/Room: {table.members_per_room[i]} "
+        f"({table.capacity[i]} students)<br>Hostel Fees: {format_rupees(table.hostel_fee[i])}, "
+        f"Mess Fees: {format_rupees(table.mess_fee[i])}, Total: {format_rupees(table.total[i])}<br><br>"
+        for i in rows
+    )
+    return "".join(lines)
+
+
+def course_fee_query(hits, entities, kb, low, high):
+    table = kb.fee_table
+    course = entities.get("course")
+    by_total = "fee_total" in hits
+    if course and by_total and low is None and high is None:
+        rows = table.rows(course)
+        lines = [f"💰 Total fee for {course.upper()} ({len(rows)} years): {format_rupees(table.total[table.code[course]])}\n"]
+        lines.extend(f"{year}: {format_rupees(paise)}\n" for year, paise in rows)
+        return "".join(lines)
+    department = entities.get("department")
+    year = entities.get("year")
+    codes, fees = table.select(department, year and year_index(year), low, high, by="total" if by_total else "annual")
+    what = f"{year} fee" if year else "total fee" if by_total else "yearly fee"
+    where = f" in {department.title()}" if department else ""
+    if not len(codes):
+        return f"💰 No courses{where} with a {what}{describe_limits(low, high)}."
+    if "fee_rank_high" in hits:
+        codes, fees = codes[::-1], fees[::-1]
+    if "fee_rank_low" in hits or "fee_rank_high" in hits:
+        codes, fees = codes[:3], fees[:3]
+        heading = f"💰 {'Highest' if 'fee_rank_high' in hits else 'Lowest'} {what}{where}:\n"
+    elif low is None and high is None:
+        heading = f"💰 {what.capitalize()} by course{where}:\n"
+    else:
+        heading = f"💰 Courses{where} with a {what}{describe_limits(low, high)}:\n"
+    lines = [heading]
+    lines.extend(f"{table.courses[c].upper()}: {format_rupees(f)}\n" for c, f in zip(codes[:FEE_LIST_LIMIT], fees))
+    if len(codes) > FEE_LIST_LIMIT:
+        lines.append(f"…and {len(codes) - FEE_LIST_LIMIT} more. Name a department to narrow it down.\n")
+    return "".join(lines)
+
+
+def fee_query(text, hits, entities, kb):
+    """(branch, reply) for a fee range / sort / total question, else None.
+
+    Only money questions qualify: a fee word, a price ranking ("cheapest")
+    or an amount with a currency sign or unit. "total seats in mbbs" or
+    "minimum 60 percent for cse" are left to the rest of the cascade.
+    """
+    low, high, priced = fee_limits(text)
+    ranked = "fee_rank_low" in hits or "fee_rank_high" in hits
+    if not (ranked or "fee_total" in hits or low is not None or high is not None):
+        return None
+    if not (ranked or priced or "fee_words" in hits):
+        return None
+    if "hostel" in hits:
+        return "hostel_query", hostel_query(text, hits, kb, low, high)
+    if ("fee_words" in hits or "course_words" in hits or "course_list" in hits
+            or "course" in entities or "department" in entities):
+        return "fee_query", course_fee_query(hits, entities, kb, low, high)
+    return None
+
+
+# ---------------- Routing Keywords ----------------
+# Every keyword list checked by the chat cascade. They are compiled once into
+# `router`, so one pass over the message tells us which of them matched.
+ROUTE_KEYWORDS = {
+    "college_info": [
+        # English keywords
+        "about college", "college details", "tell me about college",
+        "about our college", "information about college", "college information",
+        # Tamil keywords
+        "கல்லூரி பற்றிய", "கல்லூரி விவரங்கள்"
+    ],
+    "college_info_ta": ["கல்லூரி பற்றிய", "கல்லூரி விவரங்கள்"],
+    "course_list": ["courses", "arts", "பாடநெறிகள்"],
+    "course_list_ta": ["பாடநெறிகள்"],
+    "hostel": ["hostel", "boys", "girls", "ஆண்கள்", "பெண்கள்", "ஹோஸ்டல்"],
+    "hostel_boys": ["boys", "ஆண்கள்"],
+    "hostel_girls": ["girls", "பெண்கள்"],
+    "fee_words": ["fee", "cost", "price", "கட்டணம்"],
+    "fee_total": ["total", "overall", "altogether", "full course", "மொத்த"],
+    "fee_rank_low": ["cheapest", "lowest fee", "least expensive", "most affordable", "low cost"],
+    "fee_rank_high": ["costliest", "most expensive", "highest fee", "dearest"],
+    "course_words": ["course", "degree", "program"],
+    "placement": ["placements", "placement details", "placement info", "பதவி"],
+    "placement_stats": ["previous year placement", "past placements", "placement stats", "முன்னாள் பதவிகள்"],
+    "timing": ["college timing", "timing"],
+    "admission_date": ["admission date", "start of admission", "when will admission start", "சென்னை"],
+    "admission_deadline": ["admission deadline", "last date for admission", "end of admission", "முடிவும்"],
+    "upcoming_events": ["upcoming dates", "important dates", "upcoming events", "academic calendar", "days left"],
+    "clubs": ["club", "clubs", "student club", "society", "கிளப்புகள்"],
+    "cultural": ["cultural", "fest", "annual day", "milan", "rubaroo", "கலை நிகழ்ச்சி"],
+    "sports": ["sports", "games", "athletics", "coach", "football", "cricket", "basketball", "விளையாட்டு"],
+    "contact": ["contact", "phone", "email", "reach you", "call you", "college contact", "தொடர்பு"],
+    "entrance_exam": ["entrance exam", "exam date", "is there any entrance", "entrance test"],
+    "medical": ["medical", "mbbs", "bds", "bpharm", "nursing", "மருத்துவம்"],
+    "mba": ["mba", "management"],
+    "law": ["law", "llb"],
+    "architecture": ["architecture", "barch", "m.arch"],
+    "arts_science": ["arts", "science", "bcom", "bsc"],
+}
+
+
+def build_router(kb):
+    """Compile the route keywords plus intent keywords into one index.
+
+    Course, department, programme and year names are entities, matched
+    as whole words by `kb.entities` instead.
+    """
+    router = KeywordIndex()
+    for label, phrases in ROUTE_KEYWORDS.items():
+        router.add(label, phrases)
+    # Intent keywords in intent order, for predict_intent()'s exact match
+    router.add_ordered("intent", [
+        (kw.lower(), intent_name)
+        for intent_name, keywords in kb.intents.items()
+        for kw in keywords
+    ])
+    return router.build()
+
+
+def build_entity_index(kb):
+    return EntityIndex.from_data(kb.courses, kb.aliases, kb.college_timings)
+
+
+# Keyword groups used for fuzzy (typo-tolerant) matching, besides the intents
+FUZZY_EXTRA_GROUPS = {"engineering": ["engineering", "cse", "eee", "ece"]}
+
+def build_fuzzy_index(kb):
+    return FuzzyIndex({**kb.intents, **FUZZY_EXTRA_GROUPS})
+
+
+# ---------------- Knowledge Base ----------------
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+KNOWLEDGE_RELOAD_INTERVAL = 2.0   # seconds between checks of data/; None disables
+knowledge = KnowledgeBase(DATA_DIR, builders={
+    # artifact: (sections it is built from, builder)
+    "entities": (("courses", "aliases", "college_timings"), build_entity_index),
+    "fee_table": (("courses",), build_fee_table),
+    "hostel_table": (("hostels",), build_hostel_table),
+    "router": (("intents",), build_router),
+    "fuzzy_index": (("intents",), build_fuzzy_index),
+    "replies": (("fee_table", "hostels", "college_timings", "calendar"), build_reply_templates),
+    "academic_calendar": (("calendar",), build_calendar),
+})
+if KNOWLEDGE_RELOAD_INTERVAL:
+    knowledge.watch(KNOWLEDGE_RELOAD_INTERVAL)
+
+
+# ---------------- Reply Cache ----------------
+REPLY_CACHE_SIZE = 4096          # normalized messages whose routed reply is kept; 0 disables
+VOLATILE_BRANCHES = {"admission_date", "admission_deadline", "upcoming_events"}   # kept until midnight
+UNCACHED_BRANCHES = {"error"}
+with open(__file__, "rb") as f:
+    # replies depend on this file's cascade as much as on data/
+    CODE_DIGEST = hashlib.sha1(f.read()).hexdigest()[:8]
+
+
+def reply_scope(snapshot):
+    return f"{CODE_DIGEST}.{snapshot.digest}"
+
+reply_cache = ReplyCache(REPLY_CACHE_SIZE, store=shared_cache, scope=reply_scope(knowledge.current))
+knowledge.listeners.append(lambda snapshot: reply_cache.clear(reply_scope(snapshot)))
+
+
+def cached_route(user_msg, outcome=None):
+    """route_message() behind the reply cache.
+
+    The normalized message is both the cache key and what gets routed, so
+    "Fees for CSE?" and "fees for cse" share one entry and one answer.
+    If an `outcome` dict is given it receives "branch" (None for a cache
+    hit), "cache_hit" and "unanswered", for the query log. Unanswered
+    replies are not cached while the retrieval index is being rebuilt.
+    """
+    key = normalize_query(user_msg)
+    branch = None
+    if not key:
+        reply, branch = route(user_msg)
+    else:
+        reply = reply_cache.get(key)
+        if reply is None:
+            generation = reply_cache.generation
+            reply, branch = route(key)
+            # a miss while the retrieval index is rebuilt for new data may get
+            # an answer once it is ready; don't keep the "didn't understand"
+            rebuilding = reply in UNANSWERED_REPLIES and retrieval_index() is None
+            if branch not in UNCACHED_BRANCHES and not rebuilding:
+                ttl = knowledge.current.academic_calendar.seconds_left() if branch in VOLATILE_BRANCHES else None
+                reply_cache.put(key, reply, ttl=ttl, generation=generation)
+    if outcome is not None:
+        outcome["branch"] = branch
+        outcome["cache_hit"] = branch is None
+        outcome["unanswered"] = reply in UNANSWERED_REPLIES
+    return reply
+
+
+# ---------------- Retrieval Fallback ----------------
+RETRIEVAL_INDEX_PATH = "retrieval.idx"   # BM25 index file, shared by workers via mmap; None keeps it in memory
+RETRIEVAL_MIN_SCORE = 4.0                # weaker matches still get the "didn't understand" reply (see bench_retrieval)
+RETRIEVAL_PASSAGE_WORDS = 8              # replies are indexed in passages of about this many words
+PASSAGE_BREAK_RE = re.compile(r"<br\s*/?>|\n")
+# replies that are tables of years and amounts shared by every course: indexed
+# by the probes that reach them, not by their text ("2nd year" is in all of them)
+RETRIEVAL_PROBES_ONLY = {"fees", "timing"}
+# route keyword labels that are answered by another branch
+LABEL_BRANCHES = {"college_info_ta": "college_info", "course_list_ta": "course_list",
+                  "hostel_boys": "hostel", "hostel_girls": "hostel"}
+_retrieval = None
+_retrieval_lock = threading.Lock()
+
+
+def labelled_probes(kb=None):
+    """(message, branch it should reach) for messages that between them reach
+    every branch of route()."""
+    kb = kb or knowledge.current
+    for label, phrases in ROUTE_KEYWORDS.items():
+        for phrase in phrases:
+            yield phrase, LABEL_BRANCHES.get(label, label)
+    for intent_name, phrases in kb.intents.items():
+        for phrase in phrases:
+            yield phrase, intent_name
+    for group, words in FUZZY_EXTRA_GROUPS.items():
+        for word in words:
+            yield word, group
+    for dept_courses in kb.courses.values():
+        for course in dept_courses:
+            yield course, "fees"
+    yield "timing", "timing"
+    for program in kb.college_timings:
+        yield f"{program} timing", "timing"
+    for word in ["", "engineering", "medical", "mba", "law", "architecture", "arts"]:
+        yield f"entrance exam {word}".strip(), "entrance_exam"
+
+
+def probe_messages(kb=None):
+    """Messages that between them reach every branch of route()."""
+    for message, _ in labelled_probes(kb):
+        yield message
+
+
+def reply_passages(reply):
+    """A reply cut at line breaks into passages of about RETRIEVAL_PASSAGE_WORDS words."""
+    passages, pending = [], []
+    for line in PASSAGE_BREAK_RE.split(reply):
+        pending.append(line)
+        if sum(len(part.split()) for part in pending) >= RETRIEVAL_PASSAGE_WORDS:
+            passages.append(" ".join(pending))
+            pending = []
+    if any(part.strip() for part in pending):
+        passages.append(" ".join(pending))
+    return passages
+
+
+def retrieval_documents(kb):
+    """[(text to match, reply)]: the probes that reach each reply, alone and
+    in front of each of its passages.
+
+    Only probes that reach their own branch (or intent) count: a probe
+    answered some other way, e.g. by a fuzzy match ("cost" -> hostel),
+    would file its words under the wrong reply. Replies with day counters
+    and the "didn't understand" replies are left out.
+    """
+    probes, branches = {}, {}
+    for message, expected in labelled_probes(kb):
+        text = normalize_query(message)
+        reply, branch = route(text, fallback=False)
+        exact = branch == expected or (branch == "intent" and kb.router.scan(text).get("intent") == expected)
+        if not exact or branch in VOLATILE_BRANCHES or reply in UNANSWERED_REPLIES:
+            continue
+        probes.setdefault(reply, []).append(text)
+        branches[reply] = branch
+    documents = []
+    for reply, texts in probes.items():
+        probe_text = " ".join(texts)
+        documents.append((probe_text, reply))
+        if branches[reply] not in RETRIEVAL_PROBES_ONLY:
+            documents.extend((f"{probe_text} {passage}", reply) for passage in reply_passages(reply))
+    return documents
+
+
+def load_retrieval_index(snapshot):
+    """The BM25 index for `snapshot` and this code.
+
+    Loaded from RETRIEVAL_INDEX_PATH when the file was built for the same
+    reply scope, otherwise built (about as long as routing every probe
+    message once) and saved there for the other workers.
+    """
+    scope = reply_scope(snapshot)
+    index = None
+    if RETRIEVAL_INDEX_PATH and os.path.exists(RETRIEVAL_INDEX_PATH):
+        try:
+            index = BM25Index.load(RETRIEVAL_INDEX_PATH)
+        except (OSError, ValueError) as e:
+            print("Retrieval index unreadable, rebuilding:", e)
+        if index is not None and index.meta.get("scope") != scope:
+            index = None
+    if index is None:
+        index = BM25Index.build(retrieval_documents(snapshot), meta={"scope": scope})
+        if RETRIEVAL_INDEX_PATH:
+            try:
+                index.save(RETRIEVAL_INDEX_PATH)
+            except OSError as e:
+                print("Could not save retrieval index:", e)
+    return index
+
+
+def refresh_retrieval(snapshot):
+    """Load or build the index for a new snapshot; run at start-up and after
+    every reload, never inside a request."""
+    global _retrieval
+    with _retrieval_lock:
+        if _retrieval is None or _retrieval.meta.get("scope") != reply_scope(snapshot):
+            _retrieval = load_retrieval_index(snapshot)
+
+
+def retrieval_index():
+    """The index built for the current data, or None while it is being rebuilt."""
+    index = _retrieval
+    if index is None or index.meta.get("scope") != reply_scope(knowledge.current):
+        return None
+    return index
+
+
+def retrieve_reply(user_msg):
+    """Closest reply the bot holds for a message the cascade missed, or None."""
+    index = retrieval_index()
+    hits = index.search(user_msg) if index is not None else []
+    answered = bool(hits) and hits[0][0] >= RETRIEVAL_MIN_SCORE
+    metrics.inc("retrieval_total", result="answered" if answered else "missed")
+    return hits[0][1] if answered else None
+
+
+# ---------------- Conversation Sessions ----------------
+SESSION_MAX = 10_000             # conversations whose context is kept (LRU); 0 disables
+SESSION_TTL = 30 * 60            # seconds of inactivity before a conversation is forgotten
+FOLLOWUP_MAX_WORDS = 6           # longer messages are routed as new questions
+# Route labels that start a new topic; a message hitting one is not a follow-up
+TOPIC_LABELS = {
+    "college_info", "course_list", "hostel", "placement", "placement_stats", "timing",
+    "admission_date", "admission_deadline", "upcoming_events", "clubs", "cultural", "sports", "contact", "entrance_exam",
+}
+# Labels checked after fees / hostel / timing in route() that replace their
+# reply ("mbbs fees" is answered by the medical branch)
+OVERRIDING_LABELS = {
+    "clubs", "cultural", "sports", "contact", "entrance_exam",
+    "medical", "mba", "law", "architecture", "arts_science",
+}
+# Intents a follow-up to each topic may hit ("2nd year fees" after "fees for
+# cse"); any other intent, e.g. "fees for cse" after "btech timing", is a new question
+FOLLOWUP_INTENTS = {"fees": {None, "fees", "courses"}, "timing": {None, "college_timing", "courses"}}
+sessions = SessionStore(SESSION_MAX, SESSION_TTL)
+
+
+def message_context(hits, entities):
+    """What a routed message was about, as SessionStore.remember() kwargs."""
+    if OVERRIDING_LABELS.intersection(hits):
+        return {"topic": None}
+    # same precedence as route(): timing replaces fees, fees come before hostels
+    if "timing" in hits:
+        return {"topic": "timing", "program": entities.get("program"), "year": entities.get("year")}
+    if "course" in entities:
+        return {"topic": "fees", "course": entities["course"], "year": entities.get("year")}
+    if "hostel" in hits:
+        gender = "boys" if "hostel_boys" in hits else "girls" if "hostel_girls" in hits else None
+        return {"topic": "hostel", "gender": gender}
+    return {"topic": None}
+
+
+def resolve_followup(text, hits, entities, state, kb):
+    """Answer an elliptical follow-up from the session state: (reply, context) or None.
+
+    Only short messages naming no topic of their own qualify; the missing
+    course / programme / year is taken from the previous turn.
+    """
+    if TOPIC_LABELS.intersection(hits) or len(text.split()) > FOLLOWUP_MAX_WORDS:
+        return None
+    if hits.get("intent") not in FOLLOWUP_INTENTS.get(state.topic, ()):
+        return None
+    year = entities.get("year")
+    if state.topic == "fees":
+        course = entities.get("course") or state.course
+        if year:
+            reply = kb.replies["fee_year"].get(course, {}).get(year)
+        else:
+            reply = kb.replies["fees"].get(course) if "course" in entities else None
+        context = {"topic": "fees", "course": course, "year": year}
+    elif state.topic == "timing":
+        program = entities.get("program") or state.program
+        if year:
+            reply = kb.replies["timing_year"].get(program, {}).get(year)
+        else:
+            reply = kb.replies["timing"].get(program) if "program" in entities else None
+        context = {"topic": "timing", "program": program, "year": year}
+    else:
+        # hostel follow-ups ("what about girls?") name the hostel keyword and route normally
+        return None
+    return (reply, context) if reply else None
+
+
+def answer(user_msg, session_id=None, outcome=None):
+    """cached_route() for one turn of a conversation.
+
+    With a `session_id`, a follow-up such as "what about 2nd year?" after
+    "btech timing" is answered from the previous turn's context by a
+    direct lookup; any other message is routed as usual and becomes the
+    context for the next turn. `outcome` is filled in as by cached_route().
+    """
+    if not session_id or not sessions.max_sessions:
+        return cached_route(user_msg, outcome)
+    kb = knowledge.current
+    text = normalize_query(user_msg)
+    hits = kb.router.scan(text)
+    entities = kb.entities.extract(text)
+    state = sessions.get(session_id)
+    resolved = resolve_followup(text, hits, entities, state, kb) if state is not None else None
+    if resolved is not None:
+        reply, context = resolved
+        metrics.inc("replies_total", branch="followup")
+        if outcome is not None:
+            outcome.update(branch="followup", cache_hit=False, unanswered=False)
+    else:
+        reply = cached_route(user_msg, outcome)
+        context = message_context(hits, entities)
+    sessions.remember(session_id, **context)
+    return reply
+
+
+def session_gauges():
+    return {f"sessions_{name}": value for name, value in sessions.stats().items()}
+
+
+def request_session_id(data=None):
+    """The conversation id a request belongs to: "session_id" in the JSON body
+    or query string, else the logged-in user's name."""
+    session_id = (data or {}).get("session_id") or request.args.get("session_id") or session.get("user")
+    return session_id if isinstance(session_id, str) else None
+
+
+# ---------------- Query Log ----------------
+QUERY_LOG_PATH = "logs/queries.jsonl"    # None disables; read with query_report.py
+QUERY_LOG_BUFFER = 10_000                # records waiting for the writer; more are dropped
+QUERY_LOG_FLUSH_INTERVAL = 1.0           # seconds between writes
+QUERY_LOG_MAX_BYTES = 10 * 1024 * 1024   # rotate the file at this size
+QUERY_LOG_BACKUPS = 5                    # rotated files kept (queries.jsonl.1, ...)
+QUERY_LOG_MISS_TEXT = True               # keep the text of unanswered questions; others are only hashed
+UNANSWERED_REPLIES = {
+    "Sorry, I didn't understand that. Could you please try again?",
+    "மன்னிக்கவும், எனக்கு அது புரியவில்லை. மீண்டும் முயற்சிக்க முடியுமா?",
+}
+
+
+def describe_query(message, unanswered):
+    """The fields of a query log record worked out on the writer thread."""
+    text = normalize_query(message)
+    fields = {
+        "hash": hashlib.sha1(text.encode("utf-8")).hexdigest()[:12],
+        "intent": knowledge.current.router.scan(text).get("intent"),
+        "lang": detect_language(message),
+    }
+    if unanswered and QUERY_LOG_MISS_TEXT:
+        fields["text"] = text
+    return fields
+
+
+query_log = QueryLog(
+    QUERY_LOG_PATH,
+    capacity=QUERY_LOG_BUFFER,
+    flush_interval=QUERY_LOG_FLUSH_INTERVAL,
+    max_bytes=QUERY_LOG_MAX_BYTES,
+    backups=QUERY_LOG_BACKUPS,
+    enrich=describe_query,
+) if QUERY_LOG_PATH else None
+
+
+def log_query(user_msg, outcome, started):
+    """Queue a query log record for a reply produced since perf_counter() `started`."""
+    if query_log is not None and outcome:
+        query_log.log(user_msg, outcome["branch"], outcome["cache_hit"], outcome["unanswered"],
+                      time.perf_counter() - started)
+
+
+def query_log_gauges():
+    return {f"query_log_{name}": value for name, value in query_log.stats().items()} if query_log else {}
+
+
+# ---------------- Admission Control ----------------
+RATE_LIMIT_RATE = 1.0            # messages per second one session may keep sending; 0 disables
+RATE_LIMIT_BURST = 10            # messages one session may send at once
+# Per client address. Everyone behind one NAT (a college lab, the campus
+# Wi-Fi) shares an address and so one bucket: size it for the busiest shared
+# address, or set 0 to rely on the session limits alone. Behind a reverse
+# proxy set TRUSTED_PROXY_HOPS too, or every client shares the proxy's bucket.
+RATE_LIMIT_IP_RATE = 5.0         # messages per second per address; 0 disables
+RATE_LIMIT_IP_BURST = 50
+RATE_LIMIT_CLIENTS = 100_000     # sessions/addresses tracked per limiter
+TRANSLATION_MAX_ACTIVE = 32      # chat requests waiting on upstream translation at once; 0 disables
+TRANSLATION_MAX_QUEUE = 64       # requests queued for a slot; more are answered in English
+TRANSLATION_QUEUE_TIMEOUT = 0.5  # seconds a request waits for a slot
+RATE_LIMITED_REPLY = "⏳ You're sending messages too fast. Please wait a few seconds and try again."
+TRUSTED_PROXY_HOPS = 0           # reverse proxies in front of the app whose X-Forwarded-For is trusted; 0: none
+
+# Behind nginx or a load balancer every request comes from the proxy's
+# address; trust the last TRUSTED_PROXY_HOPS X-Forwarded-For entries instead,
+# so per-address limits apply to the real client (and never to a spoofed one)
+if TRUSTED_PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS, x_proto=TRUSTED_PROXY_HOPS)
+
+session_limits = RateLimiter(RATE_LIMIT_RATE, RATE_LIMIT_BURST, RATE_LIMIT_CLIENTS)
+ip_limits = RateLimiter(RATE_LIMIT_IP_RATE, RATE_LIMIT_IP_BURST, RATE_LIMIT_CLIENTS)
+translation_slots = ConcurrencyLimiter(TRANSLATION_MAX_ACTIVE, TRANSLATION_MAX_QUEUE, TRANSLATION_QUEUE_TIMEOUT)
+
+
+def forwarded_client(remote_addr, forwarded_for):
+    """The client address as ProxyFix works it out: the X-Forwarded-For entry
+    added by the outermost trusted proxy, or `remote_addr` without proxies."""
+    if not TRUSTED_PROXY_HOPS:
+        return remote_addr
+    hops = [part.strip() for part in (forwarded_for or "").split(",")]
+    return hops[-TRUSTED_PROXY_HOPS] if len(hops) >= TRUSTED_PROXY_HOPS and hops[-TRUSTED_PROXY_HOPS] else remote_addr
+
+
+def rate_limit(client, session_id=None):
+    """Seconds before this client may send again; 0.0 if it may send now.
+
+    `client` None (no address: in-process calls, /chat/batch) skips the
+    per-address limit.
+    """
+    wait = ip_limits.take(client) if client is not None else 0.0
+    if not wait and session_id:
+        wait = session_limits.take(session_id)
+    if wait:
+        metrics.inc("admission_total", result="rate_limited")
+    return wait
+
+
+def retry_after(wait):
+    return {"Retry-After": str(int(wait) + 1)}
+
+
+def admission_gauges():
+    gauges = {f"translation_slots_{name}": value for name, value in translation_slots.stats().items()}
+    gauges.update({f"rate_limit_session_{name}": v for name, v in session_limits.stats().items()})
+    gauges.update({f"rate_limit_ip_{name}": v for name, v in ip_limits.stats().items()})
+    return gauges
+
+
+# ---------------- Chat Endpoint ----------------
+from datetime import datetime
+@app.route("/chat", methods=["POST"])
+def chat():
+    user_msg = request.json.get("message", "")
+    if not isinstance(user_msg, str) or user_msg.strip() == "":
+        return jsonify({"reply": "⚠️ Please type a message."})
+    user_msg = user_msg.strip()
+    session_id = request_session_id(request.json)
+    wait = rate_limit(request.remote_addr, session_id)
+    if wait:
+        return jsonify({"reply": RATE_LIMITED_REPLY}), 429, retry_after(wait)
+    started = time.perf_counter()
+    outcome = {}
+    with profiler.sample("chat"):
+        reply = answer(user_msg, session_id, outcome)
+
+        # Translate if Tamil detected
+        if is_tamil(user_msg):
+            with metrics.time("translate"):
+                reply = translate_reply_deep(reply, user_msg)
+    log_query(user_msg, outcome, started)
+    return jsonify({"reply": reply})
+
+
+def parse_batch_line(line):
+    """The message in one JSON Lines record, or a ValueError saying why there is none."""
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        return ValueError(f"invalid JSON: {e}")
+    if not isinstance(record, dict):
+        return ValueError("each line must be a JSON object like {\"message\": ...}")
+    return record.get("message", "")
+
+
+def chat_batch(messages, chunk_size=BATCH_CHUNK_SIZE):
+    """Answer many messages with the same routing as /chat.
+
+    Yields {"index", "message", "reply"} in input order, or {"index",
+    "error"} for an item that is a ValueError (a line that did not parse).
+    Each distinct message of a chunk is routed once, through the reply
+    cache, and the Tamil replies of each chunk are translated in one
+    batched call, in one translation slot. Every message is query-logged;
+    repeats within a chunk as cache hits. Works on any iterable, one chunk
+    at a time, so memory stays flat. Rate limiting is the caller's job.
+    """
+    messages = iter(messages)
+    index = 0
+    while True:
+        chunk = list(islice(messages, chunk_size))
+        if not chunk:
+            return
+        replies, outcomes, timings = {}, {}, {}
+        for user_msg in chunk:
+            if not isinstance(user_msg, str) or not user_msg.strip() or user_msg.strip() in replies:
+                continue
+            text, started, outcome = user_msg.strip(), time.perf_counter(), {}
+            replies[text] = cached_route(text, outcome)
+            outcomes[text], timings[text] = outcome, started
+        tamil = [text for text in replies if is_tamil(text)]
+        if tamil:
+            with translation_slots.slot() as admitted:
+                if not admitted:
+                    metrics.inc("admission_total", result="shed")
+                else:
+                    try:
+                        with metrics.time("translate_batch"):
+                            translated = translation_cache.translate_many([replies[t] for t in tamil], "ta")
+                        replies.update(zip(tamil, translated))
+                    except Exception as e:
+                        print("Translation error:", e)
+        logged = set()
+        for user_msg in chunk:
+            if isinstance(user_msg, ValueError):
+                yield {"index": index, "error": str(user_msg)}
+            elif not isinstance(user_msg, str) or not user_msg.strip():
+                yield {"index": index, "message": user_msg, "reply": "⚠️ Please type a message."}
+            else:
+                text = user_msg.strip()
+                outcome = outcomes[text]
+                if text in logged:
+                    outcome = dict(outcome, branch=None, cache_hit=True)
+                logged.add(text)
+                log_query(text, outcome, timings[text])
+                yield {"index": index, "message": user_msg, "reply": replies[text]}
+            index += 1
+
+
+@app.route("/chat/batch", methods=["POST"])
+def chat_batch_endpoint():
+    """Batch version of /chat, streamed back as JSON Lines.
+
+    Body: {"messages": [...]} or, for very large batches, JSON Lines
+    (Content-Type: application/x-ndjson) with one {"message": ...} per line.
+    A line that is not a JSON object gets an {"index", "error"} record and
+    the rest of the batch is still answered.
+    """
+    if request.mimetype == "application/x-ndjson":
+        data = None
+        messages = (parse_batch_line(line) for line in request.stream if line.strip())
+    else:
+        data = request.get_json(silent=True) or {}
+        messages = data.get("messages") if isinstance(data, dict) else None
+        if not isinstance(messages, list):
+            return jsonify({"error": "Send {\"messages\": [...]}"}), 400
+    # one batch is one request against the session limit, however many messages
+    # it holds; regression runs from a shared address are not held to its limit
+    wait = rate_limit(None, request_session_id(data))
+    if wait:
+        return jsonify({"error": RATE_LIMITED_REPLY}), 429, retry_after(wait)
+
+    def stream():
+        for result in chat_batch(messages):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+
+
+# ---------------- Streaming Endpoint ----------------
+SECTION_BREAK_RE = re.compile(r"(?<=<br><br>)|(?<=\n\n)")
+MIN_CHUNK_CHARS = 80      # merge shorter sections into the next one
+stream_pool = ThreadPoolExecutor(max_workers=STREAM_TRANSLATION_WORKERS, thread_name_prefix="stream-tr")
+
+
+def split_reply(reply):
+    """Cut a reply into sections at blank lines / <br><br>; "".join() gives it back."""
+    chunks, pending = [], ""
+    for part in SECTION_BREAK_RE.split(reply):
+        pending += part
+        if len(pending) >= MIN_CHUNK_CHARS:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        chunks.append(pending)
+    return chunks
+
+
+def translate_chunk(chunk):
+    try:
+        return translation_cache.translate(chunk, "ta") + "\n"
+    except Exception as e:
+        print("Translation error:", e)
+        return chunk
+
+
+def stream_reply(user_msg, session_id=None, outcome=None):
+    """Yield the reply to `user_msg` section by section.
+
+    For Tamil, every section is submitted for translation at once and the
+    sections are yielded in order as they finish, so the first one goes out
+    after one short translation instead of the whole reply's. A reply that
+    is already translated whole (catalog or cache) goes out in one piece;
+    without a free translation slot it goes out in English.
+    """
+    reply = answer(user_msg, session_id, outcome)
+    if not is_tamil(user_msg):
+        yield from split_reply(reply)
+        return
+    _, whole = translation_cache.lookup(reply, "ta")
+    if whole is not None:
+        yield whole
+        return
+    chunks = split_reply(reply)
+    with translation_slots.slot() as admitted:
+        if not admitted:
+            metrics.inc("admission_total", result="shed")
+            yield from chunks
+            return
+        futures = [stream_pool.submit(translate_chunk, chunk) for chunk in chunks]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.route("/chat/stream", methods=["GET", "POST"])
+def chat_stream():
+    """/chat as Server-Sent Events: one `chunk` event per section, then `done`.
+
+    POST {"message": ..., "session_id": ...} like /chat, or GET
+    ?message=...&session_id=... for EventSource.
+    """
+    if request.method == "POST":
+        data = request.get_json(silent=True) or {}
+        user_msg = data.get("message", "")
+    else:
+        data = None
+        user_msg = request.args.get("message", "")
+    session_id = request_session_id(data)
+    if not isinstance(user_msg, str) or user_msg.strip() == "":
+        user_msg = ""
+    user_msg = user_msg.strip()
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    wait = rate_limit(request.remote_addr, session_id) if user_msg else 0.0
+    if wait:
+        body = sse_event("chunk", {"text": RATE_LIMITED_REPLY}) + sse_event("done", {})
+        return Response(body, status=429, mimetype="text/event-stream", headers={**headers, **retry_after(wait)})
+
+    def events():
+        if not user_msg:
+            yield sse_event("chunk", {"text": "⚠️ Please type a message."})
+        else:
+            start = time.perf_counter()
+            outcome = {}
+            for i, chunk in enumerate(stream_reply(user_msg, session_id, outcome)):
+                if i == 0:
+                    metrics.observe("stage_seconds", time.perf_counter() - start, stage="stream_first_chunk")
+                yield sse_event("chunk", {"text": chunk})
+            log_query(user_msg, outcome, start)
+        yield sse_event("done", {})
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream", headers=headers)
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Counters and latency histograms in the Prometheus text format."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+def translation_gauges():
+    stats = translation_cache.stats()
+    return {f"translation_cache_{name}": value for name, value in stats.items()}
+
+def reply_cache_gauges():
+    return {f"reply_cache_{name}": value for name, value in reply_cache.stats().items()}
+
+metrics.collectors.append(translation_gauges)
+metrics.collectors.append(reply_cache_gauges)
+metrics.collectors.append(session_gauges)
+metrics.collectors.append(query_log_gauges)
+metrics.collectors.append(admission_gauges)
+metrics.collectors.append(lambda: {"knowledge_version": knowledge.current.version})
+
+
+def route_message(user_msg):
+    """Run the keyword cascade for a stripped message and return the reply."""
+    return route(user_msg)[0]
+
+
+def route(user_msg, fallback=True):
+    """route_message() that also says which branch answered: (reply, branch).
+
+    With `fallback=False` a miss is not looked up in the retrieval index.
+    """
+    # One snapshot for the whole request, even if data/ is reloaded meanwhile
+    kb = knowledge.current
+    trace = metrics.trace()
+    user_msg_lower = user_msg.lower()
+    hits = kb.router.scan(user_msg_lower)
+    entities = kb.entities.extract(user_msg_lower)
+    trace.lap("scan")
+    # ----------------- COURSE FEES LOGIC -----------------
+    reply = None
+    branch = None
+
+    if "course" in entities:
+        branch = "fees"
+        reply = kb.replies["fees"][entities["course"]]
+
+    # ===== FUZZY MATCH CHECKS =====
+    if not reply and fuzzy_match(user_msg_lower, "admission_eligibility", kb=kb):
+        branch = "admission_eligibility"
+        reply = (
+            "📌 Admission Eligibility:\n"
+            "• Must have passed 12th with minimum 50% marks (varies by course).\n"
+            "• Some courses may require entrance exams.\n"
+            "• For detailed eligibility, visit the Admissions Office or website."
+        )
+
+    if not reply and fuzzy_match(user_msg_lower, "admission_process", kb=kb):
+        branch = "admission_process"
+        reply = (
+            "📝 Admission Process:\n"
+            "1. Fill online application form.\n"
+            "2. Submit required documents.\n"
+            "3. Appear for entrance exam (if applicable).\n"
+            "4. Confirm admission after fee payment."
+        )
+  
+
+
+# Dress Code Queries
+    if not reply:
+        try:
+            if fuzzy_match(user_msg_lower, "dress_code", kb=kb):
+                branch = "dress_code"
+                reply = (
+                    "👔 College Dress Code:\n"
+                    "• Boys: Formal shirt and pants, shoes\n"
+                    "• Girls: Salwar kameez / formal tops and chudi / saree, shoes\n"
+                    "• ID card must be worn at all times\n"
+                    "• Casual wear allowed only on Festivals and special events\n"
+                    "• Contact the Student Affairs Office for more details"
+                )
+        except Exception as e:
+            branch = "error"
+            reply = f"⚠️ Server error occurred: {str(e)}"
+    trace.lap("fuzzy")
+
+    # 1️⃣ COLLEGE INFORMATION - English & Tamil
+    if not reply and "college_info" in hits:
+        branch = "college_info"
+        # If Tamil keyword detected
+        if "college_info_ta" in hits:
+            reply = (
+            "<div style='text-align:center; font-size:22px; font-weight:bold;'>"
+            "🏫 SRM தொழில்நுட்ப நிறுவனம்"
+            "</div><br>"
+            "SRM தொழில்நுட்ப நிறுவனம் கல்வி சிறப்புமிக்க, நவீன வசதிகள் மற்றும் மாணவர் நட்பு சூழலுக்காக புகழ்பெற்றது.<br><br>"
+
+            "<b>👤 தலைமைச் செயலாளர்:</b> திரு. நள்ளத்தம்பி<br>"
+            "<b>🎓 தலைவர்:</b> டாக்டர் R. கிருஷ்ணமூர்த்தி<br>"
+            "<b>🏆 தேசிய ரேங்க்:</b> 15<br>"
+            "<b>🏆 மாநில ரேங்க்:</b> 2<br>"
+            "<b>👩‍🏫 பேராசிரியர்கள்:</b> 250+ அர்ப்பணிப்புடன் கூடிய ப்ரொஃபெசர்கள்<br>"
+            "<b>🎓 பி.எச்.டி. ஹோல்டர்கள்:</b> 80+ highly qualified faculty<br><br>"
+
+            "<b>💼 பிளேஸ்மென்ட்:</b> மாணவர்களை சிறந்த நிறுவனங்களில் வெற்றிகரமாக பிளேஸ் செய்துள்ளோம்.<br><br>"
+
+            "<b>📚 வசதிகள்:</b><br>• நவீன வகுப்பறைகள் மற்றும் ஸ்மார்ட் போர்டுகள்<br>"
+            "• நூலகம் - ஆயிரக்கணக்கான புத்தகங்கள்<br>"
+            "• உயர் தொழில்நுட்ப கணினி லேப்கள் மற்றும் வேகமான இன்டர்நெட்<br>"
+            "• அமைதியான மற்றும் பசுமை நிறைந்த வளாகம்<br><br>"
+
+            "<b>🏠 ஹாஸ்டல் வசதிகள்:</b><br>"
+            "• பையன்கள் மற்றும் பெண் மாணவர்களுக்கு தனித்தனியான ஹாஸ்டல்கள்<br>"
+            "• 24/7 பாதுகாப்பு மற்றும் CCTV கண்காணிப்பு<br>"
+            "• சத்துணவு மற்றும் சுத்தமான உணவுக்கூடங்கள்<br>"
+            "• ஓய்வுக்கூடங்கள் மற்றும் படிப்பு அறைகள்<br><br>"
+
+            "<b>🏅 விளையாட்டு மற்றும் செயல்பாடுகள்:</b><br>"
+            "• கிரிக்கெட், கால்பந்து, பேஸ்கெட்ட்பால், பேட்மிண்டன் மற்றும் தடகளம்<br>"
+            "• வருடாந்திர விளையாட்டு விழா மற்றும் இன்டர்கல்லூரி போட்டிகள்<br>"
+            "• பயிற்சியாளர்கள் மற்றும் உடற்பயிற்சி திட்டங்கள்<br><br>"
+
+            "<b>💡 நமது குறிக்கோள்:</b> 'அறிவை உருவாக்கி எதிர்காலத்தை கட்டமைப்போம்.'<br><br>"
+            "<b>கல்லூரியின் நோக்கம்:</b><br>"
+            "அறிவை உருவாக்கி உலக தரமான கல்வியை வழங்கும் கல்வி மற்றும் ஆராய்ச்சி சூழலை உருவாக்குவதே நோக்கம்.<br>"
+            "<b>கால்கட்டுக் குறிக்கோள்:</b><br>"
+            "சுதந்திரம், சுயம்செய்தல், படைப்பு மற்றும் புதுமையை ஊக்குவிக்கும் சூழலை உருவாக்குதல்."
+            )
+        else:
+        # English reply
+            reply = (
+            "<div style='text-align:center; font-size:22px; font-weight:bold;'>"
+            "🏫 SRM Institute of Technology"
+            "</div><br>"
+            "SRM Institute of Technology is one of the most prestigious institutions, renowned for its academic excellence, modern facilities, and student-friendly environment.<br><br>"
+
+            "<b>👤 CEO:</b> Mr. Nallathambi<br>"
+            "<b>🎓 Principal:</b> Dr. R. Krishnamoorthy<br>"
+            "<b>🏆 National Rank:</b> 15th<br>"
+            "<b>🏆 State Rank:</b> 2nd<br>"
+            "<b>👩‍🏫 Faculty Members:</b> 250+ dedicated professors<br>"
+            "<b>🎓 Ph.D. Holders:</b> 80+ highly qualified faculty members<br><br>"
+
+            "<b>💼 Placements:</b> We have successfully placed thousands of students in top multinational companies with attractive salary packages.<br><br>"
+
+            "<b>📚 Facilities:</b><br>• Spacious and modern classrooms with smart boards<br>"
+            "• Well-stocked library with thousands of academic and reference books<br>"
+            "• High-tech computer labs with fast internet<br>"
+            "• Peaceful and green campus for a positive learning environment<br><br>"
+
+            "<b>🏠 Hostel Facilities:</b><br>"
+            "• Separate hostels for boys and girls<br>"
+            "• 24/7 security and CCTV surveillance<br>"
+            "• Nutritious food and clean dining halls<br>"
+            "• Recreation rooms and study lounges<br><br>"
+
+            "<b>🏅 Sports & Activities:</b><br>"
+            "• Cricket, Football, Basketball, Badminton, and Athletics<br>"
+            "• Annual Sports Meet and Inter-College Competitions<br>"
+            "• Dedicated sports coaches and fitness programs<br><br>"
+
+            "<b>💡 Our Motto:</b> 'Innovating Minds, Building Futures.'<br><br>"
+            "<b>Vision of AIT:</b><br>"
+            "To emerge as a World-Class University in creating and disseminating knowledge, "
+            "and providing students a unique learning experience in science, technology, medicine, management and other areas of scholarship.<br>"
+            "<b>Mission of AIT:</b><br>"
+            "MOVE UP through international alliances and collaborative initiatives to achieve global excellence.<br>"
+            "ACCOMPLISH a process to advance knowledge in a rigorous academic and research environment.<br>"
+            "ATTRACT and BUILD people in a rewarding and inspiring environment by fostering freedom, empowerment, creativity, and innovation."
+            )
+
+# 2️⃣ COURSES LIST - English & Tamil
+    if not reply and "course_list" in hits:
+        branch = "course_list"
+        if "course_list_ta" in hits:
+            reply = (
+            "📚 <b>நாம் வழங்கும் பாடநெறிகள்:</b><br><br>"
+            "<b>பொறியியல்:</b> EEE, ECE, CSE, Civil, Mechanical<br>"
+            "<b>கலை:</b> B.Com, BBA, B.Sc Tamil, B.Sc English, BA History<br>"
+            "<b>அறிவு விஞ்ஞானம்:</b> B.Sc CS, B.Sc CA, B.Sc Physics, B.Sc Chemistry, B.Sc Maths<br>"
+            "<b>மருத்துவம்:</b> MBBS, BDS, B.Pharm, B.Sc Nursing<br>"
+            "<b>நீதியியல்:</b> LLB, BA LLB, BBA LLB<br>"
+            "<b>கலைக்கலைப்பொருளமைப்பு:</b> B.Arch, M.Arch"
+            )
+        else:
+            reply = (
+            "📚 <b>Our Courses:</b><br><br>"
+            "<b>Engineering:</b> EEE, ECE, CSE, Civil, Mechanical<br>"
+            "<b>Arts:</b> B.Com, BBA, B.Sc Tamil, B.Sc English, BA History<br>"
+            "<b>Science:</b> B.Sc CS, B.Sc CA, B.Sc Physics, B.Sc Chemistry, B.Sc Maths<br>"
+            "<b>Medical:</b> MBBS, BDS, B.Pharm, B.Sc Nursing<br>"
+            "<b>Law:</b> LLB, BA LLB, BBA LLB<br>"
+            "<b>Architecture:</b> B.Arch, M.Arch"
+            )
+    #for 4️⃣ HOSTEL DETAILS
+    # Hostel details
+    # 4️⃣ HOSTEL DETAILS
+    if not reply and "hostel" in hits:
+        branch = "hostel"
+        try:
+            if "hostel_boys" in hits:
+                reply = kb.replies["hostel"]["boys"]
+
+            elif "hostel_girls" in hits:
+                reply = kb.replies["hostel"]["girls"]
+
+            else:
+                reply = (
+                "<b>🏠 Hostel Details:</b><br>"
+                "Separate hostels for boys and girls with AC & Non-AC rooms.<br>"
+                "24/7 Security, WiFi, Study Room, Gym & Medical Facilities available.<br>"
+                "Use 'boys hostel' or 'girls hostel' to get more details."
+                )
+        except Exception as e:
+            branch = "error"
+            reply = f"⚠️ Error fetching hostel data: {str(e)}"
+
+
+
+    # 📌 PLACEMENT DETAILS
+    if not reply and "placement" in hits:
+        branch = "placement"
+        reply =(
+                "<b>💼 Placement Information - SRM Institute of Technology</b><br><br>"
+                "🌟 <i>We provide one of the best placement opportunities for our students, "
+                "connecting them with top recruiters across India and abroad.</i><br><br>"
+                
+                "<b>🏆 Top Companies Visiting:</b><br>"
+                "• TCS - ₹12 LPA<br>"
+                "• Infosys - ₹10 LPA<br>"
+                "• Wipro - ₹9 LPA<br>"
+                "• HCL - ₹8 LPA<br>"
+                "• Cognizant - ₹8.5 LPA<br><br>"
+
+                "<b>📜 Eligibility for Placement:</b><br>"
+                "• You must score more than 75% in semester exams to apply.<br>"
+                "• Placement fees will be collected in your final year.<br>"
+                "• The fee will be informed in the final year and will be under ₹1,50,000.<br><br>"
+
+                "<b> Placement Related Trainings:</b><br>"
+                "We will provide placement trainings during your final year.<br>"
+                "Like Aptitude,Programming,Communication<br><br>"
+
+                "<b>Placement Fee:</b> Paid separately in the final year.<br><br>"
+                "<b>Note:</b> Fee amount will be announced during the final year.<br>"
+        )
+
+    # 📌 PREVIOUS YEAR PLACEMENT STATUS
+    if not reply and "placement_stats" in hits:
+        branch = "placement_stats"
+        
+        reply = (
+                "<b>📊 Previous Year Placement Statistics</b><br><br>"
+                
+                "<u>2024</u><br>"
+                "• Overall: 95% placed<br>"
+                "• Engineering: IT - 300, Non-IT - 150<br>"
+                "• Arts: IT - 80, Non-IT - 70<br>"
+                "• Science: IT - 90, Non-IT - 60<br><br>"
+
+                "<u>2023</u><br>"
+                "• Overall: 92% placed<br>"
+                "• Engineering: IT - 280, Non-IT - 140<br>"
+                "• Arts: IT - 75, Non-IT - 65<br>"
+                "• Science: IT - 85, Non-IT - 55<br><br>"
+
+                "<u>2022</u><br>"
+                "• Overall: 90% placed<br>"
+                "• Engineering: IT - 260, Non-IT - 130<br>"
+                "• Arts: IT - 70, Non-IT - 60<br>"
+                "• Science: IT - 80, Non-IT - 50<br>"
+        )
+
+    # 4️⃣ College timing (Add your code here)
+    elif "timing" in hits:
+        branch = "timing"
+        reply = kb.replies["timing"].get(entities.get("program")) or kb.replies["timing_all"]
+
+    # 4️⃣ ADMISSION DATE
+    if not reply and "admission_date" in hits:
+        branch = "admission_date"
+        reply = kb.academic_calendar.today().replies["admission_date"]
+
+    # 5️⃣ ADMISSION DEADLINE
+    if not reply and "admission_deadline" in hits:
+        branch = "admission_deadline"
+        reply = kb.academic_calendar.today().replies["admission_deadline"]
+
+    # 🗓 DAYS LEFT FOR EVERY UPCOMING DATE
+    if not reply and "upcoming_events" in hits:
+        branch = "upcoming_events"
+        reply = kb.academic_calendar.today().replies["upcoming_events"]
+
+    # ===== Campus Life Queries =====
+    if "clubs" in hits:
+        branch = "clubs"
+        reply= f"<b>🏛 Clubs at AIT:</b><br><br>{kb.campus_life['clubs']['details']}"
+    
+    elif "cultural" in hits:
+        branch = "cultural"
+        reply= f"<b>🎭 Cultural & Annual Fests at AIT:</b><br><br>{kb.campus_life['cultural']['details']}"
+    elif "sports" in hits:
+        branch = "sports"
+        reply= f"<b>🏅 Sports at AIT:</b><br><br>{kb.campus_life['sports']['details']}"
+    # Contact details
+    if "contact" in hits:
+        branch = "contact"
+        reply=(
+                "<b>📞 Contact Details:</b><br>"
+                "Phone: <a href='tel:+911234567890'>+91 12345 67890</a><br>"
+                "Email: <a href='mailto:info@srmcollege.edu'>info@srmcollege.edu</a>"
+                "<b>If you have any queries, you can visit our Admissions Office between 9:00 AM and 5:00 PM, Monday to Saturday.</b>"
+        )
+            # ENTRANCE EXAM INFORMATION
+    elif "entrance_exam" in hits:
+       # Department-specific entrance details
+       department = entities.get("department")
+       if department == "engineering":
+        exam_info = "🛠️ For Engineering (B.E/B.Tech), admission is based on JEE / TNEA counselling depending on your state."
+       elif department == "medical":
+        exam_info = "🩺 For Medical courses (MBBS, BDS, B.Pharm, Nursing), admission is through NEET (National Eligibility cum Entrance Test)."
+       elif department == "management":
+        exam_info = "📊 For MBA, admission is based on an entrance exam conducted by SRM / or valid scores from CAT, MAT, XAT, or TANCET."
+       elif department == "law":
+        exam_info = "⚖️ For Law courses (LLB, BA LLB, BBA LLB), admission is usually through CLAT (Common Law Admission Test)."
+       elif department == "architecture":
+        exam_info = "🏛 For Architecture (B.Arch, M.Arch), admission is based on NATA (National Aptitude Test in Architecture)."
+       elif department in ("arts", "science"):
+        exam_info = "📚 For Arts & Science courses (B.Com, BBA, B.Sc, BA, etc.), admission is usually merit-based (marks in 12th standard)."
+       else:
+        exam_info = "📝 Entrance exam requirements vary by course. Please specify your department (Engineering, Medical, Law, Architecture, Arts, or Science)."
+       branch = "entrance_exam"
+       reply= (
+                "<b>📝 Entrance Exam Details – SRM College</b><br><br>"
+                "<b>🎓 Courses Requiring Entrance Exams:</b><br>"
+                f"{kb.replies['exam_dates']}<br>"
+                "<b>📌 Courses Without Entrance Exam:</b><br>"
+                "• All Arts & Science degree programs – Direct admission based on 12th grade marks<br><br>"
+                "<b>⚠ Note:</b> Admit cards will be available online 7 days before the exam.<br>"
+                "<b>📍 Exam Centres:</b> We will inform you about your exam centre and timing 2 days before the exam date.<br><br>"
+                f"<b>🔎 Department-specific Info:</b><br>{exam_info}"
+            )
+ # Direct department-only queries
+    elif "medical" in hits:
+        branch = "medical"
+        reply = "🩺 For Medical courses, admission is through NEET (National Eligibility cum Entrance Test)."
+    elif fuzzy_match(user_msg_lower, "engineering", kb=kb):
+        branch = "engineering"
+        reply = "🛠️ For Engineering (B.E/B.Tech), admission is based on JEE / TNEA counselling."
+    elif "mba" in hits:
+        branch = "mba"
+        reply = (
+            "📊 For MBA admission:<br>"
+            "• Entrance exam conducted by SRM<br>"
+            "• OR valid scores from CAT, MAT, XAT, or TANCET"
+        )
+    elif "law" in hits:
+        branch = "law"
+        reply = "⚖️ For Law courses, admission is usually through CLAT."
+    elif "architecture" in hits:
+        branch = "architecture"
+        reply = "🏛 For Architecture, admission is based on NATA."
+    elif "arts_science" in hits:
+        branch = "arts_science"
+        reply = "📚 For Arts & Science courses, admission is usually merit-based (12th marks)."
+        # If nothing matched
+
+    # 💰 Fee / hostel filters, rankings and totals refine the fee, course and hostel
+    # replies above; any other topic that matched keeps its answer
+    fee_answer = fee_query(user_msg_lower, hits, entities, kb) if branch in FEE_QUERY_REFINES else None
+    if fee_answer:
+        branch, reply = fee_answer
+
+    trace.lap("cascade")
+
+    # ----------------- AI DEFAULT RESPONSE -----------------
+    if not reply:
+        branch = "intent"
+        reply = get_response(user_msg, kb=kb)  # Use AI response if no course fees match
+    # Fallback if AI also fails
+        if not reply:
+            branch = "fallback"
+            reply = (
+                "மன்னிக்கவும், எனக்கு அது புரியவில்லை. மீண்டும் முயற்சிக்க முடியுமா?"
+                if is_tamil(user_msg)
+                else "Sorry, I didn't understand that. Could you please try again?"
+            )
+        trace.lap("intent")
+        # Last resort: the closest passage among everything the bot can answer
+        if fallback and reply in UNANSWERED_REPLIES:
+            passage = retrieve_reply(user_msg)
+            if passage is not None:
+                branch, reply = "retrieval", passage
+            trace.lap("retrieval")
+    trace.finish(branch)
+    return reply, branch
+
+
+# The retrieval index for the data loaded at start-up, then after every reload
+refresh_retrieval(knowledge.current)
+knowledge.listeners.append(refresh_retrieval)
+
+
+
+# ---------------- Database Setup ----------------
+USERS_DB = "users.db"
+USERS_DB_POOL_SIZE = 8          # pooled SQLite connections (WAL mode, see user_store.py)
+# users.db is opened (and the table created) on the first login/registration
+user_store = UserStore(USERS_DB, pool_size=USERS_DB_POOL_SIZE)
+
+# ---------------- Authentication ----------------
+PASSWORD_HASH_METHOD = "scrypt:32768:8:1"   # werkzeug method; older hashes upgrade on login
+AUTH_WORKERS = 2                # processes doing password hashing
+AUTH_MAX_PENDING = 16           # hashing calls queued or running before we answer 429
+AUTH_TIMEOUT = 10.0             # seconds to wait for a hashing result
+auth = AuthService(user_store, PASSWORD_HASH_METHOD, workers=AUTH_WORKERS,
+                   max_pending=AUTH_MAX_PENDING, timeout=AUTH_TIMEOUT)
+
+
+def read_credentials():
+    """(username, password) from a JSON object or a form; empty strings when
+    the body is not an object or a field is not a string."""
+    data = request.get_json(silent=True) or request.form
+    if not isinstance(data, dict):
+        return "", ""
+    username = data.get("username") or data.get("email") or ""
+    password = data.get("password") or ""
+    if not isinstance(username, str) or not isinstance(password, str):
+        return "", ""
+    return username.strip(), password
+
+
+@app.route("/register", methods=["POST"])
+def register():
+    username, password = read_credentials()
+    if not username or not password:
+        return jsonify({"error": "Username and password are required."}), 400
+    try:
+        created = auth.register(username, password)
+    except AuthBusy:
+        metrics.inc("auth_total", result="busy")
+        return jsonify({"error": "Too many sign-ins right now, please retry."}), 429, {"Retry-After": "1"}
+    if not created:
+        metrics.inc("auth_total", result="taken")
+        return jsonify({"error": "That username is already registered."}), 409
+    metrics.inc("auth_total", result="registered")
+    session["user"] = username
+    return jsonify({"user": username}), 201
+
+
+@app.route("/login", methods=["POST"])
+def login():
+    username, password = read_credentials()
+    if not username or not password:
+        return jsonify({"error": "Username and password are required."}), 400
+    try:
+        ok = auth.login(username, password)
+    except AuthBusy:
+        metrics.inc("auth_total", result="busy")
+        return jsonify({"error": "Too many sign-ins right now, please retry."}), 429, {"Retry-After": "1"}
+    if not ok:
+        metrics.inc("auth_total", result="failed")
+        return jsonify({"error": "Invalid username or password."}), 401
+    metrics.inc("auth_total", result="ok")
+    session["user"] = username
+    return jsonify({"user": username})
+
+# ---------------- Static Assets & Pages ----------------
+# build_assets.py writes fingerprinted, precompressed copies of ASSET_FILES
+# and resized bg.jpeg variants to ASSETS_DIR (see assets.py). Until it has
+# run, pages fall back to the plain static URLs.
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dist")
+ASSET_FILES = ()                           # CSS/JS the pages link to; theirs is inline (style.css and script.js are not used)
+ASSET_IMAGES = ("bg.jpeg",)
+ASSET_IMAGE_WIDTHS = (640, 1280, 1920)     # px; resized variants of each image (needs Pillow)
+ASSET_MAX_AGE = 365 * 24 * 3600            # seconds; fingerprinted files never change
+PAGE_CACHE = True                          # keep rendered pages (and their gzip) in memory
+assets = AssetStore(ASSETS_DIR)
+_pages = {}
+
+
+def asset_url(name):
+    """Fingerprinted URL of a built asset, else the plain static URL."""
+    return assets.url(name) or url_for("static", filename=name)
+
+
+def responsive_background(selector, name):
+    """CSS rules giving `selector` the smallest resized `name` that still covers the screen.
+
+    The largest variant applies everywhere; smaller ones take over on
+    screens (in device pixels) they are big enough for. WebP is preferred
+    through image-set(), with JPEG for browsers without WebP.
+    """
+    by_width = {}
+    for v in assets.image_variants(name):
+        by_width.setdefault(v["width"], []).append(v)
+    rules = []
+    for i, width in enumerate(sorted(by_width, reverse=True)):
+        group = by_width[width]
+        sources = ", ".join(f'url("{v["url"]}") type("{v["type"]}")' for v in group)
+        rule = f"{selector} {{ background-image: image-set({sources}); }}"
+        if i:
+            height = group[0]["height"]
+            rule = (f"@media (max-width: {width // 2}px) and (max-height: {height // 2}px), "
+                    f"(max-width: {width}px) and (max-height: {height}px) and (max-resolution: 1dppx) {{ {rule} }}")
+        rules.append(rule)
+    return Markup("\n    ".join(rules))
+
+
+@app.context_processor
+def asset_helpers():
+    return {"asset_url": asset_url, "responsive_background": responsive_background}
+
+
+def render_page(template):
+    """(html, gzipped html, etag) for `template`, rendered once per asset build."""
+    key = (template, request.script_root, assets.version)
+    page = _pages.get(key) if PAGE_CACHE and not app.debug else None
+    if page is None:
+        html = render_template(template).encode("utf-8")
+        page = (html, gzip.compress(html, compresslevel=9, mtime=0), hashlib.sha1(html).hexdigest()[:16])
+        _pages[key] = page
+    return page
+
+
+def serve_page(template):
+    """A cached page with an ETag; browsers revalidate and get a 304 while it is unchanged."""
+    html, compressed, etag = render_page(template)
+    use_gzip = bool(request.accept_encodings["gzip"])
+    if use_gzip:
+        etag += "-gz"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(compressed if use_gzip else html, mimetype="text/html")
+        if use_gzip:
+            response.headers["Content-Encoding"] = "gzip"
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+@app.route("/assets/<path:filename>")
+def asset(filename):
+    found = assets.variant(filename, request.accept_encodings)
+    if found is None:
+        return "Not found", 404
+    path, encoding = found
+    response = send_file(path, mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                         download_name=filename, conditional=True, max_age=ASSET_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+# ---------- home page ----------
+@app.route("/")
+def home():
+    return serve_page("index.html")
+
+@app.route("/chatbot")
+def chatbot_page():
+    return serve_page("chatbot.html")
+@app.route("/exit")
+def exit_page():
+    return redirect(url_for('home'))
+
+# ---------- Run ----------
+if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+ASGI entry point with a non-blocking /chat endpoint.
+
+Routing and the translation-cache lookup run in the loop's default thread
+pool, not on the loop itself: on a local miss they read the shared cache
+(SQLite or Redis, see SHARED_CACHE_URL), and that I/O would stall every
+connection. Tamil translation goes through AsyncTranslator, so a slow
+upstream call no longer holds a worker while English requests wait. Rate
+limits and the cap on requests waiting for translation are the Flask
+app's (see Admission Control in app.py); over the cap a request is shed at once rather than queued, as
+waiting would block the loop. Every other route is served by the Flask app.
+
+    uvicorn asgi:app --workers 2
+"""
+import asyncio
+import json
+import time
+
+from asgiref.wsgi import WsgiToAsgi
+
+import app as chatbot
+from translation import AsyncTranslator
+
+flask_app = WsgiToAsgi(chatbot.app)
+async_translator = AsyncTranslator(
+    chatbot.translation_cache,
+    max_concurrency=chatbot.TRANSLATION_CONCURRENCY,
+    timeout=chatbot.TRANSLATION_TIMEOUT,
+)
+
+
+async def chat_reply(user_msg, session_id=None):
+    """Async twin of the Flask chat() view; returns the reply text."""
+    if not isinstance(user_msg, str) or user_msg.strip() == "":
+        return "⚠️ Please type a message."
+    user_msg = user_msg.strip()
+    if not isinstance(session_id, str):
+        session_id = None
+    started = time.perf_counter()
+    outcome = {}
+    loop = asyncio.get_running_loop()
+    reply = await loop.run_in_executor(None, chatbot.answer, user_msg, session_id, outcome)
+    if chatbot.is_tamil(user_msg):
+        _, cached = await loop.run_in_executor(None, async_translator.cache.lookup, reply, "ta")
+        if cached is not None:
+            reply = cached
+        # waiting for a slot would block the event loop: when full, shed at once
+        elif not chatbot.translation_slots.acquire(wait=False):
+            chatbot.metrics.inc("admission_total", result="shed")
+        else:
+            try:
+                with chatbot.metrics.time("translate"):
+                    reply = await async_translator.translate(reply, "ta")
+            except asyncio.TimeoutError:
+                print("Translation timed out")
+            except Exception as e:
+                print("Translation error:", e)
+            finally:
+                chatbot.translation_slots.release()
+    chatbot.log_query(user_msg, outcome, started)
+    return reply
+
+
+async def read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def send_json(send, payload, status=200, headers=None):
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"access-control-allow-origin", b"*"),
+        ] + [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] == "http" and scope["path"] == "/chat" and scope["method"] == "POST":
+        try:
+            data = json.loads(await read_body(receive) or b"{}")
+        except ValueError:
+            await send_json(send, {"error": "invalid JSON"}, status=400)
+            return
+        if not isinstance(data, dict):
+            await send_json(send, {"error": "Send {\"message\": ...}"}, status=400)
+            return
+        message, session_id = data.get("message", ""), data.get("session_id")
+        if isinstance(message, str) and message.strip():
+            headers = dict(scope.get("headers") or ())
+            client = chatbot.forwarded_client((scope.get("client") or ("-",))[0],
+                                              headers.get(b"x-forwarded-for", b"").decode("latin-1"))
+            wait = chatbot.rate_limit(client, session_id if isinstance(session_id, str) else None)
+            if wait:
+                await send_json(send, {"reply": chatbot.RATE_LIMITED_REPLY}, status=429,
+                                headers=chatbot.retry_after(wait))
+                return
+        await send_json(send, {"reply": await chat_reply(message, session_id)})
+        return
+
+    await flask_app(scope, receive, send)
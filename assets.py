@@ -0,0 +1,167 @@
+"""
+Static asset pipeline: fingerprinted, precompressed files and responsive images.
+
+build() copies each asset into the output directory under a content-hash
+name ("style.3f2a9c1b7d4e.css"), so its URL changes whenever its bytes do
+and it can be cached by browsers for a year as immutable. Text assets are
+also written gzip- and (if the brotli package is installed) brotli-
+compressed next to the original, at maximum compression, once. Images are
+re-encoded at a few widths as WebP and JPEG when Pillow is installed, so a
+phone does not download the 3000px background. References to other assets
+inside CSS (`{{ url_for('static', filename=...) }}`) are rewritten to the
+fingerprinted names. Everything is listed in manifest.json, written last.
+
+AssetStore reads the manifest at start-up: `url(name)` gives the URL to put
+in a page and `variant(filename, accept_encodings)` the file to send for a
+request, picking the best encoding the client accepts.
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+
+try:
+    import brotli
+except ImportError:        # optional: gzip only
+    brotli = None
+try:
+    from PIL import Image
+except ImportError:        # optional: images are fingerprinted but not resized
+    Image = None
+
+MANIFEST = "manifest.json"
+COMPRESSIBLE = {".css", ".js", ".html", ".svg", ".json", ".txt"}
+MIN_COMPRESS_SIZE = 256     # bytes; smaller files are not worth a second request header
+IMAGE_FORMATS = (("webp", "WEBP", "image/webp"), ("jpg", "JPEG", "image/jpeg"))
+STATIC_REF_RE = re.compile(r"""\{\{\s*url_for\(\s*['"]static['"]\s*,\s*filename\s*=\s*['"]([^'"]+)['"]\s*\)\s*\}\}""")
+ENCODING_SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+
+def fingerprint(name, data):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def resize_image(image, width, fmt, quality):
+    height = round(image.height * width / image.width)
+    out = io.BytesIO()
+    resized = image.resize((width, height), Image.LANCZOS)
+    if fmt == "JPEG":
+        resized.save(out, fmt, quality=quality, optimize=True, progressive=True)
+    else:
+        resized.save(out, fmt, quality=quality, method=6)
+    return out.getvalue(), height
+
+
+def _write(directory, name, data):
+    with open(os.path.join(directory, name), "wb") as f:
+        f.write(data)
+
+
+def build(source_dir, out_dir, files=(), images=(), widths=(640, 1280, 1920), quality=80):
+    """Fingerprint, compress and resize assets from `source_dir` into `out_dir`.
+
+    Returns the manifest. Files from earlier builds are left in place, so
+    pages already open in a browser keep loading their old assets.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"files": {}, "images": {}, "encodings": {}}
+    written = []
+
+    # images first, so CSS can refer to their fingerprinted names
+    for name in images:
+        with open(os.path.join(source_dir, name), "rb") as f:
+            raw = f.read()
+        variants = []
+        if Image is not None:
+            image = Image.open(io.BytesIO(raw)).convert("RGB")
+            stem = os.path.splitext(name)[0]
+            for width in sorted(w for w in widths if w <= image.width):
+                for ext, fmt, mimetype in IMAGE_FORMATS:
+                    data, height = resize_image(image, width, fmt, quality)
+                    hashed = fingerprint(f"{stem}-{width}.{ext}", data)
+                    _write(out_dir, hashed, data)
+                    variants.append({"file": hashed, "width": width, "height": height, "type": mimetype})
+        if variants:
+            # the plain url() in pages gets the largest JPEG, not the original
+            manifest["files"][name] = [v["file"] for v in variants if v["type"] == "image/jpeg"][-1]
+        else:
+            manifest["files"][name] = fingerprint(name, raw)
+            _write(out_dir, manifest["files"][name], raw)
+        manifest["images"][name] = variants
+
+    for name in files:
+        with open(os.path.join(source_dir, name), "rb") as f:
+            data = f.read()
+        if name.endswith(".css"):
+            data = STATIC_REF_RE.sub(lambda m: manifest["files"].get(m.group(1), m.group(1)),
+                                     data.decode("utf-8")).encode("utf-8")
+        hashed = fingerprint(name, data)
+        _write(out_dir, hashed, data)
+        manifest["files"][name] = hashed
+        written.append((hashed, data))
+
+    for hashed, data in written:
+        if os.path.splitext(hashed)[1] not in COMPRESSIBLE or len(data) < MIN_COMPRESS_SIZE:
+            continue
+        encoded = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encoded["br"] = brotli.compress(data, quality=11)
+        for encoding, body in encoded.items():
+            if len(body) < len(data):
+                _write(out_dir, hashed + ENCODING_SUFFIX[encoding], body)
+                manifest["encodings"].setdefault(hashed, []).append(encoding)
+
+    fd, tmp = tempfile.mkstemp(dir=out_dir, prefix=".manifest-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST))
+    return manifest
+
+
+class AssetStore:
+    """The built assets in `directory`, as listed by its manifest.
+
+    Without a manifest (assets never built) `built` is False and url()
+    returns None, so callers can fall back to unprocessed files.
+    """
+
+    def __init__(self, directory, prefix="/assets/"):
+        self.directory = directory
+        self.prefix = prefix
+        try:
+            with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            manifest = {"files": {}, "images": {}, "encodings": {}}
+        self.files = manifest["files"]
+        self.images = manifest["images"]
+        self.encodings = manifest["encodings"]
+        self.built = bool(self.files)
+        self.version = hashlib.sha1(json.dumps(manifest, sort_keys=True).encode()).hexdigest()[:8]
+        self._served = set(self.files.values()) | {v["file"] for vs in self.images.values() for v in vs}
+
+    def url(self, name):
+        hashed = self.files.get(name)
+        return self.prefix + hashed if hashed else None
+
+    def image_variants(self, name):
+        """[{"url", "width", "height", "type"}] for a resized image, smallest first."""
+        return [dict(v, url=self.prefix + v["file"]) for v in self.images.get(name, ())]
+
+    def variant(self, filename, accept_encodings):
+        """(path, content-encoding or None) to send for `filename`, or None if unknown.
+
+        `accept_encodings` maps encoding -> quality, like werkzeug's
+        request.accept_encodings.
+        """
+        if filename not in self._served:
+            return None
+        for encoding in ("br", "gzip"):
+            if encoding in self.encodings.get(filename, ()) and accept_encodings[encoding]:
+                return os.path.join(self.directory, filename + ENCODING_SUFFIX[encoding]), encoding
+        return os.path.join(self.directory, filename), None
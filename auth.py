@@ -0,0 +1,133 @@
+"""
+Password hashing off the request threads.
+
+scrypt/PBKDF2 are deliberately CPU-heavy; run inline, a burst of logins
+holds every Flask worker (and the GIL) and /chat stalls with them. Auth
+calls here run in a small process pool instead. The number of calls
+waiting for or running in the pool is capped: past `max_pending` the
+caller gets AuthBusy straight away (the endpoints answer 429) rather than
+queueing behind the burst.
+
+On a successful login, hashes made with older parameters are re-hashed
+with the current method and saved. A stored value that is not a werkzeug
+hash never matches.
+A login for an unknown user is checked against a dummy hash with the
+current parameters, so it takes as long as a wrong password and does not
+tell who has an account.
+
+The pool's workers are started with forkserver (spawn where that is not
+available), not fork: a forked copy of the web server would inherit its
+threads' locks and open database handles.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+class AuthBusy(Exception):
+    """The hashing pool is saturated; try again later."""
+
+
+# ---------------- Worker functions (run in the pool) ----------------
+def hash_password(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def normalize_method(method):
+    """A werkzeug method with its defaults filled in, as it is written into
+    the hashes it makes: "scrypt" -> "scrypt:32768:8:1"."""
+    name, *args = method.split(":")
+    if name == "scrypt" and not args:
+        args = ["32768", "8", "1"]
+    elif name == "pbkdf2":
+        args = (args or ["sha256"]) + ([str(DEFAULT_PBKDF2_ITERATIONS)] if len(args) < 2 else [])
+    return ":".join([name] + args)
+
+
+def needs_rehash(stored_hash, method):
+    return normalize_method(stored_hash.split("$", 1)[0]) != normalize_method(method)
+
+
+def verify_password(stored_hash, password, method):
+    """Returns (ok, new hash or None when the stored one is current)."""
+    ok = check_password_hash(stored_hash, password)
+    if ok and needs_rehash(stored_hash, method):
+        return True, generate_password_hash(password, method=method)
+    return ok, None
+
+
+# ---------------- Service ----------------
+class AuthService:
+    """Register/login against a UserStore with hashing in a process pool.
+
+    `workers=0` hashes in the calling thread (handy for scripts and for
+    comparing against the pool). The pool is started on first use.
+    """
+
+    def __init__(self, store, method, workers=2, max_pending=16, timeout=10.0):
+        self.store = store
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self.rehashed = 0
+        self.rejected = 0
+        # verifying it costs the same as a real hash with these parameters and never matches
+        self._dummy_hash = f"{normalize_method(method)}$dummysalt${'0' * 64}"
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise AuthBusy()
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+        try:
+            future = self._executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # keep the slot until the worker is really done, even if we time out
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeout:
+            self.rejected += 1
+            raise AuthBusy()
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                start = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context(start))
+            return self._pool
+
+    def register(self, username, password):
+        """False if the username is taken."""
+        if self.store.get_user(username) is not None:
+            return False
+        return self.store.create_user(username, self._run(hash_password, password, self.method))
+
+    def login(self, username, password):
+        user = self.store.get_user(username)
+        if user is None or not user[2]:
+            self._run(verify_password, self._dummy_hash, password, self.method)
+            return False
+        ok, new_hash = self._run(verify_password, user[2], password, self.method)
+        if new_hash:
+            self.store.update_password(username, new_hash)
+            self.rehashed += 1
+        return ok
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
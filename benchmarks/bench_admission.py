@@ -0,0 +1,191 @@
+"""
+Burst test for admission control (rate limits + the translation cap).
+
+A synthetic result-day burst: --students clients, each with its own
+address and session, send messages arriving at --rate per second (a
+--tamil share of them needing a fake translation that slows down once
+more than --upstream-capacity calls are in flight), while --flooders
+scripts hammer /chat back to back from one address each. Requests go
+through the Flask view in-process from a pool of client threads, so many
+are in flight at once.
+
+The same traffic is run with admission control off and on (limits from
+app.py unless overridden) and for each run the report shows what students
+and flooders got: answered, shed (English reply, no upstream translation)
+or 429, with the latency of the non-429 replies measured from the
+scheduled arrival. Then the rate limiter itself is timed and its memory
+per client measured.
+
+    python benchmarks/bench_admission.py [--seconds 5 --rate 400 --latency 0.5]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from admission import ConcurrencyLimiter, RateLimiter  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+from load_async import FakeTranslator, percentile  # noqa: E402
+from reply_cache import ReplyCache  # noqa: E402
+from translation import TranslationCache  # noqa: E402
+
+
+class SaturatingTranslator(FakeTranslator):
+    """FakeTranslator that slows down like a real upstream past `capacity` calls in flight."""
+
+    def __init__(self, latency, capacity):
+        super().__init__(latency)
+        self.capacity = capacity
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def translate(self, text, target):
+        with self._lock:
+            self.in_flight += 1
+            self.calls += 1
+            load = max(1.0, self.in_flight / self.capacity)
+        try:
+            time.sleep(self.latency * load)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return f"[{target}] {text}"
+
+
+def burst_schedule(args, corpus):
+    """[(arrival offset, kind, client id, message)]: students on a schedule, flooders separately."""
+    tamil = [m for m in corpus if app.is_tamil(m)]
+    english = [m for m in corpus if not app.is_tamil(m)]
+    schedule = []
+    for i in range(int(args.seconds * args.rate)):
+        pool = tamil if (i * 7919 % 100) < args.tamil * 100 else english
+        schedule.append((i / args.rate, "student", i % args.students, pool[i % len(pool)]))
+    return schedule
+
+
+def admission(enabled, args):
+    if enabled:
+        app.session_limits = RateLimiter(args.session_rate, args.session_burst, app.RATE_LIMIT_CLIENTS)
+        app.ip_limits = RateLimiter(app.RATE_LIMIT_IP_RATE, app.RATE_LIMIT_IP_BURST, app.RATE_LIMIT_CLIENTS)
+        app.translation_slots = ConcurrencyLimiter(args.max_active, args.max_queue, app.TRANSLATION_QUEUE_TIMEOUT)
+    else:
+        app.session_limits = app.ip_limits = RateLimiter(0, 0)
+        app.translation_slots = ConcurrencyLimiter(0)
+
+
+def run(args, schedule, enabled):
+    admission(enabled, args)
+    app.translation_cache = TranslationCache(SaturatingTranslator(args.latency, args.upstream_capacity), ttl=0)
+    app.reply_cache = ReplyCache(app.REPLY_CACHE_SIZE)
+    local = threading.local()
+    results = defaultdict(list)          # kind -> [(status, latency)]
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def send(kind, client, msg):
+        http = getattr(local, "client", None)
+        if http is None:
+            http = local.client = app.app.test_client()
+        address = f"10.{int(kind == 'flooder')}.{client // 256}.{client % 256}"
+        response = http.post("/chat", json={"message": msg, "session_id": f"{kind}-{client}"},
+                             environ_base={"REMOTE_ADDR": address})
+        status = response.status_code
+        if status == 200 and app.is_tamil(msg) and not response.get_json()["reply"].startswith("[ta]"):
+            status = "shed"
+        return status
+
+    def scheduled(kind, client, msg, arrival):
+        time.sleep(max(0.0, arrival - time.perf_counter()))
+        status = send(kind, client, msg)
+        with lock:
+            results[kind].append((status, time.perf_counter() - arrival))
+
+    def flood(client):
+        english = "fees for cse"
+        while not stop.is_set():
+            started = time.perf_counter()
+            status = send("flooder", client, english)
+            with lock:
+                results["flooder"].append((status, time.perf_counter() - started))
+
+    flooders = [threading.Thread(target=flood, args=(i,), daemon=True) for i in range(args.flooders)]
+    start = time.perf_counter() + 0.1
+    for t in flooders:
+        t.start()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        for offset, kind, client, msg in schedule:
+            pool.submit(scheduled, kind, client, msg, start + offset)
+    stop.set()
+    for t in flooders:
+        t.join()
+    return results, app.translation_slots.stats()
+
+
+def report(label, results, slots):
+    print(f"\n[{label}]")
+    if slots["admitted"]:
+        print(f"  most waiting on translation: {slots['peak_active']}, queued: {slots['queued']}, shed: {slots['shed']}")
+    print(f"  {'':<10}{'requests':>9}{'200':>7}{'shed':>7}{'429':>7}{'p50 ms':>9}{'p99 ms':>9}")
+    for kind in ("student", "flooder"):
+        samples = results.get(kind, [])
+        statuses = Counter(status for status, _ in samples)
+        answered = [seconds for status, seconds in samples if status != 429]
+        print(f"  {kind:<10}{len(samples):>9}{statuses[200]:>7}{statuses['shed']:>7}{statuses[429]:>7}"
+              f"{percentile(answered, 50):>9.1f}{percentile(answered, 99):>9.1f}")
+
+
+def bench_limiter(clients, repeat):
+    limiter = RateLimiter(1.0, 10, max_keys=clients)
+    keys = [f"session-{i}" for i in range(clients)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for key in keys:
+        limiter.take(key)
+    per_client = (tracemalloc.get_traced_memory()[0] - before) / clients
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for key in keys:
+            limiter.take(key)
+    per_call = (time.perf_counter() - start) / (repeat * clients) * 1e6
+    print(f"\nRateLimiter: {per_call:.2f} us per check, ~{per_client:.0f} bytes per tracked client "
+          f"({clients} clients, keys included)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0, help="length of the burst")
+    parser.add_argument("--rate", type=float, default=400, help="student messages per second")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--flooders", type=int, default=2)
+    parser.add_argument("--tamil", type=float, default=0.3, help="share of Tamil student messages")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake translation latency (s)")
+    parser.add_argument("--upstream-capacity", type=int, default=16,
+                        help="translation calls in flight before the upstream slows down")
+    parser.add_argument("--threads", type=int, default=200, help="client threads")
+    parser.add_argument("--max-active", type=int, default=app.TRANSLATION_MAX_ACTIVE)
+    parser.add_argument("--max-queue", type=int, default=app.TRANSLATION_MAX_QUEUE)
+    parser.add_argument("--session-rate", type=float, default=app.RATE_LIMIT_RATE)
+    parser.add_argument("--session-burst", type=int, default=app.RATE_LIMIT_BURST)
+    args = parser.parse_args()
+
+    app.metrics.enabled = False
+    app.query_log = None
+    schedule = burst_schedule(args, load_corpus())
+    print(f"{len(schedule)} student messages over {args.seconds:.0f}s from {args.students} students, "
+          f"{args.flooders} flooders, translation {args.latency * 1000:.0f} ms")
+    for label, enabled in (("admission control off", False), ("admission control on", True)):
+        report(label, *run(args, schedule, enabled))
+    bench_limiter(100_000, 5)
+
+
+if __name__ == "__main__":
+    main()
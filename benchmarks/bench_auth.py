@@ -0,0 +1,98 @@
+"""
+Benchmark: /chat latency while a login storm runs.
+
+A throwaway user database gets --accounts users. For --seconds, --logins
+threads keep POSTing /login while one thread sends corpus messages to
+/chat and records their latency. This is repeated with no logins, with
+hashing inline in the request thread (the old behaviour) and with the
+AuthService process pool; logins answered 429 are counted separately.
+
+    python benchmarks/bench_auth.py [--logins 16 --seconds 5]
+"""
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from auth import AuthService, hash_password  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+from user_store import UserStore  # noqa: E402
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000 if values else 0.0
+
+
+def storm(auth, accounts, threads, seconds, messages):
+    app.auth = auth
+    stop = threading.Event()
+    statuses = []
+
+    def login_loop(i):
+        client = app.app.test_client()
+        for username in itertools.cycle(accounts[i::threads] or accounts):
+            if stop.is_set():
+                return
+            status = client.post("/login", json={"username": username, "password": "secret"}).status_code
+            statuses.append(status)
+            if status == 429:
+                time.sleep(0.05)   # a polite client backs off
+
+    workers = [threading.Thread(target=login_loop, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    client = app.app.test_client()
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    for msg in itertools.cycle(messages):
+        if time.perf_counter() > deadline:
+            break
+        start = time.perf_counter()
+        client.post("/chat", json={"message": msg})
+        latencies.append(time.perf_counter() - start)
+    stop.set()
+    for w in workers:
+        w.join()
+    return latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=16, help="login threads")
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--accounts", type=int, default=64)
+    args = parser.parse_args()
+
+    messages = [m for m in load_corpus() if not app.is_tamil(m)]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UserStore(os.path.join(tmp, "users.db"))
+        method = app.PASSWORD_HASH_METHOD
+        secret = hash_password("secret", method)
+        accounts = [f"student{i:03d}" for i in range(args.accounts)]
+        store.bulk_import((name, secret) for name in accounts)
+
+        runs = [
+            ("no logins", None, 0),
+            ("inline hashing", AuthService(store, method, workers=0, max_pending=10 ** 6), args.logins),
+            ("process pool", AuthService(store, method, workers=app.AUTH_WORKERS,
+                                         max_pending=app.AUTH_MAX_PENDING), args.logins),
+        ]
+        print(f"{'mode':<16}{'chat p50 ms':>12}{'chat p99 ms':>12}{'logins ok':>11}{'429s':>7}")
+        for name, auth, threads in runs:
+            latencies, statuses = storm(auth, accounts, threads, args.seconds, messages)
+            print(f"{name:<16}{percentile(latencies, 50):>12.2f}{percentile(latencies, 99):>12.2f}"
+                  f"{statuses.count(200):>11}{statuses.count(429):>7}")
+            if auth is not None:
+                auth.shutdown()
+
+
+if __name__ == "__main__":
+    main()
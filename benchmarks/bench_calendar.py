@@ -0,0 +1,81 @@
+"""
+Benchmark: day-counter replies from the academic calendar.
+
+Compares answering "admission date", "admission deadline" and "days left
+for every upcoming date" the old way (datetime.now(), date parsing and
+formatting on every request) with reading today's pre-rendered replies
+from kb.academic_calendar, and checks the calendar's counters against
+plain date arithmetic for a range of days around the events.
+
+    python benchmarks/bench_calendar.py [--repeat 20000]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from academic_calendar import AcademicCalendar  # noqa: E402
+
+RAW_DATES = {e["id"]: e["date"].isoformat() for e in app.knowledge.current.calendar["events"]}
+
+
+def per_request(name):
+    """What each request did before: parse, subtract from now, format."""
+    if name == "upcoming_events":
+        now = datetime.now()
+        lines = []
+        for event_id, raw in sorted(RAW_DATES.items(), key=lambda item: item[1]):
+            day = datetime.strptime(raw, "%Y-%m-%d")
+            left = (day - now).days
+            if left >= 0:
+                lines.append(f"• {event_id} – {day.strftime('%d %B %Y')} ({left} days left)<br>")
+        return "".join(lines)
+    day = datetime.strptime(RAW_DATES[name.replace("admission_date", "admission_start")], "%Y-%m-%d")
+    left = (day - datetime.now()).days
+    return f"📅 {day.strftime('%d-%m-%Y')}<br>⏳ Only {left} days left!"
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    kb = app.knowledge.current
+    tz = ZoneInfo(app.CALENDAR_TIMEZONE)
+    events = kb.calendar["events"]
+    first = min(e["date"] for e in events)
+    for offset in range(-3, (max(e["date"] for e in events) - first).days + 3):
+        now = datetime.combine(first + timedelta(days=offset), datetime.min.time(), tzinfo=tz) + timedelta(hours=23)
+        calendar = AcademicCalendar(events, tz, render=app.render_calendar_replies, clock=lambda: now)
+        day = calendar.today()
+        for e in events:
+            assert day.days_left[e["id"]] == (e["date"] - now.date()).days
+        assert [e["id"] for e, _ in day.upcoming] == [e["id"] for e in sorted(events, key=lambda e: e["date"])
+                                                     if e["date"] >= now.date()]
+        assert day.expires_at == (now + timedelta(hours=1)).timestamp()
+    print(f"counters and rollover times checked for {offset + 4} days")
+
+    print("\nreply (us/request)        per request   cached calendar")
+    for name in ("admission_date", "admission_deadline", "upcoming_events"):
+        old = timed(lambda: per_request(name), args.repeat)
+        new = timed(lambda: kb.academic_calendar.today().replies[name], args.repeat)
+        print(f"  {name:<24}{old:10.2f}{new:16.3f}")
+    route_us = timed(lambda: app.route("upcoming dates"), args.repeat // 10)
+    print(f"\nroute('upcoming dates'): {route_us:.1f} us; rollovers so far: {kb.academic_calendar.rollovers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark: substring loops vs. the entity index.
+
+The old router found the course with a substring loop over courses.json
+(first listed wins), the timing programme with another over
+college_timings.json, and entrance-exam departments with keyword lists.
+This replays the corpus plus a set of tricky messages through both, prints
+every message where they disagree, and times them. The expected table at
+the top is checked against the index, so wrong extractions fail loudly.
+
+    python benchmarks/bench_entity_index.py [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+
+kb = app.knowledge.current
+
+# message -> entities the index must extract
+EXPECTED = {
+    "bba llb fees": {"course": "bba llb", "department": "law", "program": "law"},
+    "ba llb fee structure": {"course": "ba llb", "department": "law", "program": "law"},
+    "bsc cs timing": {"course": "bsc cs", "department": "science", "program": "science"},
+    "recent placements": {},
+    "purchase a form": {},
+    "b.tech 2nd year timing": {"department": "engineering", "program": "btech", "year": "2nd year"},
+    "fees for b.com": {"course": "bcom", "department": "arts", "program": "arts"},
+    "m.arch fees": {"course": "m.arch", "department": "architecture"},
+    "entrance exam for mechanical": {"course": "mechanical", "department": "engineering", "program": "btech"},
+    "மருத்துவம் இரண்டாம் ஆண்டு": {"department": "medical", "program": "medical", "year": "2nd year"},
+    "mca second year": {"program": "mca", "year": "2nd year"},
+}
+
+OLD_EXAM_KEYWORDS = {
+    "engineering": ["engineering", "cse", "ece", "eee"],
+    "medical": ["medical", "mbbs", "bds", "bpharm", "nursing"],
+    "management": ["mba", "management"],
+    "law": ["law", "llb"],
+    "architecture": ["architecture", "barch", "m.arch"],
+    "arts/science": ["arts", "science"],
+}
+
+
+def old_extract(msg):
+    """The three substring loops the router used before the entity index."""
+    found = {}
+    for dept_courses in kb.courses.values():
+        course = next((c for c in dept_courses if c in msg), None)
+        if course:
+            found["course"] = course
+            break
+    program = next((p for p in kb.college_timings if p in msg), None)
+    if program:
+        found["program"] = program
+    department = next((d for d, kws in OLD_EXAM_KEYWORDS.items() if any(k in msg for k in kws)), None)
+    if department:
+        found["department"] = department
+    return found
+
+
+def new_extract(msg):
+    found = kb.entities.extract(msg)
+    if found.get("department") in ("arts", "science"):
+        found["department"] = "arts/science"
+    return found
+
+
+def bench(fn, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for msg in messages:
+            fn(msg)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for msg, expected in EXPECTED.items():
+        got = kb.entities.extract(msg)
+        assert got == expected, (msg, got, expected)
+
+    messages = [app.normalize_query(m) for m in load_corpus()] + list(EXPECTED)
+    print(f"{len(kb.entities)} entity phrases; old and new disagree on:")
+    for msg in messages:
+        old, new = old_extract(msg), new_extract(msg)
+        diff = {k: (old.get(k), new.get(k)) for k in ("course", "program", "department")
+                if old.get(k) != new.get(k)}
+        if diff:
+            print(f"  {msg!r:<40} " + ", ".join(f"{k}: {a} -> {b}" for k, (a, b) in diff.items()))
+
+    old_us = bench(old_extract, messages, args.repeat)
+    new_us = bench(kb.entities.extract, messages, args.repeat)
+    print(f"\nmessages: {len(messages)} x {args.repeat}")
+    print(f"substring loops : {old_us:8.2f} us/msg")
+    print(f"entity index    : {new_us:8.2f} us/msg  ({old_us / new_us:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: fee and hostel queries over typed columns vs the raw JSON.
+
+Answers "total fee for each course", "courses with a yearly fee under
+₹50,000" and "cheapest AC girls hostel" two ways: walking data/*.json and
+parsing the "₹3,50,000" strings on every request, as a per-request
+handler over the nested dicts would, and with the NumPy columns in
+kb.fee_table / kb.hostel_table. Both must give the same answers; then the
+rupee formatting is checked to round-trip every amount in the data.
+
+    python benchmarks/bench_fee_tables.py [--repeat 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from fee_tables import format_rupees, parse_rupees  # noqa: E402
+
+
+def rupees(text):
+    return int(text.replace("₹", "").replace(",", ""))
+
+
+def dict_totals(courses):
+    return sorted(((sum(rupees(v) for v in fee_info.values()), name)
+                   for dept_courses in courses.values() for name, fee_info in dept_courses.items()))
+
+
+def dict_under(courses, limit):
+    found = [(max(rupees(v) for v in fee_info.values()), name)
+             for dept_courses in courses.values() for name, fee_info in dept_courses.items()]
+    return sorted(item for item in found if item[0] <= limit)
+
+
+def dict_cheapest_hostel(hostels, gender, ac):
+    matches = [h for h in hostels[gender] if h["ac"] == ac]
+    return min(matches, key=lambda h: h["hostel_fees"] + h["mess_fees"])["name"]
+
+
+def column_totals(table):
+    codes, fees = table.select(by="total")
+    return sorted((int(f) // 100, table.courses[c]) for c, f in zip(codes, fees))
+
+
+def column_under(table, limit):
+    codes, fees = table.select(max_fee=limit * 100, by="annual")
+    return sorted((int(f) // 100, table.courses[c]) for c, f in zip(codes, fees))
+
+
+def column_cheapest_hostel(table, gender, ac):
+    return table.names[table.select(gender, ac)[0]]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    kb = app.knowledge.current
+    courses, hostels = kb.courses, kb.hostels
+    fees, rooms = kb.fee_table, kb.hostel_table
+    amounts = [v for d in courses.values() for f in d.values() for v in f.values()]
+    assert all(format_rupees(parse_rupees(v)) == v for v in amounts)
+    print(f"{len(fees.courses)} courses, {len(fees.fee)} course-years, {len(rooms.names)} hostels; "
+          f"{len(amounts)} rupee strings round-trip")
+
+    cases = [
+        ("total fee per course", lambda: dict_totals(courses), lambda: column_totals(fees)),
+        ("yearly fee under 50,000", lambda: dict_under(courses, 50_000), lambda: column_under(fees, 50_000)),
+        ("cheapest AC girls hostel", lambda: dict_cheapest_hostel(hostels, "girls", True),
+         lambda: column_cheapest_hostel(rooms, "girls", True)),
+    ]
+    print(f"\n{'query (us)':<28}{'parse dicts':>12}{'columns':>10}")
+    for name, plain, columnar in cases:
+        assert plain() == columnar(), name
+        print(f"{name:<28}{timed(plain, args.repeat):12.2f}{timed(columnar, args.repeat):10.2f}")
+
+    messages = ["courses under 50,000", "total 4-year fee for cse", "cheapest ac hostel for girls"]
+    per_message = timed(lambda: [app.route(m) for m in messages], args.repeat // 10) / len(messages)
+    print(f"\nroute() for a fee/hostel query, end to end: {per_message:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Latency benchmark for FuzzyIndex vs. difflib.
+
+Times the fuzzy half of predict_intent() over every corpus message plus
+typo variants of each keyword, with the old per-intent difflib loop and
+with the index. That both give the same answers is checked by
+tests/test_fuzzy_index.py, which uses the reference functions here.
+
+    python benchmarks/bench_fuzzy_index.py [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+from difflib import SequenceMatcher, get_close_matches
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+
+kb = app.knowledge.current
+FUZZY_GROUPS = {**kb.intents, **app.FUZZY_EXTRA_GROUPS}
+
+
+def difflib_close_match(text, group):
+    matches = get_close_matches(text, FUZZY_GROUPS[group], n=1, cutoff=0.6)
+    return matches[0] if matches else None
+
+
+def difflib_best_label(text):
+    """The fuzzy half of the old predict_intent()."""
+    best_intent, best_score = None, 0
+    for intent_name, keywords in kb.intents.items():
+        match = get_close_matches(text, keywords, n=1, cutoff=0.6)
+        if match:
+            ratio = SequenceMatcher(None, text, match[0]).ratio()
+            if ratio > best_score:
+                best_intent, best_score = intent_name, ratio
+    return best_intent, best_score
+
+
+def typo_variants(phrase):
+    """Drop, double and swap single characters of a keyword."""
+    variants = {phrase[:i] + phrase[i + 1:] for i in range(len(phrase))}
+    variants |= {phrase[:i] + phrase[i] + phrase[i:] for i in range(len(phrase))}
+    variants |= {phrase[:i] + phrase[i + 1] + phrase[i] + phrase[i + 2:] for i in range(len(phrase) - 1)}
+    return variants
+
+
+def build_messages():
+    messages = [m.strip().lower() for m in load_corpus()]
+    for phrases in FUZZY_GROUPS.values():
+        for phrase in phrases:
+            messages.extend(sorted(typo_variants(phrase)))
+    return messages
+
+
+def timed(fn, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for msg in messages:
+            fn(msg)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = build_messages()
+    old_us = timed(difflib_best_label, messages, args.repeat)
+    new_us = timed(lambda m: kb.fuzzy_index.best_label(m, kb.intents), messages, args.repeat)
+    print(f"difflib loop      : {old_us:8.1f} us/msg")
+    print(f"FuzzyIndex        : {new_us:8.1f} us/msg  ({old_us / new_us:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Microbenchmark: keyword cascade vs. the compiled KeywordIndex router.
+
+Replays benchmarks/corpus.jsonl and compares the old way of finding matches
+(one `any(phrase in msg ...)` per keyword list plus the intent loop) with a
+single `router.scan()`. Both sides must agree on every message. Course,
+programme and year names are entities; see bench_entity_index.py.
+
+    python benchmarks/bench_intent_router.py [--repeat 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+
+kb = app.knowledge.current
+
+
+def load_corpus(path=os.path.join(ROOT, "benchmarks", "corpus.jsonl")):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["message"] for line in f if line.strip()]
+
+
+def cascade_scan(user_msg_lower):
+    """What the old `chat()` did: one substring scan per keyword list."""
+    hits = {}
+    for label, phrases in app.ROUTE_KEYWORDS.items():
+        if any(phrase in user_msg_lower for phrase in phrases):
+            hits[label] = None
+    # predict_intent()'s exact-match loop
+    for intent_name, keywords in kb.intents.items():
+        if any(kw.lower() in user_msg_lower for kw in keywords):
+            hits["intent"] = intent_name
+            break
+    return hits
+
+
+def bench(fn, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for msg in messages:
+            fn(msg)
+    elapsed = time.perf_counter() - start
+    return elapsed / (repeat * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    messages = [m.strip().lower() for m in load_corpus()]
+    for msg in messages:
+        old, new = cascade_scan(msg), kb.router.scan(msg)
+        assert old.keys() == new.keys(), (msg, old.keys() ^ new.keys())
+        assert old.get("intent") == new.get("intent"), msg
+
+    old_us = bench(cascade_scan, messages, args.repeat)
+    new_us = bench(kb.router.scan, messages, args.repeat)
+    print(f"messages: {len(messages)} x {args.repeat}")
+    print(f"cascade scan : {old_us:8.2f} us/msg")
+    print(f"router.scan  : {new_us:8.2f} us/msg  ({old_us / new_us:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: language detection.
+
+Times three ways of telling whether a message has Tamil in it (the old
+per-character any() loop, the compiled regex in language.py, and a
+str.translate() that drops Tamil code points), which must agree on every
+corpus and probe message plus mixed Tamil-English ones, and
+detect_language() itself.
+
+(Splitting the keyword router into one index per language was measured
+here too: scans were no faster for English, Tamil or mixed messages, so
+the router keeps one index.)
+
+    python benchmarks/bench_language.py [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+from language import detect_language, has_tamil  # noqa: E402
+
+DROP_TAMIL = dict.fromkeys(range(0x0B80, 0x0C00))
+MIXED = ["bcom கட்டணம்", "btech கல்லூரி நேரம்", "hostel ஆண்கள் fees", "cse பாடநெறிகள் list"]
+
+
+def any_loop(text):
+    return any("\u0B80" <= ch <= "\u0BFF" for ch in text)
+
+
+def translate_drop(text):
+    return len(text.translate(DROP_TAMIL)) != len(text)
+
+
+def bench(fn, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for msg in messages:
+            fn(msg)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    kb = app.knowledge.current
+    messages = [app.normalize_query(m) for m in load_corpus()]
+    messages += [app.normalize_query(m) for m in app.probe_messages(kb)] + MIXED
+    langs = {lang: sum(detect_language(m) == lang for m in messages) for lang in ("en", "ta", "mixed")}
+    print(f"{len(messages)} messages: " + ", ".join(f"{k}={v}" for k, v in langs.items()))
+
+    for msg in messages:
+        assert any_loop(msg) == has_tamil(msg) == translate_drop(msg), msg
+    print("\nTamil detection (us/msg):")
+    for name, fn in (("any() per character", any_loop), ("regex (language.py)", has_tamil),
+                     ("str.translate", translate_drop), ("detect_language", detect_language)):
+        print(f"  {name:<22}{bench(fn, messages, args.repeat):8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Instrumentation overhead and per-branch timings for route_message().
+
+Replays benchmarks/corpus.jsonl with metrics disabled and enabled, reports
+the difference per message, then prints the replies/latency breakdown by
+branch and stage collected during the enabled run.
+
+    python benchmarks/bench_metrics.py [--repeat 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+
+
+def run(messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for msg in messages:
+            app.route_message(msg)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    messages = [m.strip() for m in load_corpus()]
+    metrics = app.metrics
+    metrics.enabled = False
+    run(messages, 5)   # warm up
+    off_us = run(messages, args.repeat)
+    metrics.enabled = True
+    metrics.reset()
+    on_us = run(messages, args.repeat)
+
+    print(f"messages: {len(messages)} x {args.repeat}")
+    print(f"metrics off : {off_us:8.2f} us/msg")
+    print(f"metrics on  : {on_us:8.2f} us/msg  ({on_us - off_us:+.2f} us)")
+
+    print(f"\n{'series':<32}{'count':>9}{'mean us':>10}")
+    for name, by_label in (("route_seconds", "branch"), ("stage_seconds", "stage")):
+        series = metrics._histograms.get(name, {})
+        for (_, value), hist in sorted(series.items(), key=lambda kv: -kv[1].sum):
+            print(f"{by_label}={value:<{31 - len(by_label)}}{hist.count:>9}{hist.sum / hist.count * 1e6:>10.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Page load: bytes on the wire and response time, before and after the asset pipeline.
+
+Serves two apps on local ports and loads each page with a plain HTTP
+client (no browser) that keeps a cache the way a browser would:
+
+    before  the pages rendered on every hit, bg.jpeg sent as-is by Flask's
+            static route (no compression, revalidated on every visit)
+    after   app.py with assets built into a temp dir by build_assets:
+            cached gzip pages with ETags, fingerprinted immutable assets,
+            brotli/gzip text and a right-sized WebP background
+
+A first visit fetches the page and its background. A repeat visit
+revalidates what has an ETag or Last-Modified (a 304 is a few hundred
+bytes) and skips what is cached as immutable. Wire bytes are status line,
+headers and body as received.
+
+    python benchmarks/bench_page_load.py [--repeat 20]
+"""
+import argparse
+import gzip
+import http.client
+import os
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import Flask, render_template, url_for  # noqa: E402
+from werkzeug.serving import WSGIRequestHandler, make_server  # noqa: E402
+
+import app  # noqa: E402
+import assets  # noqa: E402
+
+PAGES = ("/", "/chatbot")
+VIEWPORTS = [("desktop 1920x1080", 1920, 1080, 1), ("laptop 1280x720", 1280, 720, 1),
+             ("phone 360x640 @2x", 360, 640, 2)]
+ACCEPT = {"Accept-Encoding": "gzip, deflate, br", "Accept": "image/webp,*/*"}
+URL_RE = re.compile(r'url\("([^"]+)"\)')
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def baseline_app():
+    """The pages and background as served before the pipeline."""
+    old = Flask("baseline", template_folder=ROOT, static_folder=ROOT, static_url_path="/static")
+    old.add_url_rule("/", "home", lambda: render_template("index.html"))
+    old.add_url_rule("/chatbot", "chatbot_page", lambda: render_template("chatbot.html"))
+    old.add_url_rule("/exit", "exit_page", lambda: "")
+    old.context_processor(lambda: {
+        "asset_url": lambda name: url_for("static", filename=name),
+        "responsive_background": lambda selector, name: "",
+    })
+    return old
+
+
+def serve(wsgi_app):
+    server = make_server("127.0.0.1", 0, wsgi_app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class Client:
+    """HTTP/1.1 client with a browser-like cache: {path: (validators, immutable)}."""
+
+    def __init__(self, port):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port)
+        self.cache = {}
+
+    def get(self, path):
+        """(wire bytes, body); no request at all for a cached immutable response."""
+        validators, immutable = self.cache.get(path, ({}, False))
+        if immutable:
+            return 0, None
+        self.conn.request("GET", path, headers={**ACCEPT, **validators})
+        response = self.conn.getresponse()
+        body = response.read()
+        wire = len(f"HTTP/1.1 {response.status} {response.reason}\r\n") + len(str(response.msg)) + len(body)
+        cache_control = response.getheader("Cache-Control") or ""
+        validators = {}
+        if response.getheader("ETag"):
+            validators["If-None-Match"] = response.getheader("ETag")
+        if response.getheader("Last-Modified"):
+            validators["If-Modified-Since"] = response.getheader("Last-Modified")
+        if response.status == 200:
+            self.cache[path] = (validators, "immutable" in cache_control)
+        return wire, body
+
+
+def pick_background(page, viewport):
+    """The background URL a browser with `viewport` would load for `page`."""
+    _, width, height, dpr = viewport
+    variants = [v for v in app.assets.image_variants("bg.jpeg") if v["type"] == "image/webp" and v["url"] in page]
+    if not variants:
+        return URL_RE.search(page).group(1)
+    fits = [v for v in variants if v["width"] >= width * dpr and v["height"] >= height * dpr]
+    return (fits[0] if fits else variants[-1])["url"]
+
+
+def visit(client, path, viewport, page_cache):
+    """Load `path` and its background: (wire bytes, seconds)."""
+    start = time.perf_counter()
+    wire, body = client.get(path)
+    if body:
+        page_cache[path] = (gzip.decompress(body) if body[:2] == b"\x1f\x8b" else body).decode("utf-8")
+    image_wire, _ = client.get(pick_background(page_cache[path], viewport))
+    return wire + image_wire, time.perf_counter() - start
+
+
+def measure(port, viewport, repeat):
+    """Median (first visit, repeat visit) as ((bytes, ms), (bytes, ms)) over `repeat` fresh clients."""
+    first, again = [], []
+    for _ in range(repeat):
+        client, pages = Client(port), {}
+        for path in PAGES:
+            first.append(visit(client, path, viewport, pages))
+            again.append(visit(client, path, viewport, pages))
+        client.conn.close()
+    per_page = len(PAGES)
+    summary = []
+    for samples in (first, again):
+        summary.append((sum(b for b, _ in samples[:per_page]),
+                        statistics.median(t for _, t in samples) * 1000 * per_page))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as out:
+        manifest = assets.build(ROOT, out, files=app.ASSET_FILES, images=app.ASSET_IMAGES,
+                                widths=app.ASSET_IMAGE_WIDTHS)
+        app.assets = assets.AssetStore(out)
+        before, after = serve(baseline_app()), serve(app.app)
+
+        print(f"{'asset':<12}{'source':>10}{'served':>10}  encoding")
+        for name, hashed in manifest["files"].items():
+            found = app.assets.variant(hashed, {"br": 1, "gzip": 1})
+            print(f"{name:<12}{os.path.getsize(os.path.join(ROOT, name)):>10}"
+                  f"{os.path.getsize(found[0]):>10}  {found[1] or 'identity'}")
+
+        print(f"\n{'both pages + background':<26}{'first visit':>22}{'repeat visit':>22}")
+        print(f"{'':<26}{'bytes':>12}{'ms':>10}{'bytes':>12}{'ms':>10}")
+        for viewport in VIEWPORTS:
+            for label, server in (("before", before), ("after", after)):
+                (b1, t1), (b2, t2) = measure(server.server_port, viewport, args.repeat)
+                print(f"{viewport[0] + ' ' + label:<26}{b1:>12}{t1:>10.1f}{b2:>12}{t2:>10.1f}")
+        before.shutdown()
+        after.shutdown()
+
+
+if __name__ == "__main__":
+    main()
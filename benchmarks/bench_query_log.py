@@ -0,0 +1,84 @@
+"""
+Benchmark: what query logging costs the request thread.
+
+Compares, per chat message, writing the record inline (normalize, hash,
+router scan, json.dumps, append and flush, as a logging call in the view
+would) with QueryLog.log(), which only queues a tuple for the writer
+thread. Then fires a burst at a deliberately small buffer to show that a
+slow or saturated writer drops records instead of blocking requests.
+
+    python benchmarks/bench_query_log.py [--repeat 50]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+from query_log import QueryLog  # noqa: E402
+
+
+def inline_writer(path):
+    f = open(path, "a", encoding="utf-8")
+
+    def log(message, branch, cache_hit, unanswered, latency):
+        record = {"ts": time.time(), "branch": branch, "cache": cache_hit,
+                  "unanswered": unanswered, "latency_ms": latency * 1000}
+        record.update(app.describe_query(message, unanswered))
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+    return log, f
+
+
+def bench(log, messages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for msg in messages:
+            log(msg, "fees", False, False, 0.0002)
+    return (time.perf_counter() - start) / (repeat * len(messages)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    messages = load_corpus()
+    with tempfile.TemporaryDirectory() as tmp:
+        log, f = inline_writer(os.path.join(tmp, "inline.jsonl"))
+        inline_us = bench(log, messages, args.repeat)
+        f.close()
+
+        qlog = QueryLog(os.path.join(tmp, "async.jsonl"), capacity=len(messages) * args.repeat,
+                        enrich=app.describe_query)
+        queued_us = bench(qlog.log, messages, args.repeat)
+        start = time.perf_counter()
+        qlog.close()
+        drain_s = time.perf_counter() - start
+
+        print(f"messages: {len(messages)} x {args.repeat}")
+        print(f"inline write  : {inline_us:8.2f} us/request")
+        print(f"QueryLog.log  : {queued_us:8.2f} us/request  ({inline_us / queued_us:.0f}x less on the request thread)")
+        print(f"writer drained {qlog.written} records in {drain_s:.2f}s after the run")
+
+        burst = QueryLog(os.path.join(tmp, "burst.jsonl"), capacity=1_000, flush_interval=0.05)
+        start = time.perf_counter()
+        for i in range(100_000):
+            burst.log(messages[i % len(messages)], "fees", False, False, 0.0002)
+        burst_s = time.perf_counter() - start
+        burst.close()
+        with open(burst.path, encoding="utf-8") as f:
+            noted = sum(json.loads(line).get("dropped", 0) for line in f)
+        stats = burst.stats()
+        print(f"\nburst of 100000 into a 1000-record buffer in {burst_s * 1000:.0f} ms: "
+              f"{stats['written']} written, {stats['dropped']} dropped ({noted} recorded in the log)")
+
+
+if __name__ == "__main__":
+    main()
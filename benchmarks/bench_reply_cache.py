@@ -0,0 +1,67 @@
+"""
+Benchmark: routing every message vs. the normalized reply cache.
+
+Builds --requests messages by drawing corpus questions with a Zipf-like
+skew (a few questions dominate, as in real traffic) and randomly varying
+their case, spacing and trailing punctuation. Reports per-message latency
+of route_message() and cached_route() and the cache hit rate.
+
+    python benchmarks/bench_reply_cache.py [--requests 20000 --skew 1.1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+
+
+def build_traffic(n, skew, seed=1):
+    rng = random.Random(seed)
+    corpus = [m.strip() for m in load_corpus()]
+    weights = [1 / (rank + 1) ** skew for rank in range(len(corpus))]
+    traffic = []
+    for msg in rng.choices(corpus, weights, k=n):
+        if rng.random() < 0.3:
+            msg = msg.upper() if rng.random() < 0.5 else msg.title()
+        if rng.random() < 0.3:
+            msg = msg.replace(" ", "  ")
+        if rng.random() < 0.3:
+            msg += rng.choice(["?", "!", "??", "."])
+        traffic.append(msg)
+    return traffic
+
+
+def timed(fn, traffic):
+    start = time.perf_counter()
+    for msg in traffic:
+        fn(msg)
+    return (time.perf_counter() - start) / len(traffic) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--skew", type=float, default=1.1)
+    args = parser.parse_args()
+
+    traffic = build_traffic(args.requests, args.skew)
+    app.metrics.enabled = False
+    app.reply_cache.clear()
+    old_us = timed(app.route_message, traffic)
+    new_us = timed(app.cached_route, traffic)
+    stats = app.reply_cache.stats()
+    print(f"requests: {len(traffic)}, distinct: {len(set(traffic))}, "
+          f"distinct normalized: {len({app.normalize_query(m) for m in traffic})}")
+    print(f"route_message : {old_us:8.2f} us/msg")
+    print(f"cached_route  : {new_us:8.2f} us/msg  ({old_us / new_us:.1f}x faster)")
+    print(f"hit rate      : {stats['hit_rate']:.1%}  (size {stats['size']}, evictions {stats['evictions']})")
+
+
+if __name__ == "__main__":
+    main()
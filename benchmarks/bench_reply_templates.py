@@ -0,0 +1,103 @@
+"""
+Benchmark: rendering fee/hostel/timing replies per request vs. precomputed.
+
+"before" rebuilds each answer with the string concatenation loops chat()
+used to run; "after" is the reply_templates lookup. Reports latency and the
+bytes allocated per request (tracemalloc).
+
+    python benchmarks/bench_reply_templates.py [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+
+kb = app.knowledge.current
+
+
+# ---- the old inline rendering from chat() ----
+def old_fee(course_name):
+    for dept_courses in kb.courses.values():
+        if course_name in dept_courses:
+            reply = f"💰 Fees for {course_name.upper()}:\n"
+            for year, amount in dept_courses[course_name].items():
+                reply += f"{year}: {amount}\n"
+            return reply
+
+
+def old_hostel(gender):
+    hostels = kb.hostels[gender]
+    details = f"<b>🏠 {gender.title()} Hostels:</b><br>"
+    for h in hostels:
+        details += f"{h['name']} - {'AC' if h['ac'] else 'Non-AC'}<br>Rooms: {h['rooms']}, Members/Room: {h['members_per_room']}<br>Hostel Fees: ₹{h['hostel_fees']}, Mess Fees: ₹{h['mess_fees']}<br><br>"
+    return details
+
+
+def old_timing_all(_):
+    reply = "⏰ College Timings:\n"
+    for course, years in kb.college_timings.items():
+        if isinstance(years, str):
+            reply += f"{years}\n"
+        else:
+            for year, timing in years.items():
+                reply += f"{timing}\n"
+    return reply
+
+
+# ---- the precomputed lookups ----
+def new_fee(course_name):
+    return kb.replies["fees"][course_name]
+
+
+def new_hostel(gender):
+    return kb.replies["hostel"][gender]
+
+
+def new_timing_all(_):
+    return kb.replies["timing_all"]
+
+
+CASES = [
+    ("fees", old_fee, new_fee, ["cse", "mbbs", "bsc cs", "bba llb"]),
+    ("hostel", old_hostel, new_hostel, ["boys", "girls"]),
+    ("timing_all", old_timing_all, new_timing_all, [None]),
+]
+
+
+def measure(fn, keys, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for key in keys:
+            fn(key)
+    latency = (time.perf_counter() - start) / (repeat * len(keys)) * 1e6
+
+    tracemalloc.start()
+    for key in keys:
+        fn(key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latency, peak / len(keys)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'reply':<12}{'before us':>11}{'after us':>10}{'before B':>11}{'after B':>9}")
+    for name, old, new, keys in CASES:
+        for key in keys:
+            assert old(key) == new(key), (name, key)
+        old_us, old_bytes = measure(old, keys, args.repeat)
+        new_us, new_bytes = measure(new, keys, args.repeat)
+        print(f"{name:<12}{old_us:>11.2f}{new_us:>10.2f}{old_bytes:>11.0f}{new_bytes:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
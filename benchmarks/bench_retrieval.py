@@ -0,0 +1,151 @@
+"""
+Benchmark: the BM25 retrieval fallback.
+
+Checks, on held-out questions that are not probe messages and that the
+keyword cascade misses, that the questions the bot can answer get the
+right reply and the rest get none, and that RETRIEVAL_MIN_SCORE sits
+between the two groups' top scores (it was picked from them). Then times
+building the index, opening the saved file (memory-mapped) and searching
+it, against the same BM25 scoring done passage by passage in plain Python.
+
+    python benchmarks/bench_retrieval.py [--repeat 2000]
+"""
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from retrieval import BM25Index, terms  # noqa: E402
+
+# question the cascade misses -> start of the reply it should get (None: no answer)
+EXPECTED = {
+    "who is the principal": "<div style='text-align:center",
+    "does the college have a library": "<div style='text-align:center",
+    "how many faculty members": "<div style='text-align:center",
+    "which companies come for campus placement": "<b>💼 Placement Information",
+    "top recruiters": "<b>💼 Placement Information",
+    "do rooms have ac": "<b>🏠 Boys Hostels",
+    "is there a gym": "<b>🏠 Hostel Details",
+    "is there wifi and security": "<b>🏠 Hostel Details",
+    "music and dance events": "<b>🎭 Cultural",
+    "swimming pool": "<b>🏅 Sports",
+    "tennis courts": "<b>🏅 Sports",
+    "which documents should i submit": "📝 Admission Process",
+    "what is the cost of bus": None,
+    "is there a bus facility": None,
+    "is there a canteen": None,
+    "1st year": None,
+    "2nd year": None,
+    "4th year": None,
+    "is ragging allowed": None,
+    "what about nri quota": None,
+    "is there a dress rehearsal tomorrow": None,
+    "can i bring my car": None,
+    "what is the capital of france": None,
+    "who won the match yesterday": None,
+    "what is the meaning of life": None,
+    "tell me a joke": None,
+    "xyzzy": None,
+    "hello": None,
+}
+
+
+class PlainBM25:
+    """Same scores as BM25Index, computed per passage from term-count dicts."""
+
+    def __init__(self, documents, k1=1.2, b=0.75):
+        self.docs = [(self._counts(text), passage) for text, passage in documents]
+        self.k1, self.b = k1, b
+        self.avg = sum(sum(tf.values()) for tf, _ in self.docs) / len(self.docs)
+        df = {}
+        for tf, _ in self.docs:
+            for term in tf:
+                df[term] = df.get(term, 0) + 1
+        n = len(self.docs)
+        self.idf = {t: math.log(1 + (n - d + 0.5) / (d + 0.5)) for t, d in df.items()}
+
+    @staticmethod
+    def _counts(text):
+        tf = {}
+        for term in terms(text):
+            tf[term] = tf.get(term, 0) + 1
+        return tf
+
+    def search(self, text):
+        query = [t for t in dict.fromkeys(terms(text)) if t in self.idf]
+        best = (0.0, None)
+        for tf, passage in self.docs:
+            length = sum(tf.values())
+            score = sum(self.idf[t] * tf[t] * (self.k1 + 1) /
+                        (tf[t] + self.k1 * (1 - self.b + self.b * length / self.avg))
+                        for t in query if t in tf)
+            if score > best[0]:
+                best = (score, passage)
+        return best
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    kb = app.knowledge.current
+    start = time.perf_counter()
+    documents = app.retrieval_documents(kb)
+    index = BM25Index.build(documents, meta={"scope": app.reply_scope(kb)})
+    build_ms = (time.perf_counter() - start) * 1000
+
+    answerable, unanswerable = [], []
+    for question, expected in EXPECTED.items():
+        text = app.normalize_query(question)
+        assert app.route(text, fallback=False)[0] in app.UNANSWERED_REPLIES, ("cascade answers", question)
+        hits = index.search(text)
+        top = hits[0][0] if hits else 0.0
+        if expected is None:
+            unanswerable.append(top)
+        else:
+            assert hits and hits[0][1].startswith(expected), (question, hits[0][1][:60] if hits else None)
+            answerable.append(top)
+    assert max(unanswerable) < app.RETRIEVAL_MIN_SCORE <= min(answerable), (max(unanswerable), min(answerable))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "retrieval.idx")
+        index.save(path)
+        size = os.path.getsize(path)
+        load_us = timed(lambda: BM25Index.load(path), 50)
+        mapped = BM25Index.load(path)
+        questions = [app.normalize_query(q) for q in EXPECTED]
+        plain = PlainBM25(documents)
+        for q in questions:
+            assert mapped.search(q)[:1] == index.search(q)[:1]
+            got = mapped.search(q)
+            assert (got[0][1] if got else None) == plain.search(q)[1]
+        mapped_us = timed(lambda: [mapped.search(q) for q in questions], args.repeat) / len(questions)
+        memory_us = timed(lambda: [index.search(q) for q in questions], args.repeat) / len(questions)
+        plain_us = timed(lambda: [plain.search(q) for q in questions], args.repeat // 10) / len(questions)
+
+    print(f"top score: answerable >= {min(answerable):.2f}, unanswerable <= {max(unanswerable):.2f}, "
+          f"RETRIEVAL_MIN_SCORE = {app.RETRIEVAL_MIN_SCORE}")
+    print(f"{len(index)} passages, {len(index.vocabulary)} terms, {len(index.indices)} postings")
+    print(f"build (routing every probe + indexing): {build_ms:8.1f} ms")
+    print(f"saved index: {size} bytes; open + mmap: {load_us:8.1f} us")
+    print(f"search, in-memory arrays : {memory_us:8.2f} us/question")
+    print(f"search, memory-mapped    : {mapped_us:8.2f} us/question")
+    print(f"search, plain Python BM25: {plain_us:8.2f} us/question")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: conversation sessions.
+
+  * memory: bytes per stored session (tracemalloc), and that the store
+    stays at --max-sessions when more conversations than that are active;
+  * follow-ups: scripted two-turn conversations ("btech timing" then
+    "what about 2nd year?"), timing the follow-up through answer() with a
+    session against routing it from scratch, and counting how many of the
+    follow-ups the plain cascade answers with the right data.
+
+    python benchmarks/bench_sessions.py [--sessions 100000 --max-sessions 10000 --repeat 2000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+from session_store import SessionStore  # noqa: E402
+
+# (opening question, follow-up, text the follow-up reply must contain)
+CONVERSATIONS = [
+    ("btech timing", "what about 2nd year?", "B.Tech 2nd Year"),
+    ("btech timing", "and mca?", "MCA 1st Year"),
+    ("mca timing", "second year", "MCA 2nd Year"),
+    ("fees for cse", "what about 3rd year", "3rd year: ₹55,000"),
+    ("fees for cse", "and ece?", "Fees for ECE"),
+    ("ece fees", "how about 4th year", "4th year: ₹50,000"),
+]
+
+
+def measure_memory(n):
+    store = SessionStore(max_sessions=n, ttl=3600)
+    ids = [f"session-{i:08d}" for i in range(n)]   # ids exist anyway (request payload)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for sid in ids:
+        store.remember(sid, "fees", course="cse", year="2nd year")
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return used / n
+
+
+def measure_bound(total, max_sessions):
+    store = SessionStore(max_sessions=max_sessions, ttl=3600)
+    for i in range(total):
+        store.remember(f"s{i}", "timing", program="btech")
+    return len(store), store.evictions
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--max-sessions", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    app.metrics.enabled = False
+    print(f"memory per session: {measure_memory(args.sessions):.0f} bytes "
+          f"(state record + LRU slot, {args.sessions} sessions)")
+    size, evictions = measure_bound(args.sessions, args.max_sessions)
+    print(f"{args.sessions} conversations into a store of {args.max_sessions}: "
+          f"size {size}, evicted {evictions}\n")
+
+    print(f"{'conversation':<44}{'route us':>9}{'session us':>11}  stateless ok / session ok")
+    for first, followup, expected in CONVERSATIONS:
+        app.answer(first, "bench")
+        state = app.sessions.get("bench")
+        text = app.normalize_query(followup)
+
+        def with_session():
+            app.sessions.remember("bench", state.topic, state.course, state.program, state.year, state.gender)
+            return app.answer(followup, "bench")
+
+        route_us = timed(lambda: app.route(text), args.repeat)
+        session_us = timed(with_session, args.repeat)
+        stateless_ok = expected in app.route(text)[0]
+        session_ok = expected in with_session()
+        print(f"{first + ' / ' + followup:<44}{route_us:>9.1f}{session_us:>11.1f}  "
+              f"{'yes' if stateless_ok else 'no':>12} / {'yes' if session_ok else 'no'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Multi-worker benchmark: private in-memory caches vs. a shared cache store.
+
+Starts --workers processes (like gunicorn workers) and deals --requests
+skewed corpus messages to them round-robin. Each worker answers through
+cached_route() plus Tamil translation, with a counting fake translator
+upstream, and reports its cache stats and RSS. Run per backend:
+
+    memory   every worker has its own caches (the old behaviour)
+    sqlite   one WAL-mode SQLite file shared by all workers
+    redis    RedisBackend against the in-process stand-in server
+
+    python benchmarks/bench_shared_cache.py [--workers 4 --requests 4000]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker(url, messages, workdir, results):
+    os.chdir(workdir)   # app creates users.db / cache files relative to cwd
+    import app
+    from cache_backends import make_backend
+    from load_async import FakeTranslator
+    from reply_cache import ReplyCache
+    from translation import TranslationCache
+
+    app.metrics.enabled = False
+    store = make_backend(url)
+    upstream = FakeTranslator(latency=0)
+    app.translation_cache = TranslationCache(upstream, max_entries=app.TRANSLATION_CACHE_SIZE,
+                                             ttl=app.TRANSLATION_CACHE_TTL, store=store)
+    app.reply_cache = ReplyCache(app.REPLY_CACHE_SIZE, store=store,
+                                 scope=app.reply_scope(app.knowledge.current))
+    start = time.perf_counter()
+    for msg in messages:
+        reply = app.cached_route(msg)
+        app.translate_reply_deep(reply, msg)
+    elapsed = time.perf_counter() - start
+    results.put((app.reply_cache.stats(), upstream.calls, rss_mb(), elapsed / max(1, len(messages)) * 1e6))
+
+
+def run(url, traffic, workers, workdir):
+    ctx = multiprocessing.get_context("fork")
+    results = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(url, traffic[i::workers], workdir, results))
+             for i in range(workers)]
+    for p in procs:
+        p.start()
+    out = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--skew", type=float, default=1.1)
+    args = parser.parse_args()
+
+    import resp_standin
+    from bench_reply_cache import build_traffic
+
+    traffic = build_traffic(args.requests, args.skew)
+    server = resp_standin.start()
+    backends = [
+        ("memory", "memory://"),
+        ("sqlite", "sqlite:///shared_cache.db"),
+        ("redis", f"redis://127.0.0.1:{server.server_address[1]}/0"),
+    ]
+    print(f"{args.requests} requests over {args.workers} workers")
+    print(f"{'backend':<9}{'hit rate':>9}{'shared hits':>12}{'routed':>8}{'upstream tr':>12}"
+          f"{'RSS MB total':>13}{'us/msg':>8}")
+    for name, url in backends:
+        with tempfile.TemporaryDirectory() as workdir:
+            out = run(url, traffic, args.workers, workdir)
+        hits = sum(s["hits"] for s, *_ in out)
+        misses = sum(s["misses"] for s, *_ in out)
+        print(f"{name:<9}{hits / (hits + misses):>9.1%}{sum(s['store_hits'] for s, *_ in out):>12}"
+              f"{misses:>8}{sum(c for _, c, _, _ in out):>12}{sum(r for *_, r, _ in out):>13.1f}"
+              f"{sum(us for *_, us in out) / len(out):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Cold-start benchmark with a regression budget.
+
+Each run is a fresh interpreter in an empty temp directory (so no cache or
+database files are reused):
+
+  * `python -X importtime -c "import app"` gives the cumulative import time
+    of app and of the modules it pulls in directly;
+  * a second process imports app and times its first /chat request.
+
+Medians over --runs are compared with the budgets; the script exits 1 if
+either is exceeded, so CI can run it.
+
+    python benchmarks/bench_startup.py [--runs 5 --import-budget-ms 400 --first-request-budget-ms 100]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+FIRST_REQUEST = f"""
+import json, sys, time
+sys.path.insert(0, {ROOT!r})
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.app.test_client().post("/chat", json={{"message": "fees for cse"}})
+t2 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "first_request": t2 - t1}}))
+"""
+
+
+def run_importtime(cwd):
+    """{module: cumulative us} for app and its direct imports."""
+    code = f"import sys; sys.path.insert(0, {ROOT!r}); import app"
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd,
+                         capture_output=True, text=True, check=True).stderr
+    lines = [IMPORTTIME_RE.match(line) for line in err.splitlines()]
+    lines = [m for m in lines if m]
+    app_line = next(i for i, m in enumerate(lines) if m.group(4) == "app" and len(m.group(3)) == 1)
+    # app's children are printed before it, one level deeper
+    start = app_line
+    while start > 0 and len(lines[start - 1].group(3)) > 1:
+        start -= 1
+    modules = {m.group(4): int(m.group(2)) for m in lines[start:app_line] if len(m.group(3)) == 3}
+    modules["app"] = int(lines[app_line].group(2))
+    modules["app (self)"] = int(lines[app_line].group(1))
+    return modules
+
+
+def run_first_request(cwd):
+    out = subprocess.run([sys.executable, "-c", FIRST_REQUEST], cwd=cwd,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=400)
+    parser.add_argument("--first-request-budget-ms", type=float, default=100)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    imports, first = [], []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as cwd:
+            imports.append(run_importtime(cwd))
+        with tempfile.TemporaryDirectory() as cwd:
+            first.append(run_first_request(cwd))
+
+    print(f"direct imports of app (median cumulative ms over {args.runs} runs):")
+    names = {name for run in imports for name in run}
+    medians = {name: statistics.median(run.get(name, 0) for run in imports) / 1000 for name in names}
+    for name, ms in sorted(medians.items(), key=lambda kv: -kv[1])[:args.top + 1]:
+        print(f"  {name:<24}{ms:8.1f}")
+
+    import_ms = medians["app"]
+    first_ms = statistics.median(r["first_request"] for r in first) * 1000
+    wall_ms = statistics.median(r["import"] for r in first) * 1000
+    print(f"\nimport app (importtime) : {import_ms:8.1f} ms   budget {args.import_budget_ms:.0f}")
+    print(f"import app (wall clock) : {wall_ms:8.1f} ms")
+    print(f"first /chat request     : {first_ms:8.1f} ms   budget {args.first_request_budget_ms:.0f}")
+
+    over = [label for label, value, budget in (
+        ("import", import_ms, args.import_budget_ms),
+        ("first request", first_ms, args.first_request_budget_ms),
+    ) if value > budget]
+    if over:
+        print("OVER BUDGET:", ", ".join(over))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Time to first byte: /chat vs. /chat/stream, over real HTTP.
+
+Serves the Flask app on a local port with a fake translator whose latency
+grows with the text length (--base seconds + --per-kchar per 1000 chars),
+and with translation caching off, so every Tamil request translates. For
+each long reply it reports the time to the first body byte and to the
+full response of both endpoints.
+
+    python benchmarks/bench_stream_ttfb.py [--repeat 5 --base 0.05 --per-kchar 0.3]
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from werkzeug.serving import WSGIRequestHandler, make_server  # noqa: E402
+
+import app  # noqa: E402
+from translation import TranslationCache, TranslatorBackend  # noqa: E402
+
+MESSAGES = [
+    ("about college", "en"),
+    ("previous year placement", "en"),
+    ("கல்லூரி பற்றிய விவரம்", "ta"),
+    ("placements பதவி", "ta"),
+    ("முன்னாள் பதவிகள்", "ta"),
+]
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class SlowTranslator(TranslatorBackend):
+    def __init__(self, base, per_kchar):
+        self.base = base
+        self.per_kchar = per_kchar
+
+    def translate(self, text, target):
+        time.sleep(self.base + self.per_kchar * len(text) / 1000)
+        return f"[{target}] {text}"
+
+
+def request(port, path, message):
+    """(seconds to first body byte, seconds to last byte)."""
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    start = time.perf_counter()
+    conn.request("POST", path, json.dumps({"message": message}), {"Content-Type": "application/json"})
+    response = conn.getresponse()
+    response.read(1)
+    first = time.perf_counter() - start
+    response.read()
+    total = time.perf_counter() - start
+    conn.close()
+    return first, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--base", type=float, default=0.05, help="seconds per translation call")
+    parser.add_argument("--per-kchar", type=float, default=0.3, help="extra seconds per 1000 chars")
+    args = parser.parse_args()
+
+    app.translation_cache = TranslationCache(SlowTranslator(args.base, args.per_kchar), ttl=0)
+    server = make_server("127.0.0.1", 0, app.app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    print(f"{'message':<26}{'lang':<6}{'/chat ttfb':>11}{'stream ttfb':>13}{'/chat total':>13}{'stream total':>14}  (ms, median)")
+    for message, lang in MESSAGES:
+        rows = {path: [request(port, path, message) for _ in range(args.repeat)]
+                for path in ("/chat", "/chat/stream")}
+        med = {path: [statistics.median(col) * 1000 for col in zip(*samples)] for path, samples in rows.items()}
+        print(f"{message:<26}{lang:<6}{med['/chat'][0]:>11.1f}{med['/chat/stream'][0]:>13.1f}"
+              f"{med['/chat'][1]:>13.1f}{med['/chat/stream'][1]:>14.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: per-request sqlite3.connect() vs. the pooled WAL UserStore.
+
+Works on a throwaway database in a temp directory. First imports --users
+student accounts (one INSERT + commit per row vs. batched executemany),
+then runs simultaneous logins from --threads threads, with --writes of the
+operations being registrations, and reports throughput and latency.
+
+    python benchmarks/bench_user_store.py [--users 20000 --threads 16 --ops 20000 --writes 0.05]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from user_store import SCHEMA, UserStore  # noqa: E402
+
+
+# ---- the old way: a fresh connection with default journaling per call ----
+class NaiveStore:
+    def __init__(self, path):
+        self.path = path
+        with sqlite3.connect(path) as conn:
+            conn.execute(SCHEMA)
+
+    def get_user(self, username):
+        with sqlite3.connect(self.path) as conn:
+            return conn.execute("SELECT id, username, password FROM users WHERE username = ?",
+                                (username,)).fetchone()
+
+    def create_user(self, username, password_hash):
+        try:
+            with sqlite3.connect(self.path) as conn:
+                conn.execute("INSERT INTO users (username, password) VALUES (?, ?)",
+                             (username, password_hash))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def bulk_import(self, rows):
+        for username, password_hash in rows:
+            self.create_user(username, password_hash)
+
+
+def accounts(n, prefix="student"):
+    return [(f"{prefix}{i:06d}", f"pbkdf2:sha256:600000${i}$" + "0" * 64) for i in range(n)]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000
+
+
+def logins(store, users, threads, ops, write_share, seed=1):
+    rng = random.Random(seed)
+    plan = [("write", f"new{i:07d}") if rng.random() < write_share else ("read", rng.choice(users)[0])
+            for i in range(ops)]
+
+    def one(op):
+        kind, username = op
+        start = time.perf_counter()
+        if kind == "read":
+            assert store.get_user(username) is not None
+        else:
+            store.create_user(username, "x")
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(one, plan))
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--writes", type=float, default=0.05, help="share of registrations")
+    args = parser.parse_args()
+
+    users = accounts(args.users)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, make in (("per-request connect", NaiveStore),
+                           ("pooled WAL store", lambda p: UserStore(p, pool_size=args.threads))):
+            store = make(os.path.join(tmp, name.replace(" ", "_") + ".db"))
+            start = time.perf_counter()
+            store.bulk_import(users)
+            imported = time.perf_counter() - start
+            elapsed, lat = logins(store, users, args.threads, args.ops, args.writes)
+            print(f"[{name}]")
+            print(f"  bulk import : {args.users} users in {imported:.2f}s ({args.users / imported:,.0f}/s)")
+            print(f"  logins      : {args.ops} ops on {args.threads} threads in {elapsed:.2f}s "
+                  f"({args.ops / elapsed:,.0f} ops/s)  p50={percentile(lat, 50):.3f} ms  p99={percentile(lat, 99):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
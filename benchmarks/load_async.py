@@ -0,0 +1,146 @@
+"""
+Load test: mixed English/Tamil traffic against the sync and async /chat.
+
+A local fake translator sleeps for --latency seconds per call, so no network
+is used. Requests arrive on a fixed schedule (--rate per second) and latency
+is measured from the scheduled arrival, so time spent queueing for a busy
+worker counts. "sync" feeds the Flask view to --workers threads (like sync
+gunicorn workers); "async" runs asgi.app in-process on one event loop.
+Translation caching is disabled by default (--cache-ttl 0) so every Tamil
+request that is not coalesced goes upstream.
+
+    python benchmarks/load_async.py --requests 400 --rate 100 --tamil 0.3 --latency 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as chatbot  # noqa: E402
+import asgi  # noqa: E402
+from admission import ConcurrencyLimiter, RateLimiter  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+from translation import TranslationCache, TranslatorBackend  # noqa: E402
+
+
+class FakeTranslator(TranslatorBackend):
+    """Pretends to be Google Translate: fixed latency, tagged output."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    def translate(self, text, target):
+        self.calls += 1
+        time.sleep(self.latency)
+        return f"[{target}] {text}"
+
+
+def build_traffic(n, tamil_share, seed=1):
+    corpus = load_corpus()
+    tamil = [m for m in corpus if chatbot.is_tamil(m)]
+    english = [m for m in corpus if not chatbot.is_tamil(m)]
+    rng = random.Random(seed)
+    return [rng.choice(tamil) if rng.random() < tamil_share else rng.choice(english) for _ in range(n)]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000 if values else 0.0
+
+
+def report(mode, elapsed, samples, backend):
+    print(f"\n[{mode}] {len(samples)} requests in {elapsed:.2f}s -> {len(samples) / elapsed:.1f} req/s, "
+          f"{backend.calls} upstream translations")
+    for lang in ("en", "ta"):
+        lat = [t for l, t in samples if l == lang]
+        print(f"  {lang}: n={len(lat):4d}  p50={percentile(lat, 50):8.1f} ms  p99={percentile(lat, 99):8.1f} ms")
+
+
+def run_sync(traffic, workers, rate):
+    """Open-loop arrivals at `rate` req/s into a pool of sync workers."""
+    client = chatbot.app.test_client()
+
+    def one(msg, arrival):
+        client.post("/chat", json={"message": msg})
+        return ("ta" if chatbot.is_tamil(msg) else "en"), time.perf_counter() - arrival
+
+    start = time.perf_counter()
+    futures = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i, msg in enumerate(traffic):
+            arrival = start + i / rate
+            time.sleep(max(0.0, arrival - time.perf_counter()))
+            futures.append(pool.submit(one, msg, arrival))
+        samples = [f.result() for f in futures]
+    return time.perf_counter() - start, samples
+
+
+async def asgi_post(msg):
+    body = json.dumps({"message": msg}).encode()
+    scope = {"type": "http", "method": "POST", "path": "/chat", "headers": []}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi.app(scope, receive, send)
+    return json.loads(sent[-1]["body"])
+
+
+async def run_async(traffic, rate):
+    """Same arrival schedule, each request handled on the event loop."""
+
+    async def one(msg, arrival):
+        await asgi_post(msg)
+        return ("ta" if chatbot.is_tamil(msg) else "en"), time.perf_counter() - arrival
+
+    start = time.perf_counter()
+    tasks = []
+    for i, msg in enumerate(traffic):
+        arrival = start + i / rate
+        await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+        tasks.append(asyncio.ensure_future(one(msg, arrival)))
+    samples = await asyncio.gather(*tasks)
+    return time.perf_counter() - start, samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--tamil", type=float, default=0.3, help="share of Tamil messages")
+    parser.add_argument("--latency", type=float, default=0.2, help="fake translation latency (s)")
+    parser.add_argument("--rate", type=float, default=100, help="arrivals per second")
+    parser.add_argument("--workers", type=int, default=4, help="sync worker threads")
+    parser.add_argument("--cache-ttl", type=float, default=0)
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    args = parser.parse_args()
+
+    traffic = build_traffic(args.requests, args.tamil)
+    # one client at a fixed rate, and latency rather than shedding is measured: no admission control
+    chatbot.ip_limits = chatbot.session_limits = RateLimiter(0, 0)
+    chatbot.translation_slots = ConcurrencyLimiter(0)
+    for mode in (["sync", "async"] if args.mode == "both" else [args.mode]):
+        backend = FakeTranslator(args.latency)
+        cache = TranslationCache(backend, ttl=args.cache_ttl)
+        chatbot.translation_cache = cache
+        asgi.async_translator.cache = cache
+        if mode == "sync":
+            elapsed, samples = run_sync(traffic, args.workers, args.rate)
+        else:
+            elapsed, samples = asyncio.run(run_async(traffic, args.rate))
+        report(mode, elapsed, samples, backend)
+
+
+if __name__ == "__main__":
+    main()
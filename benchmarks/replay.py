@@ -0,0 +1,224 @@
+"""
+Replay a JSONL corpus against /chat and check latency budgets.
+
+Every message of --corpus (default benchmarks/corpus.jsonl: English,
+Tamil, typos and questions the bot cannot answer) is sent --passes times,
+from --concurrency client threads, either
+
+    inprocess   through Flask's test client (routing + view, no sockets)
+    http        over real HTTP to the app served on a local port, or to
+                --url if given (then the server's own translator is used)
+
+Translation goes to a local fake translator (--latency seconds per call),
+so no network is needed. Reply and translation caching are off unless
+--cache is given, so every request routes: that is what routing or data
+changes slow down.
+
+The report has throughput, p50/p95/p99 latency overall, per language and
+per routing branch (the branch route() picks for the message). With
+--budget (default benchmarks/replay_budget.json) the run exits 1 if a
+mode is over its p95/p99 or under its minimum throughput, for CI:
+
+    python benchmarks/replay.py [--mode both --passes 5 --concurrency 4]
+    python benchmarks/replay.py --json replay.json   # machine-readable results
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from werkzeug.serving import make_server  # noqa: E402
+
+import app  # noqa: E402
+from admission import RateLimiter  # noqa: E402
+from bench_intent_router import load_corpus  # noqa: E402
+from bench_stream_ttfb import QuietHandler  # noqa: E402
+from load_async import FakeTranslator, percentile  # noqa: E402
+from reply_cache import ReplyCache  # noqa: E402
+from translation import TranslationCache, load_catalog  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus.jsonl")
+DEFAULT_BUDGET = os.path.join(ROOT, "benchmarks", "replay_budget.json")
+
+
+def configure(latency, cache):
+    """Point the app at the fake translator; caches on or off."""
+    app.translation_cache = TranslationCache(
+        FakeTranslator(latency),
+        max_entries=app.TRANSLATION_CACHE_SIZE,
+        ttl=app.TRANSLATION_CACHE_TTL if cache else 0,
+        catalogs={"ta": load_catalog(os.path.join(ROOT, app.TRANSLATION_CATALOG), "ta")} if cache else None,
+    )
+    # in memory only, so one run does not warm the next through cache.db
+    app.reply_cache = ReplyCache(app.REPLY_CACHE_SIZE if cache else 0)
+    # every request comes from one address: per-client limits would turn the replay into 429s
+    app.ip_limits = app.session_limits = RateLimiter(0, 0)
+
+
+def label(messages):
+    """{message: (language, branch)} from routing each distinct message once."""
+    labels = {}
+    for msg in set(messages):
+        _, branch = app.route(app.normalize_query(msg) or msg)
+        labels[msg] = ("ta" if app.is_tamil(msg) else "en", branch)
+    return labels
+
+
+def inprocess_sender():
+    local = threading.local()
+
+    def send(msg):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.app.test_client()
+        response = client.post("/chat", json={"message": msg})
+        return response.status_code
+    return send
+
+
+def http_sender(url):
+    parts = urlparse(url)
+    chat_path = parts.path.rstrip("/") + "/chat"
+
+    def send(msg):
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        try:
+            conn.request("POST", chat_path, json.dumps({"message": msg}), {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            return response.status
+        finally:
+            conn.close()
+    return send
+
+
+def replay(send, traffic, concurrency):
+    """Closed-loop replay; returns (elapsed seconds, [(message, seconds, status)])."""
+
+    def one(msg):
+        start = time.perf_counter()
+        status = send(msg)
+        return msg, time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, traffic))
+    return time.perf_counter() - start, samples
+
+
+def summarize(latencies):
+    return {
+        "n": len(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def analyse(elapsed, samples, labels):
+    by_lang, by_branch = defaultdict(list), defaultdict(list)
+    for msg, seconds, _ in samples:
+        lang, branch = labels[msg]
+        by_lang[lang].append(seconds)
+        by_branch[branch].append(seconds)
+    return {
+        "requests": len(samples),
+        "errors": sum(status != 200 for *_, status in samples),
+        "elapsed_s": elapsed,
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "overall": summarize([seconds for _, seconds, _ in samples]),
+        "languages": {lang: summarize(values) for lang, values in sorted(by_lang.items())},
+        "branches": {branch: summarize(values) for branch, values in sorted(by_branch.items())},
+    }
+
+
+def print_report(mode, result):
+    overall = result["overall"]
+    print(f"\n[{mode}] {result['requests']} requests in {result['elapsed_s']:.2f}s -> "
+          f"{result['rps']:.0f} req/s, {result['errors']} errors")
+    print(f"  {'':<30}{'n':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    rows = [("overall", overall)]
+    rows += [(f"lang={lang}", s) for lang, s in result["languages"].items()]
+    rows += [(f"branch={branch}", s) for branch, s in
+             sorted(result["branches"].items(), key=lambda kv: -kv[1]["p95_ms"])]
+    for name, s in rows:
+        print(f"  {name:<30}{s['n']:>6}{s['p50_ms']:>9.2f}{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}")
+
+
+def check_budget(mode, result, budget):
+    """Messages for every budget `result` misses."""
+    limits = budget.get(mode, {})
+    overall = result["overall"]
+    failures = []
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        if key in limits and overall[key] > limits[key]:
+            failures.append(f"{mode}: {key} {overall[key]:.2f} > {limits[key]}")
+    if "min_rps" in limits and result["rps"] < limits["min_rps"]:
+        failures.append(f"{mode}: {result['rps']:.0f} req/s < {limits['min_rps']}")
+    if result["errors"] > limits.get("max_errors", 0):
+        failures.append(f"{mode}: {result['errors']} errors")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--mode", choices=["inprocess", "http", "both"], default="both")
+    parser.add_argument("--passes", type=int, default=5, help="times the corpus is replayed")
+    parser.add_argument("--concurrency", type=int, default=4, help="client threads")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake translation latency (s)")
+    parser.add_argument("--cache", action="store_true", help="keep reply/translation caching on")
+    parser.add_argument("--url", help="replay against a running server instead (http mode)")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET, help="JSON budgets; '' to skip the check")
+    parser.add_argument("--json", help="write the results here")
+    args = parser.parse_args()
+
+    messages = load_corpus(args.corpus)
+    traffic = messages * args.passes
+    configure(args.latency, args.cache)
+    app.metrics.enabled = False
+    labels = label(messages)
+
+    results, server = {}, None
+    for mode in (["inprocess", "http"] if args.mode == "both" else [args.mode]):
+        if mode == "inprocess":
+            send = inprocess_sender()
+        else:
+            url = args.url
+            if url is None:
+                server = make_server("127.0.0.1", 0, app.app, threaded=True, request_handler=QuietHandler)
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                url = f"http://127.0.0.1:{server.server_port}"
+            send = http_sender(url)
+        replay(send, messages, args.concurrency)   # warm-up
+        results[mode] = analyse(*replay(send, traffic, args.concurrency), labels)
+        print_report(mode, results[mode])
+    if server is not None:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.budget:
+        with open(args.budget, encoding="utf-8") as f:
+            budget = json.load(f)
+        failures = [msg for mode, result in results.items() for msg in check_budget(mode, result, budget)]
+        if failures:
+            print("\nOVER BUDGET:\n  " + "\n  ".join(failures))
+            sys.exit(1)
+        print("\nwithin budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+A tiny in-memory server speaking the Redis protocol, for trying out
+RedisBackend without installing Redis. Supports PING, SELECT, GET,
+SET [EX|PX], MGET, DEL, SCAN ... MATCH, DBSIZE and FLUSHDB; one database.
+
+    python benchmarks/resp_standin.py --port 6399
+    # then SHARED_CACHE_URL = "redis://localhost:6399/0"
+
+Not for production: no persistence, no eviction, a global lock.
+"""
+import argparse
+import re
+import socketserver
+import threading
+import time
+
+DATA = {}      # key -> (value bytes, expires_at or None)
+LOCK = threading.Lock()
+
+
+def glob_to_regex(pattern):
+    """Redis MATCH glob (*, ? and backslash escapes) as a compiled regex."""
+    out, chars = [], iter(pattern.decode())
+    for ch in chars:
+        if ch == "\\":
+            out.append(re.escape(next(chars, "")))
+        elif ch == "*":
+            out.append(".*")
+        elif ch == "?":
+            out.append(".")
+        else:
+            out.append(re.escape(ch))
+    return re.compile("".join(out) + r"\Z", re.S)
+
+
+def _alive(key, now):
+    entry = DATA.get(key)
+    if entry is not None and entry[1] is not None and entry[1] <= now:
+        del DATA[key]
+        return None
+    return entry
+
+
+def execute(args):
+    cmd = args[0].upper()
+    now = time.time()
+    with LOCK:
+        if cmd == b"PING":
+            return "PONG"
+        if cmd in (b"SELECT", b"FLUSHDB"):
+            if cmd == b"FLUSHDB":
+                DATA.clear()
+            return "OK"
+        if cmd == b"GET":
+            entry = _alive(args[1], now)
+            return entry[0] if entry else None
+        if cmd == b"MGET":
+            return [(_alive(k, now) or (None,))[0] for k in args[1:]]
+        if cmd == b"SET":
+            expires_at = None
+            if len(args) >= 5 and args[3].upper() in (b"EX", b"PX"):
+                expires_at = now + int(args[4]) / (1000 if args[3].upper() == b"PX" else 1)
+            DATA[args[1]] = (args[2], expires_at)
+            return "OK"
+        if cmd == b"DEL":
+            return sum(DATA.pop(k, None) is not None for k in args[1:])
+        if cmd == b"DBSIZE":
+            return len(DATA)
+        if cmd == b"SCAN":
+            pattern = b"*"
+            if b"MATCH" in (a.upper() for a in args):
+                pattern = args[[a.upper() for a in args].index(b"MATCH") + 1]
+            match = glob_to_regex(pattern).match
+            keys = [k for k in DATA if match(k.decode())]
+            return [b"0", keys]
+    return ValueError(f"unknown command {cmd.decode()}")
+
+
+def encode(value):
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, ValueError):
+        return b"-ERR %s\r\n" % str(value).encode()
+    if isinstance(value, str):
+        return b"+%s\r\n" % value.encode()
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    return b"*%d\r\n" % len(value) + b"".join(encode(v) for v in value)
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                size = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(size + 2)[:-2])
+            self.wfile.write(encode(execute(args)))
+
+
+class Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start(port=0):
+    """Serve in a background thread; returns the server (server_address[1] is the port)."""
+    server = Server(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=6399)
+    args = parser.parse_args()
+    print(f"RESP stand-in listening on 127.0.0.1:{args.port}")
+    Server(("127.0.0.1", args.port), Handler).serve_forever()
@@ -0,0 +1,43 @@
+"""
+Build step: fingerprint, precompress and resize the static assets.
+
+Writes content-hashed copies of app.ASSET_FILES (plus .gz, and .br when the
+brotli package is installed) and resized WebP/JPEG variants of
+app.ASSET_IMAGES (when Pillow is installed) to app.ASSETS_DIR, with a
+manifest.json that the app reads at start-up. Restart the app after a build.
+
+    python build_assets.py [--out dist]
+"""
+import argparse
+import os
+import time
+
+import app
+import assets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default=app.ASSETS_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = assets.build(os.path.dirname(os.path.abspath(app.__file__)), args.out,
+                            files=app.ASSET_FILES, images=app.ASSET_IMAGES, widths=app.ASSET_IMAGE_WIDTHS)
+    if assets.brotli is None:
+        print("brotli not installed: gzip only")
+    if assets.Image is None:
+        print("Pillow not installed: images copied as they are, not resized")
+    for name, hashed in manifest["files"].items():
+        size = os.path.getsize(os.path.join(args.out, hashed))
+        encoded = ", ".join(f"{e} {os.path.getsize(os.path.join(args.out, hashed + assets.ENCODING_SUFFIX[e]))}"
+                            for e in manifest["encodings"].get(hashed, ()))
+        print(f"{name:<12} -> {hashed} ({size} bytes{'; ' + encoded if encoded else ''})")
+        for v in manifest["images"].get(name, ()):
+            print(f"{'':<15}{v['file']} ({v['width']}x{v['height']}, "
+                  f"{os.path.getsize(os.path.join(args.out, v['file']))} bytes)")
+    print(f"Built in {(time.perf_counter() - start) * 1000:.0f} ms -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
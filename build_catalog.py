@@ -0,0 +1,69 @@
+"""
+Build step: pre-translate every static bot reply into a Tamil catalog.
+
+Probes the chat router with every keyword, course and programme it knows,
+collects the distinct replies (and the sections /chat/stream sends them
+in), translates each one once and writes them to the catalog file that
+app.py loads at startup. Replies that depend on
+today's date (admission start/deadline counters) are left to live
+translation.
+
+    python build_catalog.py                      # Google Translate
+    python build_catalog.py --backend stub       # offline, for testing
+"""
+import argparse
+
+import app
+from translation import GoogleBackend, StubBackend, strip_html, write_catalog
+
+BACKENDS = {"google": GoogleBackend, "stub": StubBackend}
+
+# Routes whose reply text changes from day to day
+DATED_LABELS = app.VOLATILE_BRANCHES
+
+
+def iter_probe_messages():
+    """Messages that between them reach every branch of route_message()."""
+    yield from app.probe_messages()
+    yield "hello"      # AI / fallback reply
+    yield "வணக்கம்"      # Tamil fallback reply
+
+
+def collect_replies():
+    replies = set()
+    for message in iter_probe_messages():
+        if DATED_LABELS & app.knowledge.current.router.scan(message.lower()).keys():
+            continue
+        try:
+            reply = app.route_message(message)
+        except Exception as e:
+            print(f"Skipping {message!r}: {e}")
+            continue
+        replies.add(strip_html(reply))
+        chunks = app.split_reply(reply)
+        if len(chunks) > 1:
+            # /chat/stream translates section by section
+            replies.update(strip_html(chunk) for chunk in chunks)
+    return sorted(replies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="google")
+    parser.add_argument("--target", default="ta")
+    parser.add_argument("--out", default=app.TRANSLATION_CATALOG)
+    args = parser.parse_args()
+
+    backend = BACKENDS[args.backend]()
+    entries = {}
+    for text in collect_replies():
+        try:
+            entries[text] = backend.translate(text, args.target)
+        except Exception as e:
+            print("Translation error, left for live translation:", e)
+    write_catalog(args.out, args.target, entries)
+    print(f"Wrote {len(entries)} translations to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Build step: write the retrieval index the chat fallback searches.
+
+Routes every probe message, indexes the replies they reach (in passages,
+under the probes that reach them) with BM25 and saves the index to
+app.RETRIEVAL_INDEX_PATH. Workers that find a file built for their data
+and code memory-map it instead of building their own; without this step
+the first worker to start builds and saves it.
+
+    python build_retrieval.py [--out retrieval.idx]
+"""
+import argparse
+import os
+import time
+
+import app
+from retrieval import BM25Index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--out", default=app.RETRIEVAL_INDEX_PATH)
+    args = parser.parse_args()
+
+    kb = app.knowledge.current
+    start = time.perf_counter()
+    index = BM25Index.build(app.retrieval_documents(kb), meta={"scope": app.reply_scope(kb)})
+    index.save(args.out)
+    print(f"Indexed {len(index)} passages, {len(index.vocabulary)} terms in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms -> {args.out} ({os.path.getsize(args.out)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
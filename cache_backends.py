@@ -0,0 +1,283 @@
+"""
+Cache storage shared by the reply and translation caches.
+
+Each gunicorn worker keeps its own small in-memory LRU; behind it sits a
+CacheBackend that every worker on the host (or every host, with Redis)
+reads and writes, so an answer computed or translated by one worker is a
+hit for the others. Backends store str -> str with an optional TTL:
+
+    MemoryBackend   in-process LRU (no sharing; the single-worker default)
+    SQLiteBackend   one WAL-mode SQLite file readable by all local workers
+    RedisBackend    any server speaking the Redis protocol (RESP2)
+
+make_backend() builds one from a URL: "memory://", "sqlite:///cache.db",
+"redis://localhost:6379/0". Caches treat backend errors as misses, so a
+broken or unreachable store only costs hit rate.
+"""
+import re
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+GLOB_SPECIAL_RE = re.compile(r"([*?\[\]\\])")
+
+
+class CacheBackend:
+    """Interface: string keys and values, optional TTL in seconds."""
+
+    shared = False   # visible to other processes?
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def get_many(self, keys):
+        """{key: value} for the keys that are present."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items, ttl=None):
+        for key, value in items:
+            self.set(key, value, ttl)
+
+    def delete_prefix(self, prefix):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+# ---------------- Memory ----------------
+class MemoryBackend(CacheBackend):
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (value, expires_at or None)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+# ---------------- SQLite ----------------
+class SQLiteBackend(CacheBackend):
+    """A WAL-mode SQLite file; each thread gets its own connection, opened
+    on its first use.
+
+    Readers never block on the single writer. Expired rows are skipped on
+    read and, like the oldest rows beyond `max_entries`, pruned every
+    `prune_every` writes.
+    """
+
+    shared = True
+
+    def __init__(self, path, max_entries=100_000, prune_every=500):
+        self.path = path
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._writes = 0
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                         "key TEXT PRIMARY KEY, value TEXT, stored_at REAL, expires_at REAL)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        for start in range(0, len(keys), 500):   # stay under SQLite's variable limit
+            chunk = keys[start:start + 500]
+            rows = self._conn().execute(
+                f"SELECT key, value FROM cache WHERE key IN ({','.join('?' * len(chunk))}) "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (*chunk, now),
+            )
+            found.update(rows)
+        return found
+
+    def set(self, key, value, ttl=None):
+        self.set_many([(key, value)], ttl)
+
+    def set_many(self, items, ttl=None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        rows = [(key, value, now, expires_at) for key, value in items]
+        conn = self._conn()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", rows)
+        self._writes += len(rows)
+        if self._writes >= self.prune_every:
+            self._writes = 0
+            self.prune()
+
+    def prune(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY stored_at DESC "
+                "LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def delete_prefix(self, prefix):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# ---------------- Redis ----------------
+class RespError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class RedisBackend(CacheBackend):
+    """Minimal RESP2 client (GET/SET/MGET/SCAN/DEL), one socket per thread.
+
+    No redis-py dependency; works against Redis, Valkey, KeyDB or the
+    stand-in in benchmarks/resp_standin.py.
+    """
+
+    shared = True
+
+    def __init__(self, host="localhost", port=6379, db=0, timeout=1.0):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _socket(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = self._local.conn = (sock, sock.makefile("rb"))
+            if self.db:
+                self._call("SELECT", self.db)
+        return conn
+
+    def _call(self, *args):
+        sock, reader = self._socket()
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        try:
+            sock.sendall(b"".join(out))
+            return self._read(reader)
+        except OSError:
+            self.close()   # reconnect on the next call
+            raise
+
+    def _read(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("connection closed by server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            size = int(rest)
+            if size < 0:
+                return None
+            return reader.read(size + 2)[:-2].decode("utf-8")
+        if kind == b"*":
+            size = int(rest)
+            return None if size < 0 else [self._read(reader) for _ in range(size)]
+        raise RespError(f"unexpected reply {line!r}")
+
+    def get(self, key):
+        return self._call("GET", key)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        return {k: v for k, v in zip(keys, self._call("MGET", *keys)) if v is not None}
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self._call("SET", key, value, "PX", int(ttl * 1000))
+        else:
+            self._call("SET", key, value)
+
+    def delete_prefix(self, prefix):
+        cursor = "0"
+        while True:
+            pattern = GLOB_SPECIAL_RE.sub(r"\\\1", prefix) + "*"
+            cursor, keys = self._call("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            if keys:
+                self._call("DEL", *keys)
+            if cursor == "0":
+                return
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn[0].close()
+            self._local.conn = None
+
+
+def make_backend(url, max_entries=100_000):
+    """memory://  |  sqlite:///relative.db or sqlite:////abs.db  |  redis://host:port/db"""
+    parts = urlparse(url)
+    if parts.scheme == "memory":
+        return MemoryBackend(max_entries)
+    if parts.scheme == "sqlite":
+        return SQLiteBackend(parts.path[1:], max_entries=max_entries)
+    if parts.scheme == "redis":
+        return RedisBackend(parts.hostname or "localhost", parts.port or 6379,
+                            db=int(parts.path[1:] or 0))
+    raise ValueError(f"unknown cache backend: {url}")
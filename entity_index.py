@@ -0,0 +1,109 @@
+"""
+Entity extraction for the chat router: which course, department, timing
+programme and year a message names.
+
+Every name a user may type for an entity (canonical ids, abbreviations such
+as "b.tech" / "b.e", Tamil names, year phrases) is compiled once into a
+table keyed by token tuples. Extraction is one left-to-right pass over the
+message's tokens that takes the longest phrase starting at each position,
+so "bba llb" is never read as "llb", "bsc cs" never as a bare "bsc", and
+"cse" only matches as a whole word, not inside "recent" or "purchase".
+
+A phrase can name several entities at once: a course also names its
+department and that department's timing programme ("cse" -> course cse,
+department engineering, programme btech).
+"""
+import re
+from types import MappingProxyType
+
+# a token is a run of characters up to whitespace or sentence punctuation;
+# dots stay inside tokens ("b.tech", "m.arch") but not at their ends
+TOKEN_RE = re.compile(r"[^\s,;:!?()\[\]{}\"'/]+")
+
+
+def tokenize(text):
+    tokens = (t.strip(".") for t in TOKEN_RE.findall(text.lower()))
+    return [t for t in tokens if t]
+
+
+class EntityIndex:
+    """{phrase tokens: {entity type: canonical id}}, matched longest first."""
+
+    TYPES = ("course", "department", "program", "year")
+
+    def __init__(self):
+        self._phrases = {}
+        self._starts = set()
+        self._max_len = 0
+
+    def add(self, phrase, **entities):
+        """Map `phrase` to entities; a phrase naming two ids of one type is an error."""
+        key = tuple(tokenize(phrase))
+        if not key:
+            return self
+        merged = dict(self._phrases.get(key, {}))
+        for kind, value in entities.items():
+            if value is None:
+                continue
+            if merged.get(kind, value) != value:
+                raise ValueError(f"alias {phrase!r} names both {merged[kind]!r} and {value!r} as {kind}")
+            merged[kind] = value
+        self._phrases[key] = MappingProxyType(merged)
+        self._starts.add(key[0])
+        self._max_len = max(self._max_len, len(key))
+        return self
+
+    @classmethod
+    def from_data(cls, courses, aliases, programs=()):
+        """Build from the courses section ({dept: {course: fees}}), aliases.json
+        and the timing programmes (college_timings keys), which name themselves."""
+        index = cls()
+        for program in programs:
+            index.add(program, program=program)
+        departments = aliases["departments"]
+        for dept, info in departments.items():
+            for phrase in (dept, *info["aliases"]):
+                index.add(phrase, department=dept, program=info.get("program"))
+        for program, phrases in aliases["programs"].items():
+            for phrase in (program, *phrases):
+                index.add(phrase, program=program)
+        course_aliases = aliases["courses"]
+        for dept, dept_courses in courses.items():
+            program = departments[dept].get("program") if dept in departments else None
+            for course in dept_courses:
+                for phrase in (course, *course_aliases.get(course, ())):
+                    index.add(phrase, course=course, department=dept if dept in departments else None,
+                              program=program)
+        for year, phrases in aliases["years"].items():
+            for phrase in (year, *phrases):
+                index.add(phrase, year=year)
+        return index
+
+    def matches(self, text):
+        """Yield (start token, end token, entities) for each longest match, left to right."""
+        tokens = tokenize(text)
+        phrases, starts, max_len = self._phrases, self._starts, self._max_len
+        i, n = 0, len(tokens)
+        while i < n:
+            if tokens[i] in starts:
+                for length in range(min(max_len, n - i), 0, -1):
+                    entities = phrases.get(tuple(tokens[i:i + length]))
+                    if entities is not None:
+                        yield i, i + length, entities
+                        i += length
+                        break
+                else:
+                    i += 1
+            else:
+                i += 1
+
+    def extract(self, text):
+        """{entity type: canonical id}; when a type is named twice, the first mention wins."""
+        found = {}
+        for _, _, entities in self.matches(text):
+            for kind, value in entities.items():
+                found.setdefault(kind, value)
+        return found
+
+    def __len__(self):
+        return len(self._phrases)
@@ -0,0 +1,150 @@
+"""
+Fee and hostel data as typed NumPy columns, for range and aggregate queries.
+
+data/courses.json stores fees as display strings ("₹3,50,000") nested by
+department, course and year. FeeTable parses them once at load time into
+one row per (course, year) with integer columns: department code, course
+code, year index and the fee in paise. HostelTable does the same for
+data/hostels.json: gender code, AC flag, rooms, capacity and fees in paise.
+
+Questions like "total fee for CSE", "courses under ₹50,000" or "cheapest AC
+hostel for girls" are then a mask, a bincount or an argsort over those
+columns. Amounts are turned back into rupee strings only when a reply is
+rendered (format_rupees).
+"""
+import re
+
+import numpy as np
+
+RUPEES_RE = re.compile(r"^₹?\s*(\d[\d,]*)(?:\.(\d{1,2}))?$")
+YEAR_RE = re.compile(r"\d+")
+GENDERS = ("boys", "girls")
+
+
+def parse_rupees(text):
+    """"₹3,50,000" -> 35000000 (paise)."""
+    match = RUPEES_RE.match(text.strip())
+    if match is None:
+        raise ValueError(f"not a rupee amount: {text!r}")
+    return int(match.group(1).replace(",", "")) * 100 + int((match.group(2) or "0").ljust(2, "0"))
+
+
+def format_rupees(paise):
+    """35000000 -> "₹3,50,000", grouped the Indian way (lakhs, crores)."""
+    rupees, rest = divmod(int(paise), 100)
+    digits = str(rupees)
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while len(head) > 2:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    if head:
+        groups.insert(0, head)
+    text = ",".join(groups + [tail])
+    return f"₹{text}.{rest:02d}" if rest else f"₹{text}"
+
+
+def year_index(label):
+    """"2nd year" -> 2."""
+    match = YEAR_RE.search(label)
+    if match is None:
+        raise ValueError(f"no year number in {label!r}")
+    return int(match.group())
+
+
+class FeeTable:
+    """One row per course-year; per-course aggregates are precomputed."""
+
+    def __init__(self, courses):
+        self.departments = tuple(courses)
+        self.courses = tuple(name for dept_courses in courses.values() for name in dept_courses)
+        self.year_labels = {}       # (course code, year index) -> "1st year", as in the data
+        dept, course, year, fee = [], [], [], []
+        code = 0
+        for d, dept_courses in enumerate(courses.values()):
+            for fee_info in dept_courses.values():
+                for label, amount in fee_info.items():
+                    dept.append(d)
+                    course.append(code)
+                    year.append(year_index(label))
+                    fee.append(parse_rupees(amount))
+                    self.year_labels[code, year[-1]] = label
+                code += 1
+        self.dept = np.array(dept, dtype=np.int16)
+        self.course = np.array(course, dtype=np.int32)
+        self.year = np.array(year, dtype=np.int8)
+        self.fee = np.array(fee, dtype=np.int64)
+        self.code = {name: c for c, name in enumerate(self.courses)}
+
+        n = len(self.courses)
+        self.course_dept = np.zeros(n, dtype=np.int16)
+        self.course_dept[self.course] = self.dept
+        self.total = np.zeros(n, dtype=np.int64)
+        np.add.at(self.total, self.course, self.fee)
+        self.years = np.bincount(self.course, minlength=n).astype(np.int8)
+        self.max_year_fee = np.zeros(n, dtype=np.int64)
+        np.maximum.at(self.max_year_fee, self.course, self.fee)
+
+    def rows(self, course):
+        """[(year label, paise)] for `course`, in data order."""
+        c = self.code[course]
+        return [(self.year_labels[c, y], int(f)) for y, f in
+                zip(self.year[self.course == c], self.fee[self.course == c])]
+
+    def select(self, department=None, year=None, min_fee=None, max_fee=None, by="total"):
+        """Course codes matching the filters, cheapest first.
+
+        With `year` the fee compared and sorted on is that year's fee;
+        otherwise `by` picks "total" (whole programme) or "annual" (the
+        dearest year).
+        """
+        if year is not None:
+            rows = self.year == year
+            codes, fees = self.course[rows], self.fee[rows]
+        else:
+            codes = np.arange(len(self.courses))
+            fees = self.total if by == "total" else self.max_year_fee
+        mask = np.ones(len(codes), dtype=bool)
+        if department is not None:
+            if department not in self.departments:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+            mask &= self.course_dept[codes] == self.departments.index(department)
+        if min_fee is not None:
+            mask &= fees >= min_fee
+        if max_fee is not None:
+            mask &= fees <= max_fee
+        codes, fees = codes[mask], fees[mask]
+        order = np.argsort(fees, kind="stable")
+        return codes[order], fees[order]
+
+
+class HostelTable:
+    """One row per hostel, both genders; fees in paise, capacity in students."""
+
+    def __init__(self, hostels):
+        rows = [(g, h) for g, gender in enumerate(GENDERS) for h in hostels[gender]]
+        self.names = tuple(h["name"] for _, h in rows)
+        self.gender = np.array([g for g, _ in rows], dtype=np.int8)
+        self.ac = np.array([h["ac"] for _, h in rows], dtype=bool)
+        self.rooms = np.array([h["rooms"] for _, h in rows], dtype=np.int32)
+        self.members_per_room = np.array([h["members_per_room"] for _, h in rows], dtype=np.int32)
+        self.capacity = self.rooms * self.members_per_room
+        self.hostel_fee = np.array([h["hostel_fees"] for _, h in rows], dtype=np.int64) * 100
+        self.mess_fee = np.array([h["mess_fees"] for _, h in rows], dtype=np.int64) * 100
+        self.total = self.hostel_fee + self.mess_fee
+
+    def select(self, gender=None, ac=None, min_fee=None, max_fee=None, descending=False):
+        """Row numbers matching the filters, by total (hostel + mess) fee."""
+        mask = np.ones(len(self.names), dtype=bool)
+        if gender is not None:
+            mask &= self.gender == GENDERS.index(gender)
+        if ac is not None:
+            mask &= self.ac == ac
+        if min_fee is not None:
+            mask &= self.total >= min_fee
+        if max_fee is not None:
+            mask &= self.total <= max_fee
+        rows = np.flatnonzero(mask)
+        # stable sort keeps data order among hostels with the same fee
+        order = np.argsort(-self.total[rows] if descending else self.total[rows], kind="stable")
+        return rows[order]
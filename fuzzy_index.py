@@ -0,0 +1,92 @@
+"""
+Prebuilt fuzzy matcher for the intent keyword lists.
+
+`difflib.get_close_matches` runs a full SequenceMatcher diff against every
+keyword. Here each keyword's character counts are stored once in a NumPy
+matrix; one vectorized pass gives every keyword's `quick_ratio` (an upper
+bound of the real ratio), and the exact diff only runs for the few keywords
+that can still reach the cutoff. Results are identical to difflib's.
+"""
+from difflib import SequenceMatcher
+
+import numpy as np
+
+
+class FuzzyIndex:
+    """Character-count index over labelled keyword groups."""
+
+    def __init__(self, groups):
+        self.phrases = []
+        self.ranges = {}
+        for label, phrases in groups.items():
+            start = len(self.phrases)
+            self.phrases.extend(phrases)
+            self.ranges[label] = (start, len(self.phrases))
+
+        alphabet = sorted({ch for phrase in self.phrases for ch in phrase})
+        self.columns = {ch: i for i, ch in enumerate(alphabet)}
+        self.counts = np.zeros((len(self.phrases), len(alphabet)), dtype=np.int32)
+        for row, phrase in enumerate(self.phrases):
+            for ch in phrase:
+                self.counts[row, self.columns[ch]] += 1
+        self.lengths = np.array([len(p) for p in self.phrases], dtype=np.float64)
+
+    def _bounds(self, text):
+        """quick_ratio of `text` against every keyword, in one vectorized pass."""
+        vec = np.zeros(len(self.columns), dtype=np.int32)
+        for ch in text:
+            col = self.columns.get(ch)
+            if col is not None:
+                vec[col] += 1
+        common = np.minimum(self.counts, vec).sum(axis=1)
+        return 2.0 * common / (self.lengths + len(text))
+
+    def _close(self, matcher, label, bounds, cutoff):
+        start, stop = self.ranges[label]
+        rows = start + np.flatnonzero(bounds[start:stop] >= cutoff)
+        best = None
+        # Highest bound first: once a bound drops below the best real score,
+        # no remaining keyword can win.
+        for row in rows[np.argsort(-bounds[rows], kind="stable")].tolist():
+            if best is not None and bounds[row] < best[0]:
+                break
+            phrase = self.phrases[row]
+            matcher.set_seq1(phrase)
+            score = matcher.ratio()
+            # difflib keeps the largest (score, phrase) pair
+            if score >= cutoff and (best is None or (score, phrase) > best):
+                best = (score, phrase)
+        return best[1] if best else None
+
+    def _matcher(self, text):
+        matcher = SequenceMatcher()
+        matcher.set_seq2(text)
+        return matcher
+
+    def close_match(self, text, label, cutoff=0.6):
+        """Same result as `get_close_matches(text, group, n=1, cutoff)[0]`, or None."""
+        if label not in self.ranges or not text:
+            return None
+        return self._close(self._matcher(text), label, self._bounds(text), cutoff)
+
+    def best_label(self, text, labels=None, cutoff=0.6):
+        """Return (label, score) for the group whose close match scores highest.
+
+        Mirrors the old per-intent loop: the first label wins ties and the
+        score is `SequenceMatcher(None, text, match).ratio()`.
+        """
+        best_label, best_score = None, 0
+        if not text:
+            return best_label, best_score
+        matcher, bounds = self._matcher(text), self._bounds(text)
+        for label in labels if labels is not None else self.ranges:
+            start, stop = self.ranges[label]
+            # quick_ratio is symmetric, so it also bounds the reversed score
+            if start == stop or bounds[start:stop].max() <= best_score:
+                continue
+            match = self._close(matcher, label, bounds, cutoff)
+            if match:
+                score = SequenceMatcher(None, text, match).ratio()
+                if score > best_score:
+                    best_label, best_score = label, score
+        return best_label, best_score
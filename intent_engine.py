@@ -0,0 +1,93 @@
+"""
+One-pass keyword matching for the chat router.
+
+All keyword lists used by `/chat` are compiled once into an Aho–Corasick
+automaton, so scanning a message costs one walk over its characters instead
+of one substring search per keyword.
+"""
+from collections import deque
+
+
+class KeywordIndex:
+    """Aho–Corasick automaton mapping keyword phrases to route labels.
+
+    Matching keeps plain substring semantics (same as `phrase in text`), so
+    routes built on it behave exactly like the old `any(...)` checks.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._out = [[]]
+        self._delta = None
+        self._outputs = None
+
+    def add(self, label, phrases, value=None, priority=0):
+        """Register phrases under `label`.
+
+        When several phrases of one label match, `scan()` keeps the value
+        with the lowest priority.
+        """
+        for phrase in phrases:
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    self._goto.append({})
+                    self._out.append([])
+                    nxt = len(self._goto) - 1
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].append((label, priority, phrase if value is None else value))
+        self._delta = None
+        return self
+
+    def add_ordered(self, label, items):
+        """Register (phrase, value) pairs whose list order is their priority."""
+        for priority, (phrase, value) in enumerate(items):
+            self.add(label, [phrase], value=value, priority=priority)
+        return self
+
+    def build(self):
+        """Compute failure links and flatten them into a transition table."""
+        goto, out = self._goto, [list(o) for o in self._out]
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt].extend(out[fail[nxt]])
+                queue.append(nxt)
+
+        # Full DFA: every state knows its next state for every known
+        # character, so scanning never follows failure links.
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        for state in order:
+            table = dict(delta[fail[state]])
+            table.update(goto[state])
+            delta[state] = table
+        self._delta = delta
+        self._outputs = [tuple(o) for o in out]
+        return self
+
+    def scan(self, text):
+        """Return {label: value} for every label with a phrase inside `text`."""
+        if self._delta is None:
+            self.build()
+        delta, outputs = self._delta, self._outputs
+        best = {}
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for label, priority, value in outputs[state]:
+                    seen = best.get(label)
+                    if seen is None or priority < seen[0]:
+                        best[label] = (priority, value)
+        return {label: value for label, (_, value) in best.items()}
@@ -0,0 +1,259 @@
+"""
+Hot-reloadable knowledge base for the chatbot.
+
+College data (courses, timings, hostels, campus life, intents, the admission
+and exam calendar, entity aliases) lives in JSON files under data/. Each file is
+validated and frozen into read-only structures, and artifacts derived from
+it (keyword router, entity index, fuzzy index, precomputed replies) are
+built on top. Everything is published as one immutable Snapshot; a reload
+builds a new snapshot and swaps it in with a single assignment, so requests
+already holding the old one finish undisturbed.
+
+Reloads are incremental: only files whose mtime changed are re-read, and
+only artifacts that depend on those sections are rebuilt.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from types import MappingProxyType
+
+
+# ---------------- Validation ----------------
+def freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def _require(condition, section, message):
+    if not condition:
+        raise ValueError(f"{section}: {message}")
+
+
+def _check_str_map(section, where, mapping):
+    _require(isinstance(mapping, dict), section, f"{where} must be an object")
+    for key, value in mapping.items():
+        _require(isinstance(value, str), section, f"{where}[{key!r}] must be a string")
+
+
+def validate_courses(raw):
+    _require(isinstance(raw, dict), "courses", "expected {department: {course: {year: fee}}}")
+    for dept, dept_courses in raw.items():
+        _require(isinstance(dept_courses, dict), "courses", f"{dept!r} must be an object")
+        for course_name, fee_info in dept_courses.items():
+            _check_str_map("courses", f"{dept}/{course_name}", fee_info)
+    return raw
+
+
+def validate_college_timings(raw):
+    _require(isinstance(raw, dict), "college_timings", "expected {programme: {year: timing}}")
+    for program, years in raw.items():
+        if not isinstance(years, str):
+            _check_str_map("college_timings", program, years)
+    return raw
+
+
+HOSTEL_FIELDS = {"name": str, "rooms": int, "members_per_room": int, "ac": bool,
+                 "hostel_fees": int, "mess_fees": int}
+
+
+def validate_hostels(raw):
+    _require(isinstance(raw, dict) and {"boys", "girls"} <= raw.keys(),
+             "hostels", "expected {\"boys\": [...], \"girls\": [...]}")
+    for gender, hostels in raw.items():
+        _require(isinstance(hostels, list), "hostels", f"{gender} must be a list")
+        for h in hostels:
+            for field, kind in HOSTEL_FIELDS.items():
+                _require(isinstance(h.get(field), kind), "hostels",
+                         f"{gender}/{h.get('name')}: {field} must be {kind.__name__}")
+    return raw
+
+
+def validate_campus_life(raw):
+    _require(isinstance(raw, dict), "campus_life", "expected {topic: {\"details\": html}}")
+    for topic, info in raw.items():
+        _check_str_map("campus_life", topic, info)
+        _require("details" in info, "campus_life", f"{topic} has no details")
+    return raw
+
+
+def validate_intents(raw):
+    _require(isinstance(raw, dict), "intents", "expected {intent: [keywords]}")
+    for intent, keywords in raw.items():
+        _require(isinstance(keywords, list) and all(isinstance(k, str) for k in keywords),
+                 "intents", f"{intent} must be a list of strings")
+    return raw
+
+
+CALENDAR_KINDS = {"admission", "exam"}
+CALENDAR_REQUIRED = {"admission_start", "admission_deadline", "application_deadline"}
+
+
+def validate_calendar(raw):
+    _require(isinstance(raw, dict) and isinstance(raw.get("events"), list),
+             "calendar", "expected {\"events\": [...]}")
+    seen = set()
+    for event in raw["events"]:
+        _require(isinstance(event, dict) and isinstance(event.get("id"), str),
+                 "calendar", "every event needs a string id")
+        event_id = event["id"]
+        _require(event_id not in seen, "calendar", f"duplicate event {event_id!r}")
+        seen.add(event_id)
+        _require(event.get("kind") in CALENDAR_KINDS, "calendar",
+                 f"{event_id}: kind must be one of {sorted(CALENDAR_KINDS)}")
+        _check_str_map("calendar", event_id, event)
+        try:
+            event["date"] = datetime.strptime(event["date"], "%Y-%m-%d").date()
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"calendar: {event_id}: date must be YYYY-MM-DD ({e})")
+    _require(CALENDAR_REQUIRED <= seen, "calendar",
+             f"missing events {sorted(CALENDAR_REQUIRED - seen)}")
+    return raw
+
+
+def _check_phrases(section, where, phrases):
+    _require(isinstance(phrases, list) and all(isinstance(p, str) for p in phrases),
+             section, f"{where} must be a list of strings")
+
+
+def validate_aliases(raw):
+    _require(isinstance(raw, dict) and {"departments", "programs", "courses", "years"} <= raw.keys(),
+             "aliases", "expected {\"departments\", \"programs\", \"courses\", \"years\"}")
+    for dept, info in raw["departments"].items():
+        _require(isinstance(info, dict), "aliases", f"departments/{dept} must be an object")
+        _require(isinstance(info.get("program"), (str, type(None))), "aliases",
+                 f"departments/{dept}: program must be a string or null")
+        _check_phrases("aliases", f"departments/{dept}/aliases", info.get("aliases"))
+    for group in ("programs", "courses", "years"):
+        _require(isinstance(raw[group], dict), "aliases", f"{group} must be an object")
+        for name, phrases in raw[group].items():
+            _check_phrases("aliases", f"{group}/{name}", phrases)
+    return raw
+
+
+SECTIONS = {
+    "courses": validate_courses,
+    "college_timings": validate_college_timings,
+    "hostels": validate_hostels,
+    "campus_life": validate_campus_life,
+    "intents": validate_intents,
+    "calendar": validate_calendar,
+    "aliases": validate_aliases,
+}
+
+
+# ---------------- Snapshot ----------------
+class Snapshot:
+    """One consistent, read-only version of the data and its artifacts.
+
+    Sections and artifacts are available as attributes (kb.courses,
+    kb.router, ...). `digest` fingerprints the data files, so processes that
+    loaded the same files agree on it (version is per-process).
+    """
+
+    def __init__(self, version, sections, artifacts, digest=None):
+        self.__dict__.update(sections)
+        self.__dict__.update(artifacts)
+        self.version = version
+        self.digest = digest
+        self.sections = MappingProxyType(dict(sections))
+        self.artifacts = MappingProxyType(dict(artifacts))
+
+
+class KnowledgeBase:
+    """Loads data/*.json, builds artifacts and hot-swaps snapshots.
+
+    `builders` is an ordered {artifact: (sections it depends on, fn)}; each
+    fn receives a Snapshot with all sections and the artifacts built before
+    it. `listeners` are called with the new snapshot after every reload.
+    """
+
+    def __init__(self, directory, builders):
+        self.directory = directory
+        self.builders = builders
+        self.listeners = []
+        self._mtimes = {}
+        self._digests = {}
+        self._lock = threading.Lock()
+        self._watcher = None
+        self.current = None
+        self.reload(force=True)
+
+    def path(self, section):
+        return os.path.join(self.directory, f"{section}.json")
+
+    def _load_section(self, section):
+        with open(self.path(section), "rb") as f:
+            data = f.read()
+        value = freeze(SECTIONS[section](json.loads(data)))
+        self._digests[section] = hashlib.sha1(data).hexdigest()
+        return value
+
+    def changed_sections(self):
+        changed = set()
+        for section in SECTIONS:
+            mtime = os.stat(self.path(section)).st_mtime_ns
+            if self._mtimes.get(section) != mtime:
+                changed.add(section)
+        return changed
+
+    def reload(self, force=False):
+        """Rebuild what changed on disk. Returns the set of changed sections.
+
+        A file that fails to parse or validate leaves the current snapshot
+        in place and the error propagates.
+        """
+        with self._lock:
+            changed = set(SECTIONS) if force else self.changed_sections()
+            if not changed:
+                return changed
+            old = self.current
+            mtimes = {s: os.stat(self.path(s)).st_mtime_ns for s in changed}
+            sections = dict(old.sections) if old else {}
+            for section in changed:
+                try:
+                    sections[section] = self._load_section(section)
+                except Exception:
+                    # don't retry the broken file until it changes again
+                    self._mtimes[section] = mtimes[section]
+                    raise
+
+            artifacts = {}
+            rebuilt = set()
+            for name, (depends_on, build) in self.builders.items():
+                if old is None or changed & set(depends_on) or rebuilt & set(depends_on):
+                    artifacts[name] = build(Snapshot(None, sections, artifacts))
+                    rebuilt.add(name)
+                else:
+                    artifacts[name] = old.artifacts[name]
+
+            self._mtimes.update(mtimes)
+            digest = hashlib.sha1("".join(self._digests[s] for s in sorted(SECTIONS)).encode()).hexdigest()[:16]
+            self.current = Snapshot((old.version + 1) if old else 1, sections, artifacts, digest)
+        for listener in self.listeners:
+            listener(self.current)
+        return changed
+
+    def watch(self, interval=2.0):
+        """Poll data/ every `interval` seconds in a daemon thread."""
+        if self._watcher is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    changed = self.reload()
+                    if changed:
+                        print("Knowledge base reloaded:", ", ".join(sorted(changed)))
+                except Exception as e:
+                    print("Knowledge base reload failed:", e)
+
+        self._watcher = threading.Thread(target=loop, name="kb-watcher", daemon=True)
+        self._watcher.start()
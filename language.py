@@ -0,0 +1,31 @@
+"""
+Script-based language detection for chat messages.
+
+A message is classified by the scripts it is written in, with two compiled
+character-class regexes (one C-level scan each, no per-character Python
+loop):
+
+    "ta"     Tamil script and no Latin letters
+    "en"     Latin letters and no Tamil (also digits/emoji-only messages)
+    "mixed"  both, e.g. Tamil typed with English course names ("bcom கட்டணம்")
+
+Romanized Tamil ("fees evlo?") is Latin script and counts as "en": its
+English keywords route as usual. Any Tamil in a message gets a Tamil
+reply; the query log records the label.
+"""
+import re
+
+TAMIL_RE = re.compile("[\u0B80-\u0BFF]")
+LATIN_RE = re.compile("[A-Za-z]")
+
+
+def has_tamil(text):
+    return TAMIL_RE.search(text) is not None
+
+
+def detect_language(text):
+    """"en", "ta" or "mixed", by the scripts `text` uses."""
+    if TAMIL_RE.search(text) is None:
+        return "en"
+    return "mixed" if LATIN_RE.search(text) else "ta"
+
@@ -0,0 +1,247 @@
+"""
+Lightweight request instrumentation for the chat pipeline.
+
+route_message() records how long each routing stage took (keyword scan,
+fuzzy checks, keyword cascade, intent fallback) and which branch produced
+the reply; chat() adds the translation stage. Counters and latency
+histograms are kept in memory and rendered in the Prometheus text format
+for the /metrics endpoint.
+
+When metrics are disabled, trace() and time() hand back shared no-op
+objects, so the instrumented code costs a couple of method calls.
+RequestProfiler can additionally run a random sample of requests under
+cProfile and dump the stats for later inspection with pstats/snakeviz.
+"""
+import cProfile
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+# seconds; routing is microseconds, translation can take seconds
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01,
+                   0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+# ---------------- Histogram ----------------
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe; Metrics locks)."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+# ---------------- Traces ----------------
+class Trace:
+    """Times consecutive stages of one request.
+
+    Each lap(stage) records the time since the previous lap (or since the
+    trace started) under that stage; finish(branch) counts the branch and
+    records the whole trace as its latency.
+    """
+
+    __slots__ = ("metrics", "start", "last")
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.metrics.observe("stage_seconds", now - self.last, stage=stage)
+        self.last = now
+
+    def finish(self, branch):
+        self.metrics.inc("replies_total", branch=branch)
+        self.metrics.observe("route_seconds", time.perf_counter() - self.start, branch=branch)
+
+
+class NullTrace:
+    __slots__ = ()
+
+    def lap(self, stage):
+        pass
+
+    def finish(self, branch):
+        pass
+
+
+NULL_TRACE = NullTrace()
+NULL_TIMER = nullcontext()
+
+
+class StageTimer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.metrics.observe("stage_seconds", time.perf_counter() - self.start, stage=self.stage)
+
+
+# ---------------- Registry ----------------
+class Metrics:
+    """Counters and histograms keyed by (name, label value).
+
+    Every metric carries one label; `help` maps metric names to the HELP
+    text shown on /metrics. `collectors` are callables returning extra
+    {name: value} gauges (cache sizes, hit rates...) read at render time.
+    """
+
+    def __init__(self, prefix="chatbot", enabled=True, buckets=DEFAULT_BUCKETS, help=None):
+        self.prefix = prefix
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.help = dict(help or {})
+        self.collectors = []
+        self._counters = {}     # name -> {(label, value): count}
+        self._histograms = {}   # name -> {(label, value): Histogram}
+        self._lock = threading.Lock()
+
+    def trace(self):
+        return Trace(self) if self.enabled else NULL_TRACE
+
+    def time(self, stage):
+        """Context manager timing one stage outside route_message()."""
+        return StageTimer(self, stage) if self.enabled else NULL_TIMER
+
+    def inc(self, name, value=1, **label):
+        if not self.enabled:
+            return
+        (key,) = label.items()
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, seconds, **label):
+        if not self.enabled:
+            return
+        (key,) = label.items()
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(self.buckets)
+            hist.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """{name: {label value: count}} for counters, handy in scripts."""
+        with self._lock:
+            return {name: {value: count for (_, value), count in series.items()}
+                    for name, series in self._counters.items()}
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def header(name, kind):
+            full = f"{self.prefix}_{name}"
+            if name in self.help:
+                lines.append(f"# HELP {full} {self.help[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = header(name, "counter")
+                for (label, value), count in sorted(series.items()):
+                    lines.append(f'{full}{{{label}="{value}"}} {count}')
+            for name, series in sorted(self._histograms.items()):
+                full = header(name, "histogram")
+                for (label, value), hist in sorted(series.items()):
+                    for bound, total in hist.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{full}_bucket{{{label}="{value}",le="{le}"}} {total}')
+                    lines.append(f'{full}_sum{{{label}="{value}"}} {hist.sum:.9f}')
+                    lines.append(f'{full}_count{{{label}="{value}"}} {hist.count}')
+
+        for collect in self.collectors:
+            try:
+                gauges = collect()
+            except Exception as e:
+                print("Metrics collector error:", e)
+                continue
+            for name, value in gauges.items():
+                full = header(name, "gauge")
+                lines.append(f"{full} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# ---------------- Profiling ----------------
+class RequestProfiler:
+    """Run a random `sample_rate` share of requests under cProfile.
+
+    Each sampled request is dumped to `directory` as
+    <name>-<timestamp>-<n>.prof (open with `python -m pstats`).
+    """
+
+    def __init__(self, sample_rate=0.0, directory="profiles"):
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.dumped = 0
+        self._lock = threading.Lock()
+
+    def sample(self, name="request"):
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return NULL_TIMER
+        return _ProfiledRequest(self, name)
+
+    def _dump(self, profile, name):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            self.dumped += 1
+            n = self.dumped
+        path = os.path.join(self.directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{n}.prof")
+        profile.dump_stats(path)
+        return path
+
+
+class _ProfiledRequest:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.profile = cProfile.Profile()
+
+    def __enter__(self):
+        try:
+            self.profile.enable()
+        except ValueError:
+            # another profiler is already active on this thread
+            self.profile = None
+
+    def __exit__(self, *exc):
+        if self.profile is None:
+            return
+        self.profile.disable()
+        try:
+            self.profiler._dump(self.profile, self.name)
+        except OSError as e:
+            print("Profile dump error:", e)
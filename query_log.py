@@ -0,0 +1,147 @@
+"""
+Asynchronous query log for analytics.
+
+The request thread only appends a small tuple (time, message, branch,
+cache hit, unanswered, latency) to an in-memory buffer; a background
+writer thread turns batches of them into JSON Lines and appends them to
+the log file, rotating it like logging.handlers.RotatingFileHandler
+(queries.jsonl -> queries.jsonl.1 -> ...). Anything costly (normalizing
+and hashing the message, the router lookup behind `enrich`) also happens
+on the writer thread.
+
+If the buffer is full the record is dropped, never waited for: logging
+must not slow down chat. Drops are counted and written to the log as
+{"dropped": n} records, so the report can tell how much is missing.
+query_report.py aggregates the files offline.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class QueryLog:
+    """Bounded buffer of query records plus the thread that writes them."""
+
+    def __init__(self, path, capacity=10_000, flush_interval=1.0, batch_size=500,
+                 max_bytes=10 * 1024 * 1024, backups=5, enrich=None):
+        self.path = path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.backups = backups
+        # enrich(message, unanswered) -> extra fields; runs on the writer thread
+        self.enrich = enrich or (lambda message, unanswered: {"message": message})
+        self.logged = 0
+        self.written = 0
+        self.dropped = 0
+        self._dropped_unwritten = 0
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()     # start/stop and file access
+        self._thread = None
+        self._file = None
+        self._closed = False
+
+    def log(self, message, branch, cache_hit, unanswered, latency):
+        """Queue one record; O(1), never blocks, drops when the buffer is full."""
+        if len(self._buffer) >= self.capacity or self._closed:
+            self.dropped += 1
+            self._dropped_unwritten += 1
+            return
+        self._buffer.append((time.time(), message, branch, cache_hit, unanswered, latency))
+        self.logged += 1
+        if self._thread is None:
+            self._start()
+        if len(self._buffer) >= self.batch_size:
+            self._wake.set()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="query-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print("Query log write failed:", e)
+
+    def _records(self, batch):
+        for ts, message, branch, cache_hit, unanswered, latency in batch:
+            record = {
+                "ts": round(ts, 3),
+                "branch": branch,
+                "cache": cache_hit,
+                "unanswered": unanswered,
+                "latency_ms": round(latency * 1000, 3),
+            }
+            record.update(self.enrich(message, unanswered))
+            yield record
+
+    def flush(self):
+        """Write everything buffered so far (called by the writer thread)."""
+        with self._lock:
+            while self._buffer:
+                batch = []
+                while self._buffer and len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+                lines = [json.dumps(r, ensure_ascii=False) for r in self._records(batch)]
+                if self._dropped_unwritten:
+                    dropped, self._dropped_unwritten = self._dropped_unwritten, 0
+                    lines.append(json.dumps({"ts": round(time.time(), 3), "dropped": dropped}))
+                self._write("".join(line + "\n" for line in lines))
+                self.written += len(batch)
+
+    def _write(self, data):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(data)
+        self._file.flush()
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        """Write what is left and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self):
+        return {
+            "logged": self.logged,
+            "written": self.written,
+            "dropped": self.dropped,
+            "buffered": len(self._buffer),
+        }
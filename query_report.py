@@ -0,0 +1,123 @@
+"""
+Offline report over the query log written by app.py (see query_log.py).
+
+Reads the log and its rotated files and prints totals, the questions the
+bot most often failed to answer (grouped by message hash, with the
+normalized text) and the routing branches with the slowest latency.
+Cache hits are left out of the branch latencies: they skip routing.
+
+    python query_report.py [logs/queries.jsonl] [--top 20 --hours 24]
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from collections import Counter, defaultdict
+
+
+def log_files(path):
+    """Rotated files oldest first, then the live one."""
+    rotated = [p for p in glob.glob(f"{glob.escape(path)}.*") if p.rsplit(".", 1)[1].isdigit()]
+    rotated.sort(key=lambda p: -int(p.rsplit(".", 1)[1]))
+    return rotated + ([path] if os.path.exists(path) else [])
+
+
+def read_records(paths, since=None):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue   # a line cut short by a crash
+                if since is None or record.get("ts", 0) >= since:
+                    yield record
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else 0.0
+
+
+def build_report(records, top):
+    total = dropped = cache_hits = 0
+    languages = Counter()
+    misses = Counter()
+    miss_text, miss_last = {}, {}
+    latency = defaultdict(list)
+    for r in records:
+        if "dropped" in r:
+            dropped += r["dropped"]
+            continue
+        total += 1
+        languages[r.get("lang")] += 1
+        if r.get("cache"):
+            cache_hits += 1
+        elif r.get("branch"):
+            latency[r["branch"]].append(r["latency_ms"])
+        if r.get("unanswered"):
+            misses[r["hash"]] += 1
+            miss_text[r["hash"]] = r.get("text", "")
+            miss_last[r["hash"]] = r["ts"]
+    branches = sorted(
+        ((branch, len(v), percentile(v, 50), percentile(v, 95), max(v)) for branch, v in latency.items()),
+        key=lambda row: -row[3],
+    )
+    return {
+        "total": total,
+        "dropped": dropped,
+        "unanswered": sum(misses.values()),
+        "cache_hits": cache_hits,
+        "languages": dict(languages),
+        "top_misses": [
+            {"hash": h, "count": n, "text": miss_text[h], "last_seen": miss_last[h]}
+            for h, n in misses.most_common(top)
+        ],
+        "slowest_branches": [
+            {"branch": b, "n": n, "p50_ms": p50, "p95_ms": p95, "max_ms": mx}
+            for b, n, p50, p95, mx in branches[:top]
+        ],
+    }
+
+
+def print_report(report):
+    total = report["total"] or 1
+    print(f"queries: {report['total']}  (dropped before writing: {report['dropped']})")
+    print(f"unanswered: {report['unanswered']} ({report['unanswered'] / total:.1%})   "
+          f"cache hits: {report['cache_hits']} ({report['cache_hits'] / total:.1%})   "
+          f"languages: " + ", ".join(f"{k}={v}" for k, v in sorted(report["languages"].items(), key=str)))
+
+    print("\nTop unanswered questions:")
+    print(f"  {'count':>6}  {'hash':<13} {'last seen':<17} text")
+    for m in report["top_misses"]:
+        seen = time.strftime("%Y-%m-%d %H:%M", time.localtime(m["last_seen"]))
+        print(f"  {m['count']:>6}  {m['hash']:<13} {seen:<17} {m['text'] or '(text not logged)'}")
+
+    print("\nSlowest branches (routed requests, ms):")
+    print(f"  {'branch':<24}{'n':>7}{'p50':>9}{'p95':>9}{'max':>9}")
+    for b in report["slowest_branches"]:
+        print(f"  {b['branch']:<24}{b['n']:>7}{b['p50_ms']:>9.2f}{b['p95_ms']:>9.2f}{b['max_ms']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("path", nargs="?", default=os.path.join("logs", "queries.jsonl"))
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--hours", type=float, help="only the last N hours")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    paths = log_files(args.path)
+    if not paths:
+        parser.error(f"no query log at {args.path}")
+    since = time.time() - args.hours * 3600 if args.hours else None
+    report = build_report(read_records(paths, since), args.top)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Whole-reply cache keyed on the normalized message text.
+
+Chat traffic is very repetitive ("fees for cse", "boys hostel", ...), so the
+routed reply for a normalized message is kept in a bounded LRU. Entries can
+carry a TTL, which is how replies containing day counters stay fresh.
+clear() drops everything (it is hooked to knowledge base reloads) and bumps
+a generation number, so a request that started routing against the old
+data cannot put its stale reply back afterwards.
+
+With a shared `store` (cache_backends.py) the LRU is a per-worker front for
+entries all workers share. Shared keys include a `scope`, the knowledge
+base digest, so workers still on older data never see newer replies or
+the other way round.
+"""
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+SPACE_RE = re.compile(r"\s+")
+ZERO_WIDTH = dict.fromkeys(map(ord, "\u200b\u200c\u200d\ufeff"))
+# punctuation at the edges of a word ("fees?", "(cse)") but not inside it
+# ("m.arch"); Tamil vowel signs are combining marks, which \w does not cover.
+# ₹ is kept: "under ₹50,000" is an amount of money, "under 50" may not be
+PUNCT = r"[^\w\s₹\u0300-\u036f\u0B80-\u0BFF]+"
+EDGE_PUNCT_RE = re.compile(rf"(?<!\S){PUNCT}|{PUNCT}(?!\S)")
+
+
+def normalize_query(text):
+    """Canonical form of a message: NFC, no zero-width joiners, lower case,
+    no leading/trailing punctuation on words, single spaces.
+
+    Tamil keyboards differ in how they compose vowel signs and in the
+    zero-width (non-)joiners they insert; NFC plus dropping the joiners
+    makes the same Tamil word compare equal.
+    """
+    text = unicodedata.normalize("NFC", text).translate(ZERO_WIDTH).lower()
+    text = EDGE_PUNCT_RE.sub(" ", text)
+    return SPACE_RE.sub(" ", text).strip()
+
+
+class ReplyCache:
+    """Thread-safe LRU of {normalized message: reply} with optional TTLs."""
+
+    def __init__(self, max_entries=4096, store=None, scope="", namespace="reply", store_ttl=24 * 3600):
+        self.max_entries = max_entries
+        self.store = store
+        self.scope = scope
+        self.namespace = namespace
+        self.store_ttl = store_ttl
+        self.generation = 0
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.flushes = 0
+        self._entries = OrderedDict()   # key -> (reply, expires_at or None)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                reply, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return reply
+                del self._entries[key]
+            generation = self.generation
+        reply = self._load(key)
+        if reply is not None:
+            # shared entries carry no TTL info, so volatile ones are never stored there
+            self.put(key, reply, generation=generation, share=False)
+            with self._lock:
+                self.hits += 1
+                self.store_hits += 1
+            return reply
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store_key(self, key):
+        return f"{self.namespace}:{self.scope}:{key}"
+
+    def _load(self, key):
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(self._store_key(key))
+        except Exception as e:
+            print("Reply store error:", e)
+            return None
+
+    def put(self, key, reply, ttl=None, generation=None, share=True):
+        """Store a reply; `generation` is the value read before routing.
+
+        Replies with a `ttl` stay in this worker only.
+        """
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (reply, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            store_key = self._store_key(key)
+        if share and not ttl and self.store is not None:
+            try:
+                self.store.set(store_key, reply, ttl=self.store_ttl)
+            except Exception as e:
+                print("Reply store error:", e)
+
+    def clear(self, scope=None):
+        """Drop local entries; shared ones are left to expire under their old scope."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.flushes += 1
+            if scope is not None:
+                self.scope = scope
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "flushes": self.flushes,
+            }
@@ -0,0 +1,152 @@
+"""
+BM25 retrieval over the bot's own answers, for questions the keyword
+cascade cannot route.
+
+Passages are indexed as a term x passage sparse matrix in CSR layout held
+in three NumPy arrays: `indptr` (where each term's row starts), `indices`
+(the passages containing the term) and `weights` (the term's BM25 weight
+in each of them, precomputed). Scoring a question is one slice-and-add per
+known query term into a vector of passage scores, then an argmax: a few
+microseconds for a few hundred passages. SciPy is not needed for that.
+
+save() writes the index as a single file: a small JSON header
+(vocabulary, passages, parameters) followed by the raw arrays. load()
+maps the arrays with np.memmap, so every worker process on the host
+shares one copy through the page cache instead of building its own.
+"""
+import json
+import math
+import os
+import re
+import struct
+import tempfile
+
+import numpy as np
+
+from entity_index import tokenize
+
+MAGIC = b"BM25IDX1"
+ARRAYS = (("indptr", np.int32), ("indices", np.int32), ("weights", np.float32))
+TAG_RE = re.compile(r"<[^>]+>")
+NUMBER_RE = re.compile(r"^\d+(?:st|nd|rd|th)?$")    # "2nd", "15th", "2025": too common to tell replies apart
+STOPWORDS = frozenset("""
+a about all am an and any are as at be by can could do does for from get give has have how i
+in is it its me more most my of on or our please should tell that the their there this to us want was
+we what when where which who why will with would you your
+""".split())
+
+
+def terms(text):
+    """Index terms of `text`: HTML dropped, no stop words or numbers, plural -s folded."""
+    words = tokenize(TAG_RE.sub(" ", text))
+    return [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+            for w in words if w not in STOPWORDS and not NUMBER_RE.match(w)]
+
+
+class BM25Index:
+    """Top passage for a free-form question, by Okapi BM25."""
+
+    def __init__(self, vocabulary, passages, indptr, indices, weights, meta=None):
+        self.vocabulary = vocabulary        # term -> row
+        self.passages = passages            # row -> stored text (the reply)
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.meta = meta or {}
+
+    @classmethod
+    def build(cls, documents, k1=1.2, b=0.75, meta=None):
+        """Index [(text to match, passage to return)]."""
+        passages, counts = [], []
+        for text, passage in documents:
+            tf = {}
+            for term in terms(text):
+                tf[term] = tf.get(term, 0) + 1
+            passages.append(passage)
+            counts.append(tf)
+        n = len(passages)
+        lengths = np.array([sum(tf.values()) for tf in counts], dtype=np.float64)
+        avg = lengths.mean() if n else 0.0
+        postings = {}
+        for doc, tf in enumerate(counts):
+            for term, count in tf.items():
+                postings.setdefault(term, []).append((doc, count))
+
+        vocabulary = {term: row for row, term in enumerate(sorted(postings))}
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int32)
+        indices, weights = [], []
+        for term, row in vocabulary.items():
+            docs = postings[term]
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc, count in docs:
+                norm = count + k1 * (1 - b + b * lengths[doc] / avg)
+                indices.append(doc)
+                weights.append(idf * count * (k1 + 1) / norm)
+            indptr[row + 1] = len(indices)
+        meta = dict(meta or {}, k1=k1, b=b)
+        return cls(vocabulary, passages, indptr, np.array(indices, dtype=np.int32),
+                   np.array(weights, dtype=np.float32), meta)
+
+    def search(self, text, k=1):
+        """[(score, passage)] of the `k` best passages sharing a term with `text`."""
+        rows = [self.vocabulary[t] for t in dict.fromkeys(terms(text)) if t in self.vocabulary]
+        if not rows:
+            return []
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        for row in rows:
+            start, end = indptr[row], indptr[row + 1]
+            scores[indices[start:end]] += weights[start:end]
+        if k == 1:
+            best = [int(scores.argmax())]
+        else:
+            best = np.argsort(-scores, kind="stable")[:k].tolist()
+        return [(float(scores[i]), self.passages[i]) for i in best if scores[i] > 0]
+
+    def __len__(self):
+        return len(self.passages)
+
+    # ---------------- File format ----------------
+    def save(self, path):
+        """Write the index to `path` atomically (temp file + rename)."""
+        offset, layout = 0, {}
+        for name, dtype in ARRAYS:
+            array = getattr(self, name)
+            layout[name] = [offset, len(array)]
+            offset += len(array) * np.dtype(dtype).itemsize
+        header = json.dumps({
+            "meta": self.meta,
+            "vocabulary": sorted(self.vocabulary, key=self.vocabulary.get),
+            "passages": self.passages,
+            "arrays": layout,
+        }, ensure_ascii=False).encode("utf-8")
+        header += b" " * (-(len(MAGIC) + 8 + len(header)) % 8)   # arrays start 8-aligned
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".retrieval-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+                for name, dtype in ARRAYS:
+                    f.write(np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes())
+            os.chmod(tmp, 0o644)    # mkstemp makes it owner-only; workers may run as another user
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Open a saved index; the arrays stay on disk, memory-mapped read-only."""
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: not a retrieval index")
+            (size,) = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(size))
+        base = len(MAGIC) + 8 + size
+        arrays = {}
+        for name, dtype in ARRAYS:
+            offset, length = header["arrays"][name]
+            arrays[name] = (np.memmap(path, dtype=dtype, mode="r", offset=base + offset, shape=(length,))
+                            if length else np.zeros(0, dtype=dtype))
+        vocabulary = {term: row for row, term in enumerate(header["vocabulary"])}
+        return cls(vocabulary, header["passages"], meta=header["meta"], **arrays)
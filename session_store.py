@@ -0,0 +1,118 @@
+"""
+Per-conversation context for follow-up questions.
+
+After "btech timing" the next message is often just "what about 2nd year?".
+For each session id the store keeps what the last answer was about (the
+topic plus the course, programme, year and hostel gender it named) in a
+small `__slots__` record, so the follow-up can be answered by looking the
+missing pieces up instead of re-routing a message that names no topic.
+
+Memory is bounded: at most `max_sessions` records are kept, least recently
+used first out, and a record idle for `ttl` seconds is dropped.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class SessionState:
+    """What the last reply in a conversation was about."""
+
+    __slots__ = ("topic", "course", "program", "year", "gender", "expires_at")
+
+    def __init__(self, topic, course=None, program=None, year=None, gender=None, expires_at=None):
+        self.topic = topic
+        self.course = course
+        self.program = program
+        self.year = year
+        self.gender = gender
+        self.expires_at = expires_at
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__[:-1])
+        return f"SessionState({fields})"
+
+
+class SessionStore:
+    """Thread-safe LRU of {session id: SessionState} with an idle TTL."""
+
+    def __init__(self, max_sessions=10_000, ttl=30 * 60):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._states)
+
+    def get(self, session_id):
+        """The live state for `session_id`, or None."""
+        if not session_id or not self.max_sessions:
+            return None
+        now = time.time()
+        with self._lock:
+            state = self._states.get(session_id)
+            if state is not None and state.expires_at <= now:
+                del self._states[session_id]
+                self.expirations += 1
+                state = None
+            if state is None:
+                self.misses += 1
+                return None
+            self._states.move_to_end(session_id)
+            self.hits += 1
+            return state
+
+    def remember(self, session_id, topic, course=None, program=None, year=None, gender=None):
+        """Record what the latest reply was about; a None topic forgets the session."""
+        if not session_id or not self.max_sessions:
+            return
+        if topic is None:
+            self.forget(session_id)
+            return
+        now = time.time()
+        state = SessionState(topic, course, program, year, gender, now + self.ttl)
+        with self._lock:
+            self._states[session_id] = state
+            self._states.move_to_end(session_id)
+            # the oldest sessions sit at the front; drop those that timed out
+            while self._states:
+                oldest = next(iter(self._states.values()))
+                if oldest.expires_at > now:
+                    break
+                self._states.popitem(last=False)
+                self.expirations += 1
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+                self.evictions += 1
+
+    def forget(self, session_id):
+        with self._lock:
+            self._states.pop(session_id, None)
+
+    def prune(self):
+        """Drop expired sessions; returns how many went."""
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, state in self._states.items() if state.expires_at <= now]
+            for sid in expired:
+                del self._states[sid]
+            self.expirations += len(expired)
+        return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._states),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,16 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+# the app writes its logs, users.db and index files to the working directory
+os.chdir(tempfile.mkdtemp(prefix="chatbot-tests-"))
+
+import app  # noqa: E402
+from cache_backends import MemoryBackend  # noqa: E402
+
+# the shared cache lives next to app.py; keep test runs out of it and each other
+app.shared_cache = app.reply_cache.store = app.translation_cache.store = MemoryBackend(app.SHARED_CACHE_SIZE)
@@ -0,0 +1,95 @@
+"""
+Admission control under a synthetic burst: students each on their own
+address and session, plus flooders hammering /chat from one address each.
+"""
+import threading
+import time
+
+import pytest
+
+import app
+from admission import ConcurrencyLimiter, RateLimiter
+
+
+def burst(students, per_student, flooders, per_flooder):
+    """[(kind, client id, message)], the students' messages interleaved."""
+    schedule = [("student", i, "fees for cse") for _ in range(per_student) for i in range(students)]
+    schedule += [("flooder", i, "hostel") for i in range(flooders) for _ in range(per_flooder)]
+    return schedule
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(app, "session_limits", RateLimiter(1.0, 5))
+    monkeypatch.setattr(app, "ip_limits", RateLimiter(1.0, 10))
+    monkeypatch.setattr(app, "query_log", None)
+    return app.app.test_client()
+
+
+def send(client, kind, i, message):
+    response = client.post("/chat", json={"message": message, "session_id": f"{kind}-{i}"},
+                           environ_base={"REMOTE_ADDR": f"10.{int(kind == 'flooder')}.0.{i}"})
+    return response.status_code
+
+
+def test_burst_limits_flooders_not_students(limits):
+    statuses = {"student": [], "flooder": []}
+    for kind, i, message in burst(students=20, per_student=5, flooders=2, per_flooder=40):
+        statuses[kind].append(send(limits, kind, i, message))
+    assert statuses["student"] == [200] * 100
+    # each flooder gets its session burst, then 429s
+    assert statuses["flooder"].count(200) == 2 * 5
+    assert statuses["flooder"].count(429) == 2 * 35
+
+
+def test_address_limit_shared_by_sessions(limits):
+    # one address, a new session per message: the address bucket still runs out
+    codes = [limits.post("/chat", json={"message": "fees", "session_id": f"s{i}"},
+                         environ_base={"REMOTE_ADDR": "10.2.0.1"}).status_code for i in range(15)]
+    assert codes.count(200) == 10 and codes[10:] == [429] * 5
+
+
+def test_rate_limited_reply_has_retry_after(limits):
+    for _ in range(5):
+        send(limits, "flooder", 0, "hostel")
+    response = limits.post("/chat", json={"message": "hostel", "session_id": "flooder-0"},
+                           environ_base={"REMOTE_ADDR": "10.1.0.0"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert response.get_json()["reply"] == app.RATE_LIMITED_REPLY
+
+
+def test_batch_and_in_process_calls_skip_address_limit(limits):
+    response = limits.post("/chat/batch", json={"messages": ["fees for cse"] * 300},
+                           environ_base={"REMOTE_ADDR": "10.3.0.1"})
+    replies = [line for line in response.data.decode().splitlines()]
+    assert response.status_code == 200 and len(replies) == 300
+    assert not any(app.RATE_LIMITED_REPLY in line for line in replies)
+    assert all(r["reply"] != app.RATE_LIMITED_REPLY for r in app.chat_batch(["hostel"] * 300))
+    assert app.rate_limit(None) == 0.0
+
+
+def test_rate_limiter_refills(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("admission.time.monotonic", lambda: now[0])
+    limiter = RateLimiter(2.0, 3)
+    assert [limiter.take("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.take("a") == pytest.approx(0.5)
+    now[0] += 0.5
+    assert limiter.take("a") == 0.0
+    assert limiter.take("b") == 0.0          # buckets are per client
+
+
+def test_concurrency_limiter_sheds_past_queue():
+    limiter = ConcurrencyLimiter(2, max_queue=1, timeout=0.5)
+    held = [limiter.acquire(), limiter.acquire()]
+    waiter = []
+    thread = threading.Thread(target=lambda: waiter.append(limiter.acquire()))
+    thread.start()
+    time.sleep(0.05)
+    assert limiter.acquire() is False        # queue full: shed at once
+    assert limiter.acquire(wait=False) is False
+    limiter.release()
+    thread.join()
+    assert held == [True, True] and waiter == [True]
+    assert limiter.stats()["shed"] == 2
@@ -0,0 +1,43 @@
+"""
+The async /chat endpoint, driven through the ASGI interface directly.
+"""
+import asyncio
+import json
+
+import pytest
+
+import app
+import asgi
+
+
+def post_chat(body):
+    """(status, JSON payload) of a POST /chat with `body` as the raw request body."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": "/chat", "method": "POST", "headers": [], "client": ("10.0.0.1", 1)}
+    asyncio.run(asgi.app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"hi"', b"42", b"null", b'[{"message": "fees"}]'])
+def test_non_object_json_is_rejected(body):
+    status, payload = post_chat(body)
+    assert status == 400
+    assert "error" in payload
+
+
+def test_invalid_json_is_rejected():
+    assert post_chat(b"{not json")[0] == 400
+
+
+def test_message_is_answered(monkeypatch):
+    monkeypatch.setattr(app, "query_log", None)
+    status, payload = post_chat(json.dumps({"message": "hostel"}).encode())
+    assert status == 200
+    assert payload["reply"]
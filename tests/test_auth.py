@@ -0,0 +1,40 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+import app
+from auth import AuthService, needs_rehash
+from user_store import UserStore
+
+
+@pytest.fixture
+def auth(tmp_path):
+    store = UserStore(str(tmp_path / "users.db"))
+    store.create_user("asha", generate_password_hash("s3cret", method="pbkdf2:sha256:1000"))
+    store.create_user("broken", "s3cret")       # not a hash: must not work as a password
+    return AuthService(store, "scrypt", workers=0)
+
+
+def test_login_and_rehash(auth):
+    assert auth.login("asha", "s3cret")
+    assert auth.rehashed == 1
+    assert auth.login("asha", "s3cret") and auth.rehashed == 1    # "scrypt" == "scrypt:32768:8:1"
+    assert not auth.login("asha", "wrong")
+
+
+def test_unknown_user_and_non_hash_rows_fail(auth):
+    assert not auth.login("nobody", "s3cret")
+    assert not auth.login("broken", "s3cret")
+
+
+def test_needs_rehash_normalizes_methods():
+    stored = generate_password_hash("x", method="scrypt")
+    assert not needs_rehash(stored, "scrypt")
+    assert not needs_rehash(stored, "scrypt:32768:8:1")
+    assert needs_rehash(stored, "pbkdf2:sha256")
+
+
+@pytest.mark.parametrize("path", ["/login", "/register"])
+@pytest.mark.parametrize("body", [["asha", "s3cret"], "asha", {"username": 42, "password": "x"},
+                                  {"username": "asha", "password": ["x"]}])
+def test_malformed_credentials_are_400(path, body):
+    assert app.app.test_client().post(path, json=body).status_code == 400
@@ -0,0 +1,46 @@
+"""
+AcademicCalendar rollover follows its clock, not the wall clock.
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from academic_calendar import AcademicCalendar
+
+EVENTS = [{"id": "deadline", "kind": "admission", "date": date(2026, 6, 10)}]
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_fake_clock_rolls_over_at_midnight():
+    clock = FakeClock(datetime(2026, 6, 8, 23, 59, tzinfo=timezone.utc))
+    calendar = AcademicCalendar(EVENTS, timezone.utc, clock=clock)
+    assert calendar.today().days_left["deadline"] == 2
+    assert calendar.seconds_left() == 60
+
+    clock.now += timedelta(minutes=1)
+    assert calendar.today().date == date(2026, 6, 9)
+    assert calendar.today().days_left["deadline"] == 1
+    assert calendar.rollovers == 2
+
+
+def test_same_day_is_computed_once():
+    clock = FakeClock(datetime(2026, 6, 8, 9, 0, tzinfo=timezone.utc))
+    calendar = AcademicCalendar(EVENTS, timezone.utc, clock=clock)
+    calendar.today()
+    clock.now += timedelta(hours=14)
+    calendar.today()
+    assert calendar.rollovers == 1
+
+
+def test_past_fake_clock_is_not_stale():
+    # a clock far behind the wall clock still gets its own day
+    clock = FakeClock(datetime(2020, 1, 1, 12, 0, tzinfo=timezone.utc))
+    calendar = AcademicCalendar(EVENTS, timezone.utc, clock=clock)
+    assert calendar.today().date == date(2020, 1, 1)
+    clock.now += timedelta(days=1)
+    assert calendar.today().date == date(2020, 1, 2)
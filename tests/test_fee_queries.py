@@ -0,0 +1,13 @@
+import app
+
+
+def test_oversized_amounts_set_no_limit():
+    client = app.app.test_client()
+    for message in ("fees under 1e999", "fees under 1" + "0" * 400 + " rs"):
+        assert client.post("/chat", json={"message": message}).status_code == 200
+    assert app.fee_limits("fees under rs 1" + "0" * 400) == (None, None, True)
+
+
+def test_reversed_range_is_swapped():
+    assert app.fee_limits("between 5 and 2 lakh") == app.fee_limits("between 2 and 5 lakh") == (20_000_000, 50_000_000, True)
+    assert app.route("courses between 5 and 2 lakh")[0] == app.route("courses between 2 and 5 lakh")[0]
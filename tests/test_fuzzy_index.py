@@ -0,0 +1,34 @@
+"""FuzzyIndex must give exactly what difflib gives, over the corpus and typo variants of every keyword."""
+import pytest
+
+import app
+from bench_fuzzy_index import FUZZY_GROUPS, build_messages, difflib_best_label, difflib_close_match
+from fuzzy_index import FuzzyIndex
+
+MESSAGES = build_messages()
+
+
+@pytest.fixture(scope="module")
+def kb():
+    return app.knowledge.current
+
+
+@pytest.mark.parametrize("group", sorted(FUZZY_GROUPS))
+def test_close_match_matches_difflib(kb, group):
+    mismatches = [msg for msg in MESSAGES
+                  if kb.fuzzy_index.close_match(msg, group) != difflib_close_match(msg, group)]
+    assert mismatches == []
+
+
+def test_best_label_matches_difflib(kb):
+    mismatches = [msg for msg in MESSAGES
+                  if kb.fuzzy_index.best_label(msg, kb.intents) != difflib_best_label(msg)]
+    assert mismatches == []
+
+
+def test_ties_and_misses():
+    index = FuzzyIndex({"a": ["abcd", "abce"], "b": ["zzzz"]})
+    # difflib keeps the largest (score, phrase) pair on a tie
+    assert index.close_match("abcx", "a") == "abce"
+    assert index.close_match("qqqq", "b") is None
+    assert index.close_match("", "a") is None
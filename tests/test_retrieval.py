@@ -0,0 +1,23 @@
+import app
+
+
+def test_miss_not_cached_while_index_rebuilds(monkeypatch):
+    message = "what is the capital of france"
+    monkeypatch.setattr(app, "_retrieval", None)
+    app.reply_cache.clear(app.reply_scope(app.knowledge.current))
+    assert app.cached_route(message) in app.UNANSWERED_REPLIES
+    assert app.reply_cache.get(app.normalize_query(message)) is None
+
+
+def test_miss_cached_once_index_is_ready():
+    message = "what is the capital of france"
+    app.refresh_retrieval(app.knowledge.current)
+    assert app.retrieval_index() is not None
+    assert app.cached_route(message) in app.UNANSWERED_REPLIES
+    assert app.reply_cache.get(app.normalize_query(message)) in app.UNANSWERED_REPLIES
+
+
+def test_answers_from_passages_and_rejects_year_only():
+    assert app.route(app.normalize_query("who is the principal"))[1] == "retrieval"
+    for message in ("2nd year", "what is the cost of bus"):
+        assert app.route(app.normalize_query(message))[0] in app.UNANSWERED_REPLIES
@@ -0,0 +1,13 @@
+"""
+Where the default shared cache lives.
+"""
+import os
+
+import app
+from cache_backends import make_backend
+
+
+def test_default_store_is_next_to_app_not_cwd():
+    app_dir = os.path.dirname(os.path.abspath(app.__file__))
+    assert os.getcwd() != app_dir
+    assert make_backend(app.SHARED_CACHE_URL).path == os.path.join(app_dir, "cache.db")
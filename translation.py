@@ -0,0 +1,316 @@
+"""
+Reply translation with a bounded LRU+TTL cache in front of the translator.
+
+Bot replies are a small, nearly static set, so each (text, target language)
+pair only needs to go upstream once. Entries can also be persisted to a
+SQLite file so a restarted worker starts warm.
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from cache_backends import SQLiteBackend
+
+TAG_RE = re.compile(r"<[^>]+>")
+CATALOG_VERSION = 1
+
+
+def strip_html(text):
+    """Remove HTML tags; this is also the cache key for a reply."""
+    return TAG_RE.sub("", text)
+
+
+def store_key(key):
+    text, target = key
+    return f"tr:{target}:{text}"
+
+
+# ---------------- Backends ----------------
+class TranslatorBackend:
+    """Interface for translation services used by TranslationCache."""
+
+    def translate(self, text, target):
+        raise NotImplementedError
+
+    def translate_batch(self, texts, target):
+        """Translate several texts; backends override this to save round-trips."""
+        return [self.translate(text, target) for text in texts]
+
+
+class GoogleBackend(TranslatorBackend):
+    """Google Translate through deep-translator (network call).
+
+    deep-translator (and the HTTP stack under it) is imported on the first
+    translation, not at startup.
+    """
+
+    MAX_CHARS = 4500            # Google's limit is 5000 per request
+    SEPARATOR = "\n\n###\n\n"
+
+    def __init__(self):
+        self._clients = {}
+
+    def _client(self, target):
+        client = self._clients.get(target)
+        if client is None:
+            from deep_translator import GoogleTranslator
+            client = self._clients[target] = GoogleTranslator(source="auto", target=target)
+        return client
+
+    def translate(self, text, target):
+        return self._client(target).translate(text)
+
+    def translate_batch(self, texts, target):
+        """Pack texts into as few requests as fit, split on a separator line.
+
+        If the translation mangles the separators, that pack is redone one
+        text at a time.
+        """
+        translator = self._client(target)
+        results, pack, size = [], [], 0
+        for text in list(texts) + [None]:
+            if pack and (text is None or size + len(text) + len(self.SEPARATOR) > self.MAX_CHARS):
+                parts = translator.translate(self.SEPARATOR.join(pack)).split("###")
+                if len(parts) == len(pack):
+                    results.extend(part.strip() for part in parts)
+                else:
+                    results.extend(translator.translate(t) for t in pack)
+                pack, size = [], 0
+            if text is not None:
+                pack.append(text)
+                size += len(text) + len(self.SEPARATOR)
+        return results
+
+
+class StubBackend(TranslatorBackend):
+    """Offline backend for tests and benchmarks.
+
+    Returns `mapping[text]` when given, otherwise the text tagged with the
+    target language. Every call is counted in `calls`.
+    """
+
+    def __init__(self, mapping=None):
+        self.mapping = mapping or {}
+        self.calls = 0
+        self.batches = 0
+
+    def translate(self, text, target):
+        self.calls += 1
+        return self.mapping.get(text, f"[{target}] {text}")
+
+    def translate_batch(self, texts, target):
+        self.batches += 1
+        return [self.mapping.get(text, f"[{target}] {text}") for text in texts]
+
+
+# ---------------- Catalog ----------------
+def write_catalog(path, target, entries):
+    """Write pre-translated replies ({stripped text: translation}) to `path`."""
+    catalog = {
+        "version": CATALOG_VERSION,
+        "target": target,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "entries": dict(sorted(entries.items())),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=1)
+
+
+def load_catalog(path, target):
+    """Load a catalog written by `write_catalog`; {} if missing or stale."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        catalog = json.load(f)
+    if catalog.get("version") != CATALOG_VERSION or catalog.get("target") != target:
+        print("Ignoring translation catalog with version/target mismatch:", path)
+        return {}
+    return catalog["entries"]
+
+
+# ---------------- Cache ----------------
+class TranslationCache:
+    """LRU cache with TTL for translated replies, optionally backed by a store.
+
+    `store` is a CacheBackend (see cache_backends.py) consulted on a local
+    miss and written on every upstream translation; with a shared store all
+    workers reuse each other's translations. `store_path` is shorthand for
+    a SQLiteBackend on that file. `catalogs` maps a target language to
+    prebuilt translations (see build_catalog.py); those are served directly
+    and never expire.
+    """
+
+    def __init__(self, backend, max_entries=1024, ttl=7 * 24 * 3600, store_path=None, catalogs=None,
+                 store=None):
+        self.backend = backend
+        self.catalogs = catalogs or {}
+        self.catalog_hits = 0
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # (text, target) -> (translated, stored_at)
+        self._lock = threading.Lock()
+        if store is None and store_path:
+            store = SQLiteBackend(store_path)
+        self.store = store
+
+    def translate(self, text, target="ta"):
+        """Translate `text` (HTML stripped) to `target`, using the cache first.
+
+        Backend errors propagate and nothing is cached for that text.
+        """
+        key, cached = self.lookup(text, target)
+        if cached is not None:
+            return cached
+        translated = self.backend.translate(key[0], target)
+        self.put(key, translated)
+        return translated
+
+    def translate_many(self, texts, target="ta"):
+        """Translate a list of texts; all cache misses go upstream in one batch."""
+        found, missing = {}, []
+        for text in dict.fromkeys(texts):
+            key, cached = self.lookup(text, target)
+            if cached is None:
+                missing.append((text, key))
+            else:
+                found[text] = cached
+        if missing:
+            translated = self.backend.translate_batch([key[0] for _, key in missing], target)
+            for (text, key), result in zip(missing, translated):
+                found[text] = result
+                self.put(key, result)
+        return [found[text] for text in texts]
+
+    def lookup(self, text, target):
+        """Return (key, translation) from the catalog or cache; None on a miss."""
+        key = (strip_html(text), target)
+        prebuilt = self.catalogs.get(target, {}).get(key[0])
+        if prebuilt is not None:
+            self.catalog_hits += 1
+            return key, prebuilt
+        return key, self.get(key)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+        translated = self._load(key)
+        with self._lock:
+            if translated is not None:
+                self._remember(key, (translated, now))
+                self.hits += 1
+                self.store_hits += 1
+                return translated
+            self.misses += 1
+            return None
+
+    def put(self, key, translated):
+        entry = (translated, time.time())
+        with self._lock:
+            self._remember(key, entry)
+        if self.store is not None and self.ttl > 0:
+            try:
+                self.store.set(store_key(key), translated, ttl=self.ttl)
+            except Exception as e:
+                print("Translation store error:", e)
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, key):
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(store_key(key))
+        except Exception as e:
+            print("Translation store error:", e)
+            return None
+
+    def clear(self):
+        """Drop in-memory entries (the store is kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "catalog_hits": self.catalog_hits,
+                "catalog_size": sum(len(c) for c in self.catalogs.values()),
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+            }
+
+
+# ---------------- Async ----------------
+class AsyncTranslator:
+    """Non-blocking front end to a TranslationCache for asyncio servers.
+
+    Cache and catalog hits return immediately. Misses run the blocking
+    backend in a thread, at most `max_concurrency` at a time and each bounded
+    by `timeout` seconds. Concurrent requests for the same text share one
+    upstream call.
+    """
+
+    def __init__(self, cache, max_concurrency=8, timeout=5.0):
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.coalesced = 0
+        self.timeouts = 0
+        self._semaphore = None
+        self._inflight = {}  # key -> asyncio.Task
+
+    async def translate(self, text, target="ta"):
+        key, cached = self.cache.lookup(text, target)
+        if cached is not None:
+            return cached
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: one caller timing out or disconnecting must not cancel
+        # the upstream call the others are waiting on
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            try:
+                translated = await asyncio.wait_for(
+                    loop.run_in_executor(None, self.cache.backend.translate, key[0], key[1]),
+                    self.timeout,
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise
+        await loop.run_in_executor(None, self.cache.put, key, translated)
+        return translated
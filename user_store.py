@@ -0,0 +1,183 @@
+"""
+SQLite-backed store for the `users` table.
+
+Connections are opened once and shared through a small thread-safe pool
+instead of one sqlite3.connect() per request. The database runs in WAL
+mode, so logins (readers) are not blocked while a registration or a bulk
+import is writing. Every query uses a fixed SQL string, so each pooled
+connection's statement cache reuses the prepared statement.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+SCHEMA = '''CREATE TABLE IF NOT EXISTS users (
+                          id INTEGER PRIMARY KEY AUTOINCREMENT,
+                          username TEXT UNIQUE,
+                          password TEXT)'''
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",     # safe with WAL, fsyncs only at checkpoints
+    "PRAGMA cache_size=-8000",       # ~8 MB page cache per connection
+    "PRAGMA mmap_size=67108864",     # 64 MB of the file memory-mapped
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",      # wait for the writer lock instead of failing
+)
+
+# Older deployments created users(id, name, email, password) and log in by
+# email; the schema above logs in by username. {login} is whichever exists.
+SELECT_USER = "SELECT id, {login}, password FROM users WHERE {login} = ?"
+INSERT_USER = "INSERT INTO users ({login}, password) VALUES (?, ?)"
+INSERT_OR_IGNORE_USER = "INSERT OR IGNORE INTO users ({login}, password) VALUES (?, ?)"
+UPDATE_PASSWORD = "UPDATE users SET password = ? WHERE {login} = ?"
+COUNT_USERS = "SELECT COUNT(*) FROM users"
+LOGIN_COLUMNS = ("username", "email")
+
+
+# ---------------- Connection Pool ----------------
+class ConnectionPool:
+    """A fixed number of SQLite connections shared between threads.
+
+    Connections are created lazily up to `size`; acquire() waits up to
+    `timeout` seconds for a free one and raises queue.Empty after that.
+    """
+
+    def __init__(self, path, size=8, timeout=10.0, pragmas=PRAGMAS):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.pragmas = pragmas
+        self._idle = queue.LifoQueue()   # most recently used first: warm caches
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+        return self._idle.get(timeout=self.timeout)
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._created -= 1
+
+
+# ---------------- User Store ----------------
+class UserStore:
+    """Users table access on top of a ConnectionPool.
+
+    Users are identified by `login_column` (username, or email in the older
+    schema); get_user() returns (id, login, password hash). Nothing touches
+    the database file until the first call.
+    """
+
+    def __init__(self, path, pool_size=8, timeout=10.0):
+        self.path = path
+        self.pool = ConnectionPool(path, size=pool_size, timeout=timeout)
+        self.login_column = None
+        self._lock = threading.Lock()
+
+    def _prepare(self):
+        """Create the table and pick the login column, once."""
+        if self.login_column is not None:
+            return
+        with self._lock, self.pool.connection() as conn:
+            if self.login_column is not None:
+                return
+            conn.execute(SCHEMA)
+            conn.commit()
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+            login = next((c for c in LOGIN_COLUMNS if c in columns), None)
+            if login is None:
+                raise ValueError(f"{self.path}: users table has none of {LOGIN_COLUMNS}")
+            sql = {"login": login}
+            self._select = SELECT_USER.format(**sql)
+            self._insert = INSERT_USER.format(**sql)
+            self._insert_or_ignore = INSERT_OR_IGNORE_USER.format(**sql)
+            self._update_password = UPDATE_PASSWORD.format(**sql)
+            self.login_column = login
+
+    def get_user(self, username):
+        """(id, username, password hash) or None."""
+        self._prepare()
+        with self.pool.connection() as conn:
+            return conn.execute(self._select, (username,)).fetchone()
+
+    def create_user(self, username, password_hash):
+        """Insert a user; returns False if the username is taken."""
+        self._prepare()
+        with self.pool.connection() as conn:
+            try:
+                with conn:
+                    conn.execute(self._insert, (username, password_hash))
+            except sqlite3.IntegrityError:
+                return False
+        return True
+
+    def update_password(self, username, password_hash):
+        self._prepare()
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute(self._update_password, (password_hash, username))
+
+    def bulk_import(self, rows, batch_size=5000):
+        """Insert (username, password hash) rows, one transaction per batch.
+
+        Existing usernames are skipped. Returns the number of rows inserted.
+        """
+        self._prepare()
+        rows = iter(rows)
+        inserted = 0
+        with self.pool.connection() as conn:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    return inserted
+                with conn:
+                    before = conn.total_changes
+                    conn.executemany(self._insert_or_ignore, batch)
+                    inserted += conn.total_changes - before
+
+    def count(self):
+        self._prepare()
+        with self.pool.connection() as conn:
+            return conn.execute(COUNT_USERS).fetchone()[0]
+
+    def close(self):
+        self.pool.close()